@@ -0,0 +1,67 @@
+"""
+Add pg_trgm and full-text GIN indexes for admin search.
+
+Revision ID: 202610161000
+Revises: 202512291400
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "202610161000"
+down_revision = "202512291400"
+branch_labels = None
+depends_on = None
+
+
+# (table, column) pairs searched by app/services/search.py
+SEARCH_COLUMNS = [
+    ("clients", "name"),
+    ("clients", "email"),
+    ("projects", "name"),
+    ("support_tickets", "subject"),
+    ("call_bookings", "client_name"),
+    ("webhook_events", "event_type"),
+    ("webhook_events", "stripe_account"),
+]
+
+
+def _has_column(table: str, column: str) -> bool:
+    conn = op.get_bind()
+    row = conn.execute(
+        sa.text(
+            """
+            SELECT 1
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = :t AND column_name = :c
+            """
+        ),
+        {"t": table, "c": column},
+    ).first()
+    return row is not None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for table, column in SEARCH_COLUMNS:
+            if not _has_column(table, column):
+                continue
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{column}_trgm "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{column}_tsv "
+                f"ON {table} USING gin (to_tsvector('simple', coalesce({column}, '')))"
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table, column in SEARCH_COLUMNS:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{column}_tsv")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{column}_trgm")
@@ -0,0 +1,124 @@
+"""
+Add dashboard_counters, kept current by triggers, for the admin dashboard stats.
+
+Revision ID: 202610161100
+Revises: 202610161000
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "202610161100"
+down_revision = "202610161000"
+branch_labels = None
+depends_on = None
+
+
+# counter name -> table whose row count it tracks
+ROW_COUNTERS = {
+    "clients": "clients",
+    "projects": "projects",
+    "orders": "orders",
+}
+
+
+def _table_exists(table: str) -> bool:
+    conn = op.get_bind()
+    return conn.execute(sa.text("SELECT to_regclass(:t)"), {"t": table}).scalar() is not None
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dashboard_counters (
+            name TEXT PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION dashboard_counters_rowcount() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE dashboard_counters SET value = value + 1, updated_at = NOW()
+                WHERE name = TG_ARGV[0];
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE dashboard_counters SET value = value - 1, updated_at = NOW()
+                WHERE name = TG_ARGV[0];
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION dashboard_counters_pending_testimonials() RETURNS trigger AS $$
+        DECLARE
+            delta INTEGER := 0;
+        BEGIN
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NOT NEW.approved THEN
+                delta := delta + 1;
+            END IF;
+            IF TG_OP IN ('DELETE', 'UPDATE') AND NOT OLD.approved THEN
+                delta := delta - 1;
+            END IF;
+            IF delta <> 0 THEN
+                UPDATE dashboard_counters SET value = value + delta, updated_at = NOW()
+                WHERE name = 'pending_testimonials';
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    for name, table in ROW_COUNTERS.items():
+        if not _table_exists(table):
+            continue
+        op.execute(
+            f"""
+            INSERT INTO dashboard_counters (name, value)
+            SELECT '{name}', COUNT(*) FROM {table}
+            ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW()
+            """
+        )
+        op.execute(f"DROP TRIGGER IF EXISTS trg_dashboard_counters ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_dashboard_counters
+            AFTER INSERT OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION dashboard_counters_rowcount('{name}')
+            """
+        )
+
+    if _table_exists("testimonials"):
+        op.execute(
+            """
+            INSERT INTO dashboard_counters (name, value)
+            SELECT 'pending_testimonials', COUNT(*) FROM testimonials WHERE approved = false
+            ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW()
+            """
+        )
+        op.execute("DROP TRIGGER IF EXISTS trg_dashboard_counters ON testimonials")
+        op.execute(
+            """
+            CREATE TRIGGER trg_dashboard_counters
+            AFTER INSERT OR DELETE OR UPDATE OF approved ON testimonials
+            FOR EACH ROW EXECUTE FUNCTION dashboard_counters_pending_testimonials()
+            """
+        )
+
+
+def downgrade():
+    for table in list(ROW_COUNTERS.values()) + ["testimonials"]:
+        if _table_exists(table):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_dashboard_counters ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS dashboard_counters_pending_testimonials()")
+    op.execute("DROP FUNCTION IF EXISTS dashboard_counters_rowcount()")
+    op.execute("DROP TABLE IF EXISTS dashboard_counters")
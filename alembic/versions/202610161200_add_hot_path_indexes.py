@@ -0,0 +1,87 @@
+"""
+Add indexes for hot-path lookups (webhooks, login self-heal, chat history,
+support, onboarding/credentials, dashboards and testimonials).
+
+Revision ID: 202610161200
+Revises: 202610161100
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "202610161200"
+down_revision = "202610161100"
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns); checked by tests/test_query_plans.py
+HOT_INDEXES = [
+    ("ix_orders_stripe_session_id", "orders", ("stripe_session_id",)),
+    ("ix_orders_buyer_email_created_at", "orders", ("buyer_email", "created_at")),
+    ("ix_orders_created_at", "orders", ("created_at",)),
+    ("ix_chat_messages_session_id_created_at", "chat_messages", ("session_id", "created_at")),
+    ("ix_support_tickets_client_id_status", "support_tickets", ("client_id", "status")),
+    ("ix_support_tickets_client_id_updated_at", "support_tickets", ("client_id", "updated_at")),
+    ("ix_support_messages_ticket_id_created_at", "support_messages", ("ticket_id", "created_at")),
+    ("ix_client_onboarding_client_id_created_at", "client_onboarding", ("client_id", "created_at")),
+    ("ix_credentials_client_id", "credentials", ("client_id",)),
+    ("ix_users_email", "users", ("email",)),
+    ("ix_webhook_events_received_at", "webhook_events", ("received_at",)),
+    ("ix_testimonials_approved_created_at", "testimonials", ("approved", "created_at")),
+]
+
+
+def _has_columns(table: str, columns) -> bool:
+    conn = op.get_bind()
+    found = conn.execute(
+        sa.text(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = :t
+            """
+        ),
+        {"t": table},
+    ).scalars().all()
+    return set(columns) <= set(found)
+
+
+def _already_indexed(table: str, columns) -> bool:
+    """True if an existing (e.g. unique) index already leads with these columns."""
+    conn = op.get_bind()
+    indexed = conn.execute(
+        sa.text(
+            """
+            SELECT ARRAY(
+                SELECT a.attname
+                FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+                ORDER BY k.ord
+            )
+            FROM pg_index i
+            WHERE i.indrelid = to_regclass(:t) AND i.indpred IS NULL
+            """
+        ),
+        {"t": table},
+    ).scalars().all()
+    return any(list(cols[: len(columns)]) == list(columns) for cols in indexed)
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in HOT_INDEXES:
+            if not _has_columns(table, columns) or _already_indexed(table, columns):
+                continue
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} ({', '.join(columns)})"
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _table, _columns in reversed(HOT_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Request, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 
 from app.db.session import get_session
 from app.core.security import require_admin_auth
@@ -11,7 +11,6 @@ router = APIRouter(
     tags=["Admin Calls"],
     dependencies=[Depends(require_admin_auth)],
 )
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("")
@@ -57,59 +56,65 @@ async def call_detail(
     )
 from fastapi import APIRouter, Depends, Request, Query, Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_session
+from sqlalchemy import text
+from app.db.pagination import Keyset, estimated_count
+from app.db.session import get_session, get_read_session
 from app.core.security import require_admin_auth
-from math import ceil
+from app.services.search import match_clause
 
 router = APIRouter(prefix="/admin/calls", tags=["Admin Calls"], dependencies=[Depends(require_admin_auth)])
 
+_CALLS_KEYSET = Keyset("received_at", "id", limit=12)
+
+
 @router.get("")
 async def list_calls(
     request: Request,
-    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None, max_length=512),
     search: str = Query("", max_length=100),
     client_id: int = Query(None),
     project_id: int = Query(None),
-    session: AsyncSession = Depends(get_session)
+    count: str = Query("estimate", pattern="^(estimate|exact)$"),
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
-    Contract: Return call bookings + pagination
+    Contract: Return call bookings + cursor pagination
     """
-    q = f"%{search}%"
-    offset = (page - 1) * 12
-
-    sql = "SELECT * FROM call_bookings WHERE client_name ILIKE :q"
-    params = {"q": q, "offset": offset}
+    filters, params = match_clause("calls", search)
 
     if client_id:
-        sql += " AND client_id = :cid"
+        filters += " AND client_id = :cid"
         params["cid"] = client_id
 
     if project_id:
-        sql += " AND project_id = :pid"
+        filters += " AND project_id = :pid"
         params["pid"] = project_id
 
-    sql += " ORDER BY received_at DESC LIMIT 12 OFFSET :offset"
-
-    result = await session.execute(sql, params)
-    calls = result.scalars().all()
-
-    # Count total pages
-    count_sql = "SELECT COUNT(*) FROM call_bookings WHERE client_name ILIKE :q"
-    if client_id:
-        count_sql += " AND client_id = :cid"
-    if project_id:
-        count_sql += " AND project_id = :pid"
+    where, order, cursor_params = _CALLS_KEYSET.clause(cursor)
+    result = await session.execute(
+        text(f"SELECT * FROM call_bookings WHERE {filters} AND {where} ORDER BY {order} LIMIT :limit"),
+        {**params, **cursor_params, "limit": _CALLS_KEYSET.fetch_limit},
+    )
+    calls, next_cursor, prev_cursor = _CALLS_KEYSET.page(
+        [dict(r) for r in result.mappings().all()], cursor
+    )
 
-    count_result = await session.execute(count_sql, params)
-    total = count_result.scalar() or 0
-    total_pages = ceil(total / 12)
+    total, estimated = None, False
+    if count == "exact":
+        count_result = await session.execute(
+            text(f"SELECT COUNT(*) FROM call_bookings WHERE {filters}"), params
+        )
+        total = count_result.scalar() or 0
+    elif not (search or client_id or project_id):
+        total, estimated = await estimated_count(session, "call_bookings"), True
 
     return {
         "calls": calls,
-        "page": page,
         "search": search,
-        "total_pages": total_pages
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "total": total,
+        "total_is_estimate": estimated,
     }
 
 @router.get("/{call_id}")
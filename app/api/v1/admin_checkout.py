@@ -1,6 +1,6 @@
 import os
 from fastapi import APIRouter, Depends, Request
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from app.core.security import require_admin_auth
 
 router = APIRouter(
@@ -8,7 +8,6 @@ router = APIRouter(
     dependencies=[Depends(require_admin_auth)]
 )
 
-templates = Jinja2Templates(directory="app/templates")
 
 @router.get("/admin/checkout")
 async def admin_checkout_page(request: Request):
@@ -3,23 +3,25 @@ from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, select, func
 from types import SimpleNamespace
-from app.db.session import get_session
-from fastapi.templating import Jinja2Templates
+from app.db import queries
+from app.db.pagination import Keyset, estimated_count
+from app.db.session import get_session, get_read_session
+from app.core.templates import templates
+from app.services import credentials_repo
+from app.services.dashboard_counters import read_counters
 from app.services.provisioning import provision_openai_assistant, provision_twilio_voice
+from app.services.search import match_clause
 
 router = APIRouter()
 
-templates = Jinja2Templates(directory="app/templates")
 
 # ADMIN DASHBOARD (client-focused)
 @router.get("/admin")
 async def admin_dashboard(
     request: Request,
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
-    total_clients = (await db.execute(text("SELECT COUNT(*) FROM clients"))).scalar() or 0
-    total_projects = (await db.execute(text("SELECT COUNT(*) FROM projects"))).scalar() or 0
-    total_orders = (await db.execute(text("SELECT COUNT(*) FROM orders"))).scalar() or 0
+    counters = await read_counters(db)
 
     # Latest clients with onboarding snapshot
     rows = await db.execute(
@@ -45,27 +47,33 @@ async def admin_dashboard(
         "admin/dashboard.html",
         {
             "request": request,
-            "total_clients": total_clients or 0,
-            "total_projects": total_projects or 0,
-            "total_orders": total_orders or 0,
+            "total_clients": counters["clients"],
+            "total_projects": counters["projects"],
+            "total_orders": counters["orders"],
             "active_subs": 0,
+            "pending_testimonials_count": counters["pending_testimonials"],
             "clients_preview": clients_preview,
         },
     )
 
+_CLIENTS_KEYSET = Keyset("c.created_at", "c.id", limit=9)
+
+
 # Admin Clients listing page
 @router.get("/admin/clients")
 async def list_clients(
     request: Request,
-    page: int = Query(1, ge=1),
-    db: AsyncSession = Depends(get_session)
+    cursor: str | None = Query(None, max_length=512),
+    search: str = Query("", max_length=100),
+    count: str = Query("estimate", pattern="^(estimate|exact)$"),
+    db: AsyncSession = Depends(get_read_session)
 ):
-    per_page = 9
-    offset = (page - 1) * per_page
+    match, match_params = match_clause("clients", search, alias="c")
+    where, order, cursor_params = _CLIENTS_KEYSET.clause(cursor)
 
     rows = await db.execute(
         text(
-            """
+            f"""
             SELECT
               c.id,
               c.name,
@@ -75,30 +83,42 @@ async def list_clients(
               c.stripe_account_id,
               c.created_at,
               COALESCE(t.open_count, 0) AS open_support
-            FROM clients c
+            FROM (
+              SELECT * FROM clients c
+              WHERE {match} AND {where}
+              ORDER BY {order}
+              LIMIT :limit
+            ) c
             LEFT JOIN (
               SELECT client_id, COUNT(*) AS open_count
               FROM support_tickets
               WHERE status = 'open'
               GROUP BY client_id
             ) t ON t.client_id = c.id
-            ORDER BY c.created_at DESC
-            LIMIT :limit OFFSET :offset
+            ORDER BY {order}
             """
         ),
-        {"limit": per_page, "offset": offset},
+        {**match_params, **cursor_params, "limit": _CLIENTS_KEYSET.fetch_limit},
     )
-    data = [SimpleNamespace(**dict(r)) for r in rows.mappings().all()]
+    clients, next_cursor, prev_cursor = _CLIENTS_KEYSET.page(rows.mappings().all(), cursor)
+    data = [SimpleNamespace(**dict(r)) for r in clients]
 
-    total_res = await db.execute(text("SELECT COUNT(*) FROM clients"))
-    total = total_res.scalar() or 0
-    total_pages = max(1, (total + per_page - 1) // per_page)
+    total, estimated = None, False
+    if count == "exact":
+        total = (
+            await db.execute(text(f"SELECT COUNT(*) FROM clients c WHERE {match}"), match_params)
+        ).scalar() or 0
+    elif not search:
+        total, estimated = await estimated_count(db, "clients"), True
 
     return templates.TemplateResponse("admin/clients.html", {
         "request": request,
         "clients": data,
-        "page": page,
-        "total_pages": total_pages,
+        "search": search,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "total": total,
+        "total_is_estimate": estimated,
     })
 
 
@@ -106,7 +126,7 @@ async def list_clients(
 async def client_lookup_by_email(
     email: str = Query(..., min_length=3),
     request: Request = None,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     res = await db.execute(
         text("SELECT id FROM clients WHERE email = :email LIMIT 1"),
@@ -127,7 +147,7 @@ async def client_lookup_by_email(
 async def client_detail(
     client_id: int,
     request: Request,
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     client_row = await db.execute(
         text(
@@ -180,25 +200,7 @@ async def client_detail(
     )
     onboarding = onboarding_row.mappings().first()
 
-    cred_row = await db.execute(
-        text(
-            """
-            SELECT
-                stripe_publishable_key,
-                stripe_secret_key,
-                openai_api_key,
-                twilio_sid,
-                twilio_token,
-                twilio_from_number,
-                dns_api_key
-            FROM credentials
-            WHERE client_id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    credentials = cred_row.mappings().first()
+    credentials = await credentials_repo.get(db, client_id)
 
     return templates.TemplateResponse(
         "admin/client_detail.html",
@@ -216,28 +218,10 @@ async def client_credentials_raw(
     client_id: int,
     db: AsyncSession = Depends(get_session),
 ):
-    cred_row = await db.execute(
-        text(
-            """
-            SELECT
-                stripe_publishable_key,
-                stripe_secret_key,
-                openai_api_key,
-                twilio_sid,
-                twilio_token,
-                twilio_from_number,
-                dns_api_key
-            FROM credentials
-            WHERE client_id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    credentials = cred_row.mappings().first()
+    credentials = await credentials_repo.get(db, client_id)
     if not credentials:
         raise HTTPException(status_code=404, detail="No credentials for this client.")
-    return {"credentials": dict(credentials)}
+    return {"credentials": credentials}
 
 
 @router.post("/admin/clients/{client_id}/provision/openai")
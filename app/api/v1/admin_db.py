@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+
+from app.core.security import require_admin_auth
+from app.db import profiling, queries
+from app.db.session import pool_stats, replica_engine
+
+router = APIRouter(
+    prefix="/admin/db",
+    tags=["Admin DB"],
+    dependencies=[Depends(require_admin_auth)],
+)
+
+
+@router.get("/pool")
+async def db_pool_stats():
+    """Connection pool usage for this worker (checked out, idle, overflow, wait time)."""
+    stats = {"primary": pool_stats()}
+    if replica_engine is not None:
+        stats["replica"] = pool_stats(replica_engine)
+    return stats
+
+
+@router.get("/queries")
+async def db_query_report():
+    """Call count and latency per registered statement (see app/db/queries.py)."""
+    return {"queries": queries.query_report()}
+
+
+@router.get("/requests")
+async def db_request_report():
+    """Recent requests over the SQL profile thresholds (statement count, DB time, repeats)."""
+    return {
+        "thresholds": {
+            "max_statements": profiling.SQL_PROFILE_MAX_STATEMENTS,
+            "max_db_ms": profiling.SQL_PROFILE_MAX_DB_MS,
+            "repeat_threshold": profiling.SQL_PROFILE_REPEAT_THRESHOLD,
+        },
+        "requests": profiling.recent_offenders(),
+    }
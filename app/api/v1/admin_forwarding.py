@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 
 from app.db.session import get_session
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/admin/forwarding")
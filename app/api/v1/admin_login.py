@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Request, Depends, Form, HTTPException
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
@@ -7,11 +7,12 @@ import hashlib
 
 import os
 
-from app.db.session import get_session
-from app.middleware.auth import signer
+from app.db import queries
+from app.db.session import get_session, get_read_session
+from app.core.security import set_admin_cookie, verify_admin_cookie
+from app.services.dashboard_counters import read_counters
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/admin/login")
@@ -22,31 +23,18 @@ async def admin_login(request: Request):
 @router.get("/admin/dashboard")
 async def admin_dashboard_page(
     request: Request,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
-    # Stats
-    total_clients = (await db.execute(text("SELECT COUNT(*) FROM clients"))).scalar() or 0
-    total_projects = (await db.execute(text("SELECT COUNT(*) FROM projects"))).scalar() or 0
-    total_orders = (await db.execute(text("SELECT COUNT(*) FROM orders"))).scalar() or 0
+    # Stats (trigger-maintained counters, one query)
+    counters = await read_counters(db)
+    total_clients = counters["clients"]
+    total_projects = counters["projects"]
+    total_orders = counters["orders"]
     active_subs = 0
-    
-    # Pending testimonials count
-    pending_testimonials_count = (
-        await db.execute(text("SELECT COUNT(*) FROM testimonials WHERE approved = false"))
-    ).scalar() or 0
+    pending_testimonials_count = counters["pending_testimonials"]
 
     # Recent webhook events
-    events_res = await db.execute(
-        text(
-            """
-            SELECT event_type, status
-            FROM webhook_events
-            ORDER BY received_at DESC
-            LIMIT 5
-            """
-        )
-    )
-    recent_events = [dict(r) for r in events_res.mappings().all()]
+    recent_events = await queries.fetch_all(db, queries.RECENT_WEBHOOK_EVENTS, limit=5)
 
     # Client preview with open support counts
     clients_res = await db.execute(
@@ -99,18 +87,7 @@ async def admin_login_post(
     password: str = Form(...),
     db: AsyncSession = Depends(get_session),
 ):
-    res = await db.execute(
-        text(
-            """
-            SELECT id, hashed_password
-            FROM users
-            WHERE email = :email AND role = 'admin'
-            LIMIT 1
-            """
-        ),
-        {"email": email},
-    )
-    row = res.mappings().first()
+    row = await queries.fetch_one(db, queries.ADMIN_LOGIN_BY_EMAIL, email=email)
     if not row:
         return RedirectResponse("/admin/login?error=invalid", status_code=303)
 
@@ -118,16 +95,8 @@ async def admin_login_post(
     if row["hashed_password"] != incoming_hash:
         return RedirectResponse("/admin/login?error=invalid", status_code=303)
 
-    token = signer.sign(str(row["id"])).decode()
     resp = RedirectResponse("/admin/dashboard", status_code=303)
-    resp.set_cookie(
-        "admin_session",
-        token,
-        httponly=True,
-        secure=True,
-        samesite="lax",
-        max_age=60 * 60 * 24 * 30,
-    )
+    set_admin_cookie(resp, row["id"])
     return resp
 
 
@@ -141,18 +110,12 @@ async def _get_admin_id(request: Request, db: AsyncSession) -> int:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
     try:
-        admin_id = int(signer.unsign(cookie).decode())
-        res = await db.execute(
-            text("SELECT id FROM users WHERE id = :id AND role = 'admin' LIMIT 1"),
-            {"id": admin_id},
-        )
-        if not res.scalar_one_or_none():
-            raise HTTPException(status_code=403, detail="Not an admin user")
-        return admin_id
-    except (ValueError, TypeError):
-        raise HTTPException(status_code=401, detail="Invalid session")
+        admin_id = await verify_admin_cookie(cookie, db)
     except Exception:
         raise HTTPException(status_code=401, detail="Authentication failed")
+    if not admin_id:
+        raise HTTPException(status_code=403, detail="Not an admin user")
+    return admin_id
 
 
 @router.get("/admin/change-password")
@@ -5,22 +5,16 @@ Uses OPENAI_ASSISTANT_ID_MARKETER for marketing strategy & campaign help
 import os
 import uuid
 from fastapi import APIRouter, Request, HTTPException, Depends
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from pydantic import BaseModel
-from openai import OpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_session
+from app.core import openai_gateway, run_waiter
 from app.core.config import settings
+from app.core.kv import get_kv
 from app.core.security import require_admin_auth
 
 router = APIRouter(dependencies=[Depends(require_admin_auth)])
-templates = Jinja2Templates(directory="app/templates")
-
-# Initialize OpenAI client with v2 API
-openai_client = OpenAI(
-    api_key=settings.OPENAI_API_KEY,
-    default_headers={"OpenAI-Beta": "assistants=v2"}
-)
 
 # Load marketer assistant ID from environment
 ASSISTANT_ID_MARKETER = os.getenv("OPENAI_ASSISTANT_ID_MARKETER", settings.OPENAI_ASSISTANT_ID_MARKETER or "")
@@ -34,8 +28,12 @@ class ChatRequest(BaseModel):
     session_id: str | None = None
 
 
-# In-memory session store (use Redis in production)
-chat_threads = {}
+# session_id -> OpenAI thread id, shared by all workers through the KV store
+MARKETER_THREAD_TTL = int(os.getenv("MARKETER_THREAD_TTL", str(7 * 24 * 3600)))
+
+
+def _thread_key(session_id: str) -> str:
+    return f"marketer:thread:{session_id}"
 
 
 @router.get("/admin/marketer")
@@ -70,20 +68,24 @@ async def marketer_chat(
 ):
     """Handle chat messages with the marketing assistant"""
     try:
+        openai_client = openai_gateway.get_client(settings.OPENAI_API_KEY)
+
         # Get or create thread
+        kv = get_kv()
         session_id = chat_request.session_id
-        if not session_id or session_id not in chat_threads:
+        thread_id = await kv.get(_thread_key(session_id)) if session_id else None
+        if not thread_id:
             # Create new thread
-            thread = openai_client.beta.threads.create(
+            thread = await openai_client.beta.threads.create(
                 extra_headers={"OpenAI-Beta": "assistants=v2"}
             )
             session_id = thread.id
-            chat_threads[session_id] = thread.id
-        
-        thread_id = chat_threads[session_id]
+            thread_id = thread.id
+        # (re)set so an active conversation never expires mid-session
+        await kv.set(_thread_key(session_id), thread_id, ttl=MARKETER_THREAD_TTL)
         
         # Add user message to thread
-        openai_client.beta.threads.messages.create(
+        await openai_client.beta.threads.messages.create(
             thread_id=thread_id,
             role="user",
             content=chat_request.message,
@@ -91,29 +93,29 @@ async def marketer_chat(
         )
         
         # Run the assistant
-        run = openai_client.beta.threads.runs.create(
+        run = await openai_client.beta.threads.runs.create(
             thread_id=thread_id,
             assistant_id=ASSISTANT_ID_MARKETER,
             extra_headers={"OpenAI-Beta": "assistants=v2"}
         )
         
-        # Wait for completion
-        while run.status in ["queued", "in_progress"]:
-            run = openai_client.beta.threads.runs.retrieve(
-                thread_id=thread_id,
-                run_id=run.id,
-                extra_headers={"OpenAI-Beta": "assistants=v2"}
+        # Wait for completion (gives up on a deadline, a closed tab, or requires_action)
+        try:
+            await run_waiter.wait_for_run(
+                openai_client,
+                thread_id,
+                run,
+                label="marketer",
+                is_disconnected=request.is_disconnected,
+            )
+        except run_waiter.RunNotCompleted as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Assistant run failed: {e.reason}"
             )
-            if run.status == "completed":
-                break
-            elif run.status in ["failed", "cancelled", "expired"]:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Assistant run failed: {run.status}"
-                )
         
         # Get the assistant's response
-        messages = openai_client.beta.threads.messages.list(
+        messages = await openai_client.beta.threads.messages.list(
             thread_id=thread_id,
             order="desc",
             limit=1,
@@ -134,3 +136,16 @@ async def marketer_chat(
             status_code=500,
             detail=f"Chat error: {str(e)}"
         )
+
+
+@router.get("/api/admin/openai/runs")
+async def openai_run_report():
+    """Assistants runs waited on by this worker: polls per run, wait time, outcomes."""
+    return {
+        "poll": {
+            "initial_s": run_waiter.RUN_POLL_INITIAL,
+            "max_s": run_waiter.RUN_POLL_MAX,
+            "deadline_s": run_waiter.RUN_WAIT_DEADLINE,
+        },
+        "runs": run_waiter.run_report(),
+    }
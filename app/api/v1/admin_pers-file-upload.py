@@ -1,25 +1,23 @@
 import hashlib
 import logging
-from pathlib import Path
 import boto3
 import os
 import uuid
 
-from fastapi import APIRouter, Depends, Form, Request, File, UploadFile
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, File, UploadFile
 from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
+from pydantic import BaseModel
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import require_admin_auth
+from app.core.security import require_admin_auth, set_admin_cookie
+from app.db import queries
 from app.db.session import get_session
-from app.middleware.auth import signer
 from app.models import PortfolioFile
+from app.services import presigned_urls
 
 router = APIRouter()
-# Resolve templates: __file__ is app/api/v1/admin_pers-file-upload.py -> go up to app/ then templates
-_templates_dir = Path(__file__).resolve().parent.parent.parent / "templates"
-templates = Jinja2Templates(directory=str(_templates_dir))
 
 # DigitalOcean Spaces (S3 compatible) client
 s3 = boto3.client(
@@ -52,18 +50,7 @@ async def personal_login_post(
     db: AsyncSession = Depends(get_session),
 ):
     """Authenticate admin user then redirect to personal dashboard."""
-    res = await db.execute(
-        text(
-            """
-            SELECT id, hashed_password
-            FROM users
-            WHERE email = :email AND role = 'admin'
-            LIMIT 1
-            """
-        ),
-        {"email": email},
-    )
-    row = res.mappings().first()
+    row = await queries.fetch_one(db, queries.ADMIN_LOGIN_BY_EMAIL, email=email)
     if not row:
         return RedirectResponse("/admin/personal/login?error=invalid", status_code=303)
 
@@ -71,16 +58,8 @@ async def personal_login_post(
     if row["hashed_password"] != incoming_hash:
         return RedirectResponse("/admin/personal/login?error=invalid", status_code=303)
 
-    token = signer.sign(str(row["id"])).decode()
     resp = RedirectResponse("/admin/personal", status_code=303)
-    resp.set_cookie(
-        "admin_session",
-        token,
-        httponly=True,
-        secure=True,
-        samesite="lax",
-        max_age=60 * 60 * 24 * 30,
-    )
+    set_admin_cookie(resp, row["id"])
     return resp
 
 
@@ -105,18 +84,7 @@ async def file_upload_login_post(
     db: AsyncSession = Depends(get_session),
 ):
     """Authenticate admin user then redirect to the upload console."""
-    res = await db.execute(
-        text(
-            """
-            SELECT id, hashed_password
-            FROM users
-            WHERE email = :email AND role = 'admin'
-            LIMIT 1
-            """
-        ),
-        {"email": email},
-    )
-    row = res.mappings().first()
+    row = await queries.fetch_one(db, queries.ADMIN_LOGIN_BY_EMAIL, email=email)
     if not row:
         return RedirectResponse("/admin/file-upload/login?error=invalid", status_code=303)
 
@@ -124,16 +92,8 @@ async def file_upload_login_post(
     if row["hashed_password"] != incoming_hash:
         return RedirectResponse("/admin/file-upload/login?error=invalid", status_code=303)
 
-    token = signer.sign(str(row["id"])).decode()
     resp = RedirectResponse("/admin/file-upload", status_code=303)
-    resp.set_cookie(
-        "admin_session",
-        token,
-        httponly=True,
-        secure=True,
-        samesite="lax",
-        max_age=60 * 60 * 24 * 30,
-    )
+    set_admin_cookie(resp, row["id"])
     return resp
 
 
@@ -265,17 +225,39 @@ async def upload_file(
         return JSONResponse({"status": "error", "detail": str(e)}, status_code=500)
 
 
+# Upper bound on keys per /api/v1/files/signed call
+SIGNED_URL_BATCH_LIMIT = 200
+
+
+class SignedUrlsRequest(BaseModel):
+    keys: list[str]
+
+
 @router.get("/api/v1/file/{filename:path}")
 async def get_file(filename: str):
     """
-    Generate a short-lived signed URL to fetch the private object.
+    Redirect to a short-lived signed URL for the private object.
     """
+    bucket = os.getenv("DO_SPACE_BUCKET")
     try:
-        url = s3.generate_presigned_url(
-            "get_object",
-            Params={"Bucket": os.getenv("DO_SPACE_BUCKET"), "Key": filename},
-            ExpiresIn=600,  # 10 minutes
-        )
-        return RedirectResponse(url)
+        url = await presigned_urls.signed_url(s3, bucket, filename)
+        resp = RedirectResponse(url)
+        # the browser may reuse the redirect for as long as our cached URL stays valid
+        resp.headers["Cache-Control"] = f"private, max-age={presigned_urls.seconds_left(bucket, filename)}"
+        return resp
     except Exception as e:
         return {"status": "error", "detail": str(e)}
+
+
+@router.post("/api/v1/files/signed")
+async def get_files_signed(payload: SignedUrlsRequest):
+    """
+    Signed URLs for many private objects in one call, e.g. a whole portfolio gallery.
+    """
+    if len(payload.keys) > SIGNED_URL_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {SIGNED_URL_BATCH_LIMIT} keys per request.")
+    try:
+        urls = await presigned_urls.signed_urls(s3, os.getenv("DO_SPACE_BUCKET"), payload.keys)
+    except Exception as e:
+        return JSONResponse({"status": "error", "detail": str(e)}, status_code=500)
+    return {"urls": urls, "expires_in": presigned_urls.PRESIGNED_URL_EXPIRES - presigned_urls.PRESIGNED_URL_CACHE_TTL}
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, Request, Query, Path
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text, select, func
-import math
 
-from app.db.session import get_session
+from app.db.pagination import Keyset, estimated_count
+from app.db.session import get_session, get_read_session
 from app.core.security import require_admin_auth
+from app.services.search import match_clause
 from app.models.project import Project
 
 router = APIRouter(
@@ -14,96 +15,108 @@ router = APIRouter(
     dependencies=[Depends(require_admin_auth)]
 )
 
-templates = Jinja2Templates(directory="app/templates")
+
+_PROJECTS_KEYSET = Keyset("updated_at", "id", limit=12)
+
+
+async def _fetch_projects(
+    session: AsyncSession,
+    columns: str,
+    search: str,
+    status: str,
+    tier: str,
+    cursor: str | None,
+    count: str,
+):
+    """One keyset page of projects plus an exact or estimated total."""
+    match, match_params = match_clause("projects", search)
+    filters = f"""
+        {match}
+        AND (:status = '' OR status = :status)
+        AND (:tier = '' OR plan_tier = :tier)
+    """
+    params = {**match_params, "status": status, "tier": tier}
+    where, order, cursor_params = _PROJECTS_KEYSET.clause(cursor)
+
+    result = await session.execute(
+        text(
+            f"""
+            SELECT {columns}
+            FROM projects
+            WHERE {filters} AND {where}
+            ORDER BY {order}
+            LIMIT :limit
+            """
+        ),
+        {**params, **cursor_params, "limit": _PROJECTS_KEYSET.fetch_limit},
+    )
+    rows = [dict(r) for r in result.mappings().all()]
+    projects, next_cursor, prev_cursor = _PROJECTS_KEYSET.page(rows, cursor)
+
+    total, estimated = None, False
+    if count == "exact":
+        total = (
+            await session.execute(text(f"SELECT COUNT(*) FROM projects WHERE {filters}"), params)
+        ).scalar() or 0
+    elif not (search or status or tier):
+        total, estimated = await estimated_count(session, "projects"), True
+
+    return projects, next_cursor, prev_cursor, total, estimated
+
 
 # JSON API for UI fetch()
 @router.get("/api")
 async def list_projects_api(
-    page: int = 1,
+    cursor: str | None = Query(None, max_length=512),
     search: str = Query("", max_length=100),
     status: str = "",
     tier: str = "",
+    count: str = Query("estimate", pattern="^(estimate|exact)$"),
     session: AsyncSession = Depends(get_session)
 ):
-    limit = 12
-    offset = (page - 1) * limit
-    q = f"%{search}%"
-
-    stmt = text("""
-        SELECT id, client_id, name, description, status, plan_tier, total_budget, created_at, updated_at,
-               COUNT(*) OVER() AS total
-        FROM projects
-        WHERE name ILIKE :q
-          AND (:status = '' OR status = :status)
-          AND (:tier = '' OR plan_tier = :tier)
-        ORDER BY updated_at DESC
-        LIMIT :limit OFFSET :offset
-    """)
-
-    result = await session.execute(stmt, {
-        "q": q,
-        "status": status,
-        "tier": tier,
-        "limit": limit,
-        "offset": offset
-    })
-    rows = result.mappings().all()
-
-    total = rows[0]["total"] if rows else 0
-    total_pages = math.ceil(total / limit) if total else 1
+    projects, next_cursor, prev_cursor, total, estimated = await _fetch_projects(
+        session,
+        "id, client_id, name, description, status, plan_tier, total_budget, created_at, updated_at",
+        search, status, tier, cursor, count,
+    )
 
     return {
-        "projects": rows,
-        "page": page,
-        "total_pages": total_pages,
-        "total": total
+        "projects": projects,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "total": total,
+        "total_is_estimate": estimated,
     }
 
 # HTML page route (UI render)
 @router.get("")
 async def projects_page(
     request: Request,
-    page: int = 1,
+    cursor: str | None = Query(None, max_length=512),
     search: str = Query("", max_length=100),
     status: str = "",
     tier: str = "",
-    session: AsyncSession = Depends(get_session)
+    count: str = Query("estimate", pattern="^(estimate|exact)$"),
+    session: AsyncSession = Depends(get_read_session)
 ):
-    limit = 12
-    offset = (page - 1) * limit
-    q = f"%{search}%"
-
-    # Simple text query to fetch projects with status and domain
-    rows = await session.execute(
-        text(
-            """
-            SELECT id, client_id, name, status, plan_tier, updated_at, created_at,
-                   COUNT(*) OVER() AS total
-            FROM projects
-            WHERE name ILIKE :q
-              AND (:status = '' OR status = :status)
-              AND (:tier = '' OR plan_tier = :tier)
-            ORDER BY updated_at DESC
-            LIMIT :limit OFFSET :offset
-            """
-        ),
-        {"q": q, "status": status, "tier": tier, "limit": limit, "offset": offset},
+    projects, next_cursor, prev_cursor, total, estimated = await _fetch_projects(
+        session,
+        "id, client_id, name, status, plan_tier, updated_at, created_at",
+        search, status, tier, cursor, count,
     )
-    projects = rows.mappings().all()
-    total = projects[0]["total"] if projects else 0
-    total_pages = math.ceil(total / limit) if total else 1
 
     return templates.TemplateResponse(
         "admin/projects.html",
         {
             "request": request,
             "projects": projects,
-            "page": page,
             "search": search,
             "status": status,
             "tier": tier,
-            "total_pages": total_pages,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
             "total": total,
+            "total_is_estimate": estimated,
         },
     )
 
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import require_admin_auth
+from app.db.session import get_read_session
+from app.services.search import TARGETS, search
+
+router = APIRouter(tags=["Admin Search"], dependencies=[Depends(require_admin_auth)])
+
+
+@router.get("/admin/search")
+async def admin_search(
+    q: str = Query("", max_length=100),
+    kinds: str = Query("", description="Comma-separated: " + ",".join(TARGETS)),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_session),
+):
+    """Ranked matches across clients, projects, tickets, calls and webhook events."""
+    selected = [k.strip() for k in kinds.split(",") if k.strip()] or None
+    unknown = [k for k in selected or [] if k not in TARGETS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search kinds: {', '.join(unknown)}")
+    return {"query": q, "results": await search(db, q, selected, limit)}
@@ -1,50 +1,65 @@
 from fastapi import APIRouter, Depends, Request, Query, Path
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_session
+from sqlalchemy import text
+from app.db.pagination import Keyset, estimated_count
+from app.db.session import get_session, get_read_session
 from app.core.security import require_admin_auth
-from math import ceil
+from app.services.search import match_clause
 
 router = APIRouter(prefix="/admin/support", tags=["Admin Support"], dependencies=[Depends(require_admin_auth)])
 
+_TICKETS_KEYSET = Keyset("st.updated_at", "st.id", limit=20)
+
+
 @router.get("")
 async def support_inbox(
     request: Request,
-    page: int = 1,
+    cursor: str | None = Query(None, max_length=512),
     search: str = Query("", max_length=120),
-    session: AsyncSession = Depends(get_session)
+    count: str = Query("estimate", pattern="^(estimate|exact)$"),
+    session: AsyncSession = Depends(get_read_session)
 ):
     """
     Contract: return support tickets grouped by client
     """
-    q = f"%{search}%"
+    match, match_params = match_clause("tickets", search, alias="st")
+    where, order, cursor_params = _TICKETS_KEYSET.clause(cursor)
 
-    # Get support tickets ordered by most recent
+    # Page the tickets first, then count messages for just that page
     result = await session.execute(
-        "SELECT st.id, st.client_id, st.subject, st.status, st.priority, st.created_at, st.updated_at, "
-        "       COUNT(sm.id) as message_count "
-        "FROM support_tickets st "
-        "LEFT JOIN support_messages sm ON sm.ticket_id = st.id "
-        "WHERE st.subject ILIKE :q "
-        "GROUP BY st.id "
-        "ORDER BY st.updated_at DESC "
-        "LIMIT 20 OFFSET :offset",
-        {"q": q, "offset": (page - 1) * 20}
+        text(
+            f"""
+            SELECT st.id, st.client_id, st.subject, st.status, st.priority, st.created_at, st.updated_at,
+                   (SELECT COUNT(*) FROM support_messages sm WHERE sm.ticket_id = st.id) AS message_count
+            FROM support_tickets st
+            WHERE {match} AND {where}
+            ORDER BY {order}
+            LIMIT :limit
+            """
+        ),
+        {**match_params, **cursor_params, "limit": _TICKETS_KEYSET.fetch_limit},
     )
-    tickets = [dict(row) for row in result.mappings().all()]
-
-    # Count pages
-    count = await session.execute(
-        "SELECT COUNT(*) FROM support_tickets WHERE subject ILIKE :q",
-        {"q": q}
+    tickets, next_cursor, prev_cursor = _TICKETS_KEYSET.page(
+        [dict(row) for row in result.mappings().all()], cursor
     )
-    total = count.scalar() or 0
-    total_pages = ceil(total / 20)
+
+    total, estimated = None, False
+    if count == "exact":
+        total = (
+            await session.execute(
+                text(f"SELECT COUNT(*) FROM support_tickets st WHERE {match}"), match_params
+            )
+        ).scalar() or 0
+    elif not search:
+        total, estimated = await estimated_count(session, "support_tickets"), True
 
     return {
         "tickets": tickets,
-        "page": page,
         "search": search,
-        "total_pages": total_pages
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+        "total": total,
+        "total_is_estimate": estimated,
     }
 
 @router.get("/{client_email}")
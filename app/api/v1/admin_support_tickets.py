@@ -1,21 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from fastapi import Request
 
-from app.db.session import get_session
+from app.db import queries
+from app.db.session import get_session, get_read_session
 from app.core.security import require_admin_auth
 
 router = APIRouter(prefix="/admin/support", tags=["Admin Support"], dependencies=[Depends(require_admin_auth)])
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/client/{client_id}")
 async def support_list_for_client(
     request: Request,
     client_id: int = Path(..., ge=1),
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
 ):
     res = await db.execute(
         text(
@@ -35,8 +35,8 @@ async def support_list_for_client(
             "request": request,
             "tickets": tickets,
             "client_id": client_id,
-            "page": 1,
-            "total_pages": 1,
+            "next_cursor": None,
+            "prev_cursor": None,
         },
     )
 
@@ -64,18 +64,7 @@ async def support_ticket_detail(
         raise HTTPException(status_code=404, detail="Ticket not found")
 
     # Messages
-    res2 = await db.execute(
-        text(
-            """
-            SELECT id, ticket_id, sender, message, created_at
-            FROM support_messages
-            WHERE ticket_id = :tid
-            ORDER BY created_at DESC
-            """
-        ),
-        {"tid": ticket_id},
-    )
-    messages = [dict(r) for r in res2.mappings().all()]
+    messages = await queries.fetch_all(db, queries.SUPPORT_MESSAGES_FOR_TICKET, tid=ticket_id)
 
     return templates.TemplateResponse(
         "admin/support_detail.html",
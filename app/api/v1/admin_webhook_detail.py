@@ -2,12 +2,11 @@ from fastapi import APIRouter, Depends, Request, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_session
 from app.core.security import require_admin_auth
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from app.models.webhook_event import WebhookEvent as WebhookEventModel
 
 
 # Serve templates from /app/templates
-templates = Jinja2Templates(directory="app/templates")
 
 # This router is mounted under /admin/stripe/webhooks and protected by admin auth
 router = APIRouter(
@@ -1,32 +1,53 @@
 from fastapi import APIRouter, Request, Query, Depends
+from app.core.templates import templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from app.db.session import get_session
+from sqlalchemy import select, func, text
+from app.db.pagination import Keyset, estimated_count
+from app.db.session import get_read_session
 from app.models.webhook_event import WebhookEvent
 
 router = APIRouter()
 
+_EVENTS_KEYSET = Keyset("received_at", "id", limit=15, id_type=str)
+
+
 @router.get("/events")
 async def webhook_events_listing(
     request: Request,
-    page: int = Query(1, ge=1),
-    db: AsyncSession = Depends(get_session)
+    cursor: str | None = Query(None, max_length=512),
+    count: str = Query("estimate", pattern="^(estimate|exact)$"),
+    db: AsyncSession = Depends(get_read_session)
 ):
-    per_page = 15
-    offset = (page - 1) * per_page
-
-    total = (await db.execute(select(func.count(WebhookEvent.id)))).scalar()
-    events = (await db.execute(select(WebhookEvent).order_by(WebhookEvent.received_at.desc()).offset(offset).limit(per_page))).scalars().all()
+    where, order, cursor_params = _EVENTS_KEYSET.clause(cursor)
+    rows = await db.execute(
+        text(
+            f"""
+            SELECT id, event_type, status, received_at
+            FROM webhook_events
+            WHERE {where}
+            ORDER BY {order}
+            LIMIT :limit
+            """
+        ),
+        {**cursor_params, "limit": _EVENTS_KEYSET.fetch_limit},
+    )
+    events, next_cursor, prev_cursor = _EVENTS_KEYSET.page(
+        [dict(r) for r in rows.mappings().all()], cursor
+    )
 
-    total_pages = max(1, (total + per_page - 1) // per_page)
+    if count == "exact":
+        total, estimated = (await db.execute(select(func.count(WebhookEvent.id)))).scalar() or 0, False
+    else:
+        total, estimated = await estimated_count(db, "webhook_events"), True
 
     return templates.TemplateResponse(
         "admin/webhook_events.html",
         {
             "request": request,
             "events": events,
-            "page": page,
-            "total_pages": total_pages,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
             "total": total,
+            "total_is_estimate": estimated,
         }
     )
@@ -1,15 +1,14 @@
 from fastapi import APIRouter, Request, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from fastapi.templating import Jinja2Templates
-from app.db.session import get_session
+from app.core.templates import templates
+from app.db.session import get_read_session
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/")
-async def webhooks_page(request: Request, db: AsyncSession = Depends(get_session)):
+async def webhooks_page(request: Request, db: AsyncSession = Depends(get_read_session)):
     res = await db.execute(
         text(
             """
@@ -28,7 +27,7 @@ async def webhooks_page(request: Request, db: AsyncSession = Depends(get_session
 
 
 @router.get("/{event_id}")
-async def webhook_detail(request: Request, event_id: int, db: AsyncSession = Depends(get_session)):
+async def webhook_detail(request: Request, event_id: int, db: AsyncSession = Depends(get_read_session)):
     res = await db.execute(
         text(
             """
@@ -10,49 +10,47 @@ from typing import Optional
 from dotenv import load_dotenv
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
-from fastapi.responses import JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.core.templates import templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from pydantic import BaseModel
 
-from app.db.session import get_session
+from app.core import openai_gateway, run_waiter
+from app.core.kv import get_kv
+from app.db import queries
+from app.db.session import get_session, unit_of_work
+from app.services import answer_cache
 from app.services.email import (
     send_call_booking_confirmation,
     send_call_booking_email,
 )
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
-templates = Jinja2Templates(directory="app/templates")
 
 load_dotenv()
 
-openai_client = None
 ASSISTANT_ID_CHAT = os.getenv("OPENAI_ASSISTANT_ID_CHAT", "")
 ASSISTANT_ID_MARKETER = os.getenv("OPENAI_ASSISTANT_ID_MARKETER", "")
+# The widget shows a typing indicator; past this the visitor gets an error instead
+CHAT_RUN_DEADLINE = 25.0
 
 
 def get_openai_client():
-    """Lazy-load OpenAI client + assistant id from ENV."""
-    global openai_client
-    if openai_client is None:
-        try:
-            from openai import OpenAI  # type: ignore
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise RuntimeError("Missing OpenAI API key in environment.")
-            openai_client = OpenAI(
-                api_key=api_key,
-                default_headers={"OpenAI-Beta": "assistants=v2"},
-            )
-        except ImportError:
-            raise HTTPException(status_code=500, detail="OpenAI library not installed.")
-    return openai_client
+    """Shared AsyncOpenAI client for the server's OPENAI_API_KEY."""
+    try:
+        return openai_gateway.get_client()
+    except openai_gateway.OpenAIUnavailable as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
 
 
-def get_or_create_assistant(client, assistant_type="chat"):
-    """Reuse existing assistant or create one with legacy instructions."""
-    global ASSISTANT_ID_CHAT, ASSISTANT_ID_MARKETER
+async def get_or_create_assistant(client, assistant_type="chat"):
+    """
+    Reuse the configured assistant, or create one with legacy instructions.
+
+    A created assistant id is kept in the KV store so every worker shares it
+    and only one of them ever calls assistants.create.
+    """
     assistant_id = ASSISTANT_ID_CHAT if assistant_type == "chat" else ASSISTANT_ID_MARKETER
     if assistant_id:
         return assistant_id
@@ -64,18 +62,21 @@ QUIZ ANSWERS (TEMP RULE):
 - Do NOT emit links or HTML for the quiz.
 - If asked about the quiz, respond with: "You can find the 6-question quiz link in the site footer—look for 'Take quick quiz'." Keep it plain text.
 """
-    try:
-        assistant = client.beta.assistants.create(
-            name="WebWise Solutions Assistant",
-            instructions=instructions,
-            model="gpt-4o-mini",
-            temperature=0.7,
-            extra_headers={"OpenAI-Beta": "assistants=v2"},
-        )
-        ASSISTANT_ID = assistant.id
-        return ASSISTANT_ID
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to create assistant: {e}")
+
+    async def create_assistant():
+        try:
+            assistant = await client.beta.assistants.create(
+                name="WebWise Solutions Assistant",
+                instructions=instructions,
+                model="gpt-4o-mini",
+                temperature=0.7,
+                extra_headers={"OpenAI-Beta": "assistants=v2"},
+            )
+            return assistant.id
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to create assistant: {e}")
+
+    return await get_kv().get_or_set(f"assistant:{assistant_type}", create_assistant)
 
 
 class ChatRequest(BaseModel):
@@ -108,17 +109,18 @@ class SupportTicketSchema(BaseModel):
     message: str
     priority: str = "normal"
 
-@router.post("/message", response_model=ChatResponse)
-async def send_message(
-    payload: ChatRequest,
-    session: AsyncSession = Depends(get_session)
-):
-    """Create or reuse chat session, run assistant, store history, return AI response."""
+async def _open_turn(payload: ChatRequest, session: AsyncSession) -> SimpleNamespace:
+    """
+    Everything before the assistant run: session/thread, the stored user message,
+    booking emails, and a cached answer when a new thread opens with a common question.
+    """
     client = get_openai_client()
-    assistant_id = get_or_create_assistant(client)
+    assistant_id = await get_or_create_assistant(client)
     thread = None
     session_id = payload.session_id or f"chat_{uuid.uuid4().hex[:8]}"
 
+    answers_version = cached_answer = None
+
     # 1) Get or create chat session
     find_session = await session.execute(
         text("SELECT id, session_id, thread_id FROM chat_sessions WHERE session_id = :sid"),
@@ -127,8 +129,21 @@ async def send_message(
     existing = find_session.mappings().first()
 
     if not existing:
-        # create new thread at OpenAI
-        thread = client.beta.threads.create(
+        # An opening question is answered from the cache without a run; later turns
+        # depend on the conversation so far and always go to the assistant
+        answers_version = await answer_cache.instructions_version(client, assistant_id)
+        cached_answer = await answer_cache.lookup(answers_version, payload.message)
+        # create new thread at OpenAI (seeded with the exchange when answered from cache)
+        seed = (
+            [
+                {"role": "user", "content": payload.message},
+                {"role": "assistant", "content": cached_answer},
+            ]
+            if cached_answer is not None
+            else []
+        )
+        thread = await client.beta.threads.create(
+            messages=seed,
             extra_headers={"OpenAI-Beta": "assistants=v2"},
         )
         await session.execute(
@@ -189,8 +204,56 @@ async def send_message(
 
     await try_send_booking_emails(payload.message)
 
+    return SimpleNamespace(
+        client=client,
+        assistant_id=assistant_id,
+        session_id=session_id,
+        chat_session_pk=existing["id"],
+        thread_id=thread_id,
+        # an opening question's answer doesn't depend on earlier turns, so it can be reused
+        is_opening=thread is not None,
+        answers_version=answers_version,
+        cached_answer=cached_answer,
+    )
+
+
+def _reply_body(turn: SimpleNamespace, ai_message: str) -> dict:
+    return {
+        "message": ai_message,
+        "response": ai_message,  # alias for frontend widget expecting 'response'
+        "session_id": turn.session_id,
+        "assistant_id": turn.assistant_id,
+        "thread_id": turn.thread_id
+    }
+
+
+async def _store_assistant_message(session: AsyncSession, chat_session_pk: int, ai_message: str) -> None:
+    # 7) Store assistant message in DB
+    await session.execute(
+        text("INSERT INTO chat_messages (session_id, role, content, created_at) "
+             "VALUES (:sid, 'assistant', :c, NOW())"),
+        {"sid": chat_session_pk, "c": ai_message}
+    )
+    await session.commit()
+
+
+@router.post("/message", response_model=ChatResponse)
+async def send_message(
+    payload: ChatRequest,
+    request: Request,
+    session: AsyncSession = Depends(get_session)
+):
+    """Create or reuse chat session, run assistant, store history, return AI response."""
+    turn = await _open_turn(payload, session)
+    if turn.cached_answer is not None:
+        await _store_assistant_message(session, turn.chat_session_pk, turn.cached_answer)
+        return _reply_body(turn, turn.cached_answer)
+
+    client = turn.client
+    thread_id = turn.thread_id
+
     # 3) Add message to OpenAI thread
-    client.beta.threads.messages.create(
+    await client.beta.threads.messages.create(
         thread_id=thread_id,
         role="user",
         content=payload.message,
@@ -198,28 +261,28 @@ async def send_message(
     )
 
     # 4) Run assistant
-    run = client.beta.threads.runs.create(
+    run = await client.beta.threads.runs.create(
         thread_id=thread_id,
-        assistant_id=assistant_id,
+        assistant_id=turn.assistant_id,
         extra_headers={"OpenAI-Beta": "assistants=v2"},
     )
 
     # 5) Wait for completion (async-friendly)
-    waited = 0
-    while run.status in ["queued", "in_progress", "requires_action"] and waited < 25:
-        await asyncio.sleep(1)
-        waited += 1
-        run = client.beta.threads.runs.retrieve(
-            thread_id=thread_id,
-            run_id=run.id,
-            extra_headers={"OpenAI-Beta": "assistants=v2"},
+    try:
+        await run_waiter.wait_for_run(
+            client,
+            thread_id,
+            run,
+            label="chat",
+            deadline=CHAT_RUN_DEADLINE,
+            is_disconnected=request.is_disconnected,
         )
-
-    if run.status != "completed":
+    except run_waiter.RunNotCompleted as e:
+        print(f"[chat] {e}")
         raise HTTPException(status_code=500, detail="Assistant did not complete.")
 
     # 6) Get last assistant message
-    msgs = client.beta.threads.messages.list(
+    msgs = await client.beta.threads.messages.list(
         thread_id=thread_id,
         order="desc",
         limit=1,
@@ -227,30 +290,146 @@ async def send_message(
     )
     ai_message = msgs.data[0].content[0].text.value
 
-    # 7) Store assistant message in DB
-    await session.execute(
-        text("INSERT INTO chat_messages (session_id, role, content, created_at) "
-             "VALUES (:sid, 'assistant', :c, NOW())"),
-        {"sid": existing["id"], "c": ai_message}
+    if turn.is_opening:
+        await answer_cache.store(turn.answers_version, payload.message, ai_message)
+
+    await _store_assistant_message(session, turn.chat_session_pk, ai_message)
+    return _reply_body(turn, ai_message)
+
+
+# Run events that end a streamed run without an answer
+_STREAM_FAILURES = {
+    "thread.run.failed",
+    "thread.run.cancelled",
+    "thread.run.expired",
+    "thread.run.incomplete",
+    "thread.run.requires_action",
+    "error",
+}
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/message/stream")
+async def send_message_stream(
+    payload: ChatRequest,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Same as /message, but relays the answer as Server-Sent Events while the run
+    generates it: `start` (ids), `delta` ({"text"}) as tokens arrive, then `done`
+    with the full reply (or `error`). The widget only falls back to /message when this
+    endpoint is unreachable, since by then the turn has not been opened.
+    """
+    turn = await _open_turn(payload, session)
+    if turn.cached_answer is not None:
+        await _store_assistant_message(session, turn.chat_session_pk, turn.cached_answer)
+        events = _cached_events(turn)
+    else:
+        await turn.client.beta.threads.messages.create(
+            thread_id=turn.thread_id,
+            role="user",
+            content=payload.message,
+            extra_headers={"OpenAI-Beta": "assistants=v2"},
+        )
+        # opened here so a refused run is a plain HTTP error rather than a broken stream
+        stream = await turn.client.beta.threads.runs.create(
+            thread_id=turn.thread_id,
+            assistant_id=turn.assistant_id,
+            stream=True,
+            extra_headers={"OpenAI-Beta": "assistants=v2"},
+        )
+        events = _relay_run(turn, payload.message, stream)
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # no proxy buffering, or Nginx would hold the deltas until the end
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    await session.commit()
 
-    return {
-        "message": ai_message,
-        "response": ai_message,  # alias for frontend widget expecting 'response'
-        "session_id": session_id,
-        "assistant_id": assistant_id,
-        "thread_id": thread_id
-    }
+
+async def _cached_events(turn: SimpleNamespace):
+    yield _sse("start", {"session_id": turn.session_id, "thread_id": turn.thread_id})
+    yield _sse("delta", {"text": turn.cached_answer})
+    yield _sse("done", _reply_body(turn, turn.cached_answer))
+
+
+async def _relay_run(turn: SimpleNamespace, question: str, stream):
+    parts: list[str] = []
+    final: Optional[str] = None
+    run_id = None
+    finished = False
+    try:
+        yield _sse("start", {"session_id": turn.session_id, "thread_id": turn.thread_id})
+        async for event in stream:
+            if event.event == "thread.run.created":
+                run_id = event.data.id
+            elif event.event == "thread.message.delta":
+                for block in event.data.delta.content or []:
+                    value = block.text.value if block.type == "text" and block.text else None
+                    if value:
+                        parts.append(value)
+                        yield _sse("delta", {"text": value})
+            elif event.event == "thread.message.completed":
+                final = "".join(b.text.value for b in event.data.content if b.type == "text")
+            elif event.event in _STREAM_FAILURES:
+                print(f"[chat stream] run ended with {event.event}")
+                yield _sse("error", {"detail": "Assistant did not complete."})
+                return
+
+        ai_message = final if final is not None else "".join(parts)
+        # the request's session may already be released while streaming; use our own
+        async with unit_of_work() as uow:
+            await uow.session.execute(
+                text("INSERT INTO chat_messages (session_id, role, content, created_at) "
+                     "VALUES (:sid, 'assistant', :c, NOW())"),
+                {"sid": turn.chat_session_pk, "c": ai_message}
+            )
+        if turn.is_opening:
+            await answer_cache.store(turn.answers_version, question, ai_message)
+        finished = True
+        yield _sse("done", _reply_body(turn, ai_message))
+    finally:
+        if not finished:
+            # visitor left or the run failed: stop paying for tokens nobody will read
+            _in_background(stream.close())
+            if run_id:
+                _in_background(_cancel_run(turn.client, turn.thread_id, run_id))
+
+
+async def _cancel_run(client, thread_id: str, run_id: str) -> None:
+    try:
+        await client.beta.threads.runs.cancel(
+            thread_id=thread_id,
+            run_id=run_id,
+            extra_headers={"OpenAI-Beta": "assistants=v2"},
+        )
+    except Exception as e:
+        # already finished or failed; nothing left to cancel
+        print(f"[chat stream] cancel {run_id} skipped: {e}")
+
+
+_background_tasks: set = set()
+
+
+def _in_background(coro) -> None:
+    task = asyncio.create_task(coro)
+    # hold a reference until done; the loop only keeps weak ones
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
 
 # Convenience alias to match /api/chat posting without /message
 @router.post("", response_model=ChatResponse)
 async def chat_entrypoint(
     payload: ChatRequest,
+    request: Request,
     session: AsyncSession = Depends(get_session)
 ):
-    return await send_message(payload, session)
+    return await send_message(payload, request, session)
 
 @router.post("/lead")
 async def capture_lead(
@@ -279,11 +458,7 @@ async def get_chat_history(
     if not sess:
         raise HTTPException(status_code=404, detail="Session not found.")
 
-    msgs = await session.execute(
-        text("SELECT role, content, created_at FROM chat_messages WHERE session_id = :id ORDER BY created_at ASC"),
-        {"id": sess["id"]}
-    )
-    messages = msgs.mappings().all()
+    messages = await queries.fetch_all(session, queries.CHAT_HISTORY, id=sess["id"])
 
     return {
         "session_id": session_id,
@@ -3,9 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_session
 from app.models.client import Client
 from sqlalchemy import select, func
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 
-templates = Jinja2Templates(directory="app/templates")
 
 router = APIRouter()
 
@@ -4,8 +4,10 @@ from pydantic import BaseModel
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db import queries
 from app.db.session import get_session
 from app.middleware.auth import _get_client_id
+from app.services import credentials_repo
 
 router = APIRouter()
 
@@ -20,61 +22,12 @@ class CredentialsPayload(BaseModel):
     dns_api_key: Optional[str] = None
 
 
-def _mask(value: Optional[str]) -> Optional[str]:
-    if not value:
-        return None
-    if len(value) <= 4:
-        return "****"
-    return f"{'*' * (len(value) - 4)}{value[-4:]}"
-
-
 @router.get("/credentials")
 async def get_credentials(
     db: AsyncSession = Depends(get_session),
     client_id: int = Depends(_get_client_id),
 ):
-    res = await db.execute(
-        text(
-            """
-            SELECT stripe_publishable_key, stripe_secret_key,
-                   openai_api_key, twilio_sid, twilio_token, twilio_from_number, dns_api_key
-            FROM credentials
-            WHERE client_id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    row = res.mappings().first()
-    if not row:
-        return {
-            "stripe": {"connected": False, "publishable_key": None, "secret_key": None},
-            "openai": {"connected": False, "api_key": None},
-            "twilio": {"connected": False, "sid": None, "token": None},
-            "dns": {"connected": False, "api_key": None},
-        }
-
-    return {
-        "stripe": {
-            "connected": bool(row.get("stripe_secret_key") or row.get("stripe_publishable_key")),
-            "publishable_key": _mask(row.get("stripe_publishable_key")),
-            "secret_key": _mask(row.get("stripe_secret_key")),
-        },
-        "openai": {
-            "connected": bool(row.get("openai_api_key")),
-            "api_key": _mask(row.get("openai_api_key")),
-        },
-        "twilio": {
-            "connected": bool(row.get("twilio_sid") or row.get("twilio_token")),
-            "sid": _mask(row.get("twilio_sid")),
-            "token": _mask(row.get("twilio_token")),
-            "from_number": row.get("twilio_from_number"),
-        },
-        "dns": {
-            "connected": bool(row.get("dns_api_key")),
-            "api_key": _mask(row.get("dns_api_key")),
-        },
-    }
+    return await credentials_repo.masked(db, client_id)
 
 
 @router.post("/credentials")
@@ -95,20 +48,7 @@ async def upsert_credentials(
     }
 
     try:
-        existing = await db.execute(
-            text(
-                """
-                SELECT id,
-                       stripe_publishable_key, stripe_secret_key,
-                       openai_api_key, twilio_sid, twilio_token, twilio_from_number, dns_api_key
-                FROM credentials
-                WHERE client_id = :cid
-                LIMIT 1
-                """
-            ),
-            {"cid": client_id},
-        )
-        row = existing.mappings().first()
+        row = await queries.fetch_one(db, queries.CREDENTIALS_ID_BY_CLIENT, cid=client_id)
 
         if row:
             await db.execute(
@@ -154,5 +94,7 @@ async def upsert_credentials(
         await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to save credentials.") from exc
 
+    credentials_repo.invalidate(client_id)
+
     return {"status": "saved"}
 
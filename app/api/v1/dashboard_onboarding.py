@@ -4,17 +4,18 @@ import os
 import uuid
 from fastapi import APIRouter, Request, Depends, HTTPException, status, File, UploadFile, Form
 from fastapi.responses import JSONResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import openai_gateway
+from app.db import queries
 from app.db.session import get_session
+from app.services import credentials_repo, prompt_cache
 from app.schemas.onboarding import ClientOnboardIn
 from pydantic import BaseModel
-from openai import OpenAI
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/welcome-instructions")
@@ -64,6 +65,14 @@ class PromptGenRequest(BaseModel):
     raw_text: str
 
 
+PROMPT_BUILDER_MODEL = "gpt-4o-mini"
+PROMPT_BUILDER_SYSTEM = (
+    "You are a prompt builder. Convert the user's rough business notes into a polished, structured system prompt "
+    "for a website AI assistant. Include services, offers, policies, tone, booking/lead handling, FAQs, and automation goals. "
+    "Return only the final prompt text, concise and ready to paste."
+)
+
+
 @router.post("/onboarding/generate-prompt")
 async def generate_prompt(
     payload: PromptGenRequest,
@@ -76,18 +85,10 @@ async def generate_prompt(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
     # Get OpenAI key from credentials
-    cred_row = await db.execute(
-        text(
-            """
-            SELECT openai_api_key
-            FROM credentials
-            WHERE client_id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    cred = cred_row.mappings().first()
+    cred = await credentials_repo.get(db, client_id)
+    # nothing else needs the database; don't hold a pooled connection idle in
+    # transaction through the prompt lock wait and the OpenAI call
+    await db.close()
     api_key = cred.get("openai_api_key") if cred else None
     if not api_key:
         # Fallback to server key so early users can generate a prompt before providing theirs
@@ -98,26 +99,22 @@ async def generate_prompt(
             detail="No OpenAI key found. Add your key in Integrations or set OPENAI_API_KEY on the server.",
         )
 
-    system_prompt = (
-        "You are a prompt builder. Convert the user's rough business notes into a polished, structured system prompt "
-        "for a website AI assistant. Include services, offers, policies, tone, booking/lead handling, FAQs, and automation goals. "
-        "Return only the final prompt text, concise and ready to paste."
-    )
-
-    try:
-        client = OpenAI(
-            api_key=api_key,
-            default_headers={"OpenAI-Beta": "assistants=v2"},
-        )
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
+    async def generate() -> str:
+        client = openai_gateway.get_client(api_key)
+        resp = await client.chat.completions.create(
+            model=PROMPT_BUILDER_MODEL,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": PROMPT_BUILDER_SYSTEM},
                 {"role": "user", "content": payload.raw_text},
             ],
         )
-        content = resp.choices[0].message.content if resp.choices else ""
-        return {"prompt": content}
+        return resp.choices[0].message.content if resp.choices else ""
+
+    try:
+        content, cached = await prompt_cache.get_or_generate(
+            client_id, payload.raw_text, PROMPT_BUILDER_MODEL, PROMPT_BUILDER_SYSTEM, generate
+        )
+        return {"prompt": content, "cached": cached}
     except HTTPException:
         raise
     except Exception as exc:  # noqa: BLE001
@@ -137,11 +134,7 @@ async def submit_onboarding(
 
     # Ensure a matching client row exists for FK; upsert minimal stub using user email.
     try:
-        user_email_row = await db.execute(
-            text("SELECT email FROM users WHERE id = :uid LIMIT 1"),
-            {"uid": client_id},
-        )
-        user_email = user_email_row.scalar_one_or_none()
+        user_email = await queries.fetch_val(db, queries.USER_EMAIL_BY_ID, uid=client_id)
     except Exception:
         user_email = None
 
@@ -175,11 +168,7 @@ async def submit_onboarding(
     cloudflare_email = str(payload.cloudflare_email) if uses_cloudflare and payload.cloudflare_email else None
 
     # Upsert credentials without relying on a unique constraint
-    cred_existing = await db.execute(
-        text("SELECT id FROM credentials WHERE client_id = :cid LIMIT 1"),
-        {"cid": client_id},
-    )
-    cred_row = cred_existing.mappings().first()
+    cred_row = await queries.fetch_one(db, queries.CREDENTIALS_ID_BY_CLIENT, cid=client_id)
 
     if cred_row:
         await db.execute(
@@ -357,6 +346,7 @@ async def submit_onboarding(
         pass
 
     await db.commit()
+    credentials_repo.invalidate(client_id)
 
     return {"status": "onboarding_saved", "client_id": client_id}
 
@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Request, Query, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from app.db.session import get_session
 from app.models.order import Order
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 @router.get("/orders")
 async def client_orders(
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Request, Form, HTTPException, status, Depends
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
@@ -9,7 +9,6 @@ from app.db.session import get_session
 from app.middleware.auth import _get_client_id
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/change-password")
@@ -1,13 +1,12 @@
 from fastapi import APIRouter, Depends, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from app.db.session import get_session
 from app.models.project import Project
 
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 @router.get("/projects")
 async def client_projects(
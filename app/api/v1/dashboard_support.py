@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Request, Depends
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.db.session import get_session
+from app.db.session import get_read_session
 from app.middleware.auth import _get_client_id
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 @router.get("/support")
 async def support_page(request: Request):
@@ -33,7 +32,7 @@ async def support_page_alias(request: Request):
 @router.get("/support/inbox")
 async def support_inbox(
     request: Request,
-    db: AsyncSession = Depends(get_session),
+    db: AsyncSession = Depends(get_read_session),
     client_id: int = Depends(_get_client_id),
 ):
     """Client support ticket inbox"""
@@ -3,9 +3,10 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-import smtplib
 from email.mime.text import MIMEText
 
+from app.core import smtp_pool
+from app.db import queries
 from app.db.session import get_session
 from app.services.cloudflare import CloudflareService, CloudflareAPIError
 from app.core.config import settings
@@ -93,12 +94,9 @@ async def submit_domain(
 
     # Try to email the client their nameservers (best effort)
     try:
-        res = await db.execute(
-            text("SELECT email FROM users WHERE id = :cid LIMIT 1"), {"cid": client_id}
-        )
-        row = res.mappings().first()
-        if row and row.get("email") and nameservers:
-            _send_nameserver_email(row["email"], domain, nameservers)
+        user_email = await queries.fetch_val(db, queries.USER_EMAIL_BY_ID, uid=client_id)
+        if user_email and nameservers:
+            await _send_nameserver_email(user_email, domain, nameservers)
     except Exception as exc:
         print(f"Nameserver email warning: {exc}")
 
@@ -131,7 +129,7 @@ async def get_domain(
     return dict(row)
 
 
-def _send_nameserver_email(to_email: str, domain: str, nameservers: list[str]):
+async def _send_nameserver_email(to_email: str, domain: str, nameservers: list[str]):
     if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
         print("Nameserver email skipped: SMTP not configured")
         return
@@ -146,21 +144,8 @@ def _send_nameserver_email(to_email: str, domain: str, nameservers: list[str]):
     msg["From"] = settings.SMTP_FROM_EMAIL
     msg["To"] = to_email
 
-    server = None
     try:
-        if settings.SMTP_PORT == 465:
-            server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
-        else:
-            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
-            server.starttls()
-        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-        server.send_message(msg)
+        await smtp_pool.send(msg)
     except Exception as exc:
         print(f"Nameserver email send failed: {exc}")
-    finally:
-        try:
-            if server:
-                server.quit()
-        except Exception:
-            pass
 
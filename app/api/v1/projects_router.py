@@ -4,10 +4,9 @@ from app.db.session import get_session
 from app.models.project import Project
 from sqlalchemy import select, func
 from fastapi.requests import Request
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 @router.get("/admin/projects")
 async def admin_projects(
@@ -7,49 +7,21 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import openai_gateway
+from app.db import queries
 from app.db.session import get_session
 from app.middleware.auth import _get_client_id
-
-try:
-    from openai import OpenAI  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    OpenAI = None
+from app.services import credentials_repo
 
 router = APIRouter(prefix="/api/provision", tags=["Provision"])
 
 
 async def _get_client(conn: AsyncSession, client_id: int) -> Optional[dict]:
-    res = await conn.execute(
-        text(
-            """
-            SELECT id, openai_assistant_id, assistant_status,
-                   twilio_voice_agent_sid, twilio_status
-            FROM clients
-            WHERE id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    row = res.mappings().first()
-    return dict(row) if row else None
+    return await queries.fetch_one(conn, queries.CLIENT_PROVISIONING, cid=client_id)
 
 
 async def _get_credentials(conn: AsyncSession, client_id: int) -> dict:
-    res = await conn.execute(
-        text(
-            """
-            SELECT stripe_publishable_key, stripe_secret_key,
-                   openai_api_key, twilio_sid, twilio_token, twilio_from_number, dns_api_key
-            FROM credentials
-            WHERE client_id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    row = res.mappings().first()
-    return dict(row) if row else {}
+    return await credentials_repo.get(conn, client_id) or {}
 
 
 @router.get("/status")
@@ -81,15 +53,15 @@ async def create_openai_assistant(
     api_key = creds.get("openai_api_key")
     if not api_key:
         raise HTTPException(status_code=400, detail="OpenAI key not found. Save it first.")
-    if OpenAI is None:
+    if openai_gateway.AsyncOpenAI is None:
         raise HTTPException(
             status_code=500,
             detail="OpenAI SDK not installed on server. Install 'openai' to proceed.",
         )
 
-    client = OpenAI(api_key=api_key)
+    client = openai_gateway.get_client(api_key)
     try:
-        assistant = client.beta.assistants.create(
+        assistant = await client.beta.assistants.create(
             name="WebWise Assistant",
             instructions="You are the assistant for a WebWise Solutions client.",
             model="gpt-4o-mini",
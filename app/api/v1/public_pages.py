@@ -2,13 +2,15 @@
 from datetime import datetime
 from types import SimpleNamespace
 from fastapi import APIRouter, Request, Depends, Form, HTTPException
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import RedirectResponse
+from app.core.templates import templates
+from fastapi.responses import RedirectResponse, Response
+from fastapi.routing import APIRoute
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from pathlib import Path
+from xml.sax.saxutils import escape
 from app.core.config import settings
-from app.db.session import get_session
+from app.core.http_cache import DATA_PAGE, cached_page
+from app.db.session import get_session, get_read_session
+from app.services import blog, testimonials_cache
 from app.models.testimonial import Testimonial
 from app.services.email import (
     send_call_booking_confirmation,
@@ -17,101 +19,61 @@ from app.services.email import (
 
 
 router = APIRouter(tags=["Public Pages"])
-templates = Jinja2Templates(directory="app/templates")
-templates.env.globals["now"] = datetime.utcnow
-
-BLOG_POSTS = [
-    {
-        "slug": "automate-lead-generation",
-        "title": "Automated Lead Generation Systems That Work 24/7",
-        "excerpt": "How to build inbound engines that capture and qualify leads on autopilot.",
-        "category": "Automation",
-        "template": "automate_lead_generation.html",
-        "published_at": datetime(2025, 12, 1),
-    },
-    {
-        "slug": "automated-booking-system-for-business",
-        "title": "Automated Booking Systems for Business",
-        "excerpt": "Reduce no-shows and manual scheduling with smart booking flows.",
-        "category": "Operations",
-        "template": "automated_booking_system_for_business.html",
-        "published_at": datetime(2025, 11, 20),
-    },
-    {
-        "slug": "automated-business-systems",
-        "title": "Automated Business Systems",
-        "excerpt": "Design the backbone that keeps sales, service, and fulfillment synchronized.",
-        "category": "Systems",
-        "template": "automated_business_systems.html",
-        "published_at": datetime(2025, 11, 5),
-    },
-    {
-        "slug": "custom-business-automation",
-        "title": "Custom Business Automation",
-        "excerpt": "Tailored workflows that match your real-world operations, not templates.",
-        "category": "Automation",
-        "template": "custom_business_automation.html",
-        "published_at": datetime(2025, 10, 18),
-    },
-    {
-        "slug": "website-automation-services",
-        "title": "Website Automation Services",
-        "excerpt": "Turn your site into a self-service, conversion-focused engine.",
-        "category": "Web",
-        "template": "website_automation_services.html",
-        "published_at": datetime(2025, 10, 2),
-    },
-]
+
+# Per-visitor, one-off or non-page routes left out of /sitemap.xml (blog pages come from the registry)
+SITEMAP_EXCLUDED = {
+    "/login", "/success", "/quiz-results", "/sitemap.xml", "/blog", "/blog/rss.xml", "/blog/atom.xml",
+}
 
 @router.get("/")
-async def home(request: Request, db: AsyncSession = Depends(get_session)):
+async def home(request: Request, db: AsyncSession = Depends(get_read_session)):
     # Fetch 3 approved testimonials for homepage
-    testimonials_query = (
-        select(Testimonial)
-        .where(Testimonial.is_approved.is_(True))
-        .order_by(Testimonial.created_at.desc())
-        .limit(6)
-    )
-    testimonials_result = await db.execute(testimonials_query)
-    testimonials = testimonials_result.scalars().all()
+    testimonials = await testimonials_cache.approved(db, limit=6)
     
-    return templates.TemplateResponse(
-        "public/home.html",
-        {"request": request, "testimonials": testimonials}
+    return cached_page(
+        request,
+        templates.TemplateResponse(
+            "public/home.html",
+            {"request": request, "testimonials": testimonials}
+        ),
+        DATA_PAGE,
     )
 # ...rest unchanged ...
 
 @router.get("/faq")
 async def faq(request: Request):
-    return templates.TemplateResponse("public/faq.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/faq.html", {"request": request}))
 
 @router.get("/contact")
 async def contact(request: Request):
-    return templates.TemplateResponse("public/contact.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/contact.html", {"request": request}))
 
 @router.get("/services")
 async def services(request: Request):
-    return templates.TemplateResponse("public/services.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/services.html", {"request": request}))
 
 @router.get("/testimonials")
-async def testimonials(request: Request, db: AsyncSession = Depends(get_session)):
+async def testimonials(request: Request, db: AsyncSession = Depends(get_read_session)):
     # Fetch approved testimonials
-    query = select(Testimonial).where(
-        Testimonial.is_approved == True
-    ).order_by(Testimonial.created_at.desc())
-    result = await db.execute(query)
-    testimonials_list = result.scalars().all()
+    testimonials_list = await testimonials_cache.approved(db)
     
-    return templates.TemplateResponse(
-        "public/testimonials.html",
-        {"request": request, "testimonials": testimonials_list}
+    return cached_page(
+        request,
+        templates.TemplateResponse(
+            "public/testimonials.html",
+            {"request": request, "testimonials": testimonials_list}
+        ),
+        DATA_PAGE,
     )
 
 @router.get("/testimonials/submit")
 async def testimonial_submit_page(request: Request):
-    return templates.TemplateResponse(
-        "public/testimonial_submit.html",
-        {"request": request}
+    return cached_page(
+        request,
+        templates.TemplateResponse(
+            "public/testimonial_submit.html",
+            {"request": request}
+        ),
     )
 
 @router.post("/testimonials/submit")
@@ -145,6 +107,7 @@ async def testimonial_submit(
         db.add(testimonial)
         await db.commit()
         await db.refresh(testimonial)
+        testimonials_cache.invalidate()
         
         return templates.TemplateResponse(
             "public/testimonial_submit.html",
@@ -166,19 +129,19 @@ async def testimonial_submit(
 
 @router.get("/tos")
 async def tos(request: Request):
-    return templates.TemplateResponse("public/tos.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/tos.html", {"request": request}))
 
 @router.get("/privacy_policy")
 async def privacy_policy(request: Request):
-    return templates.TemplateResponse("public/privacy_policy.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/privacy_policy.html", {"request": request}))
 
 @router.get("/how-it-works")
 async def how_it_works(request: Request):
-    return templates.TemplateResponse("public/how-it-works.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/how-it-works.html", {"request": request}))
 
 @router.get("/the-shift")
 async def the_shift(request: Request):
-    return templates.TemplateResponse("public/the-shift.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/the-shift.html", {"request": request}))
 
 def _stripe_context():
     return {
@@ -190,36 +153,17 @@ def _stripe_context():
 
 
 @router.get("/choose-your-build")
-async def choose_your_build(request: Request, db: AsyncSession = Depends(get_session)):
-    # Fetch approved testimonials for carousel
-    testimonials_query = (
-        select(Testimonial)
-        .where(Testimonial.is_approved.is_(True))
-        .order_by(Testimonial.created_at.desc())
-    )
-    testimonials_result = await db.execute(testimonials_query)
-    testimonials = testimonials_result.scalars().all()
-    
-    # Convert to dict for JSON serialization
-    testimonials_data = [
-        {
-            "client_name": t.client_name,
-            "client_location": t.client_location,
-            "event_type": t.event_type,
-            "testimonial_text": t.testimonial_text,
-            "rating": t.rating or 5,
-            "website_url": t.website_url,
-        }
-        for t in testimonials
-    ]
-    
+async def choose_your_build(request: Request, db: AsyncSession = Depends(get_read_session)):
+    # Approved testimonials for carousel, already in JSON-serializable form
+    testimonials_data = await testimonials_cache.carousel(db)
+
     ctx = {"request": request, "testimonials": testimonials_data}
     ctx.update(_stripe_context())
-    return templates.TemplateResponse("public/choose-your-build.html", ctx)
+    return cached_page(request, templates.TemplateResponse("public/choose-your-build.html", ctx), DATA_PAGE)
 
 @router.get("/book-call")
 async def book_call(request: Request):
-    return templates.TemplateResponse("public/book-call.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/book-call.html", {"request": request}))
 
 @router.post("/book-call/submit")
 async def book_call_submit(request: Request):
@@ -251,43 +195,24 @@ async def book_call_submit(request: Request):
 
 @router.get("/automate-or-die")
 async def automate_or_die(request: Request):
-    return templates.TemplateResponse("public/automate-or-die.html", {"request": request})    
+    return cached_page(request, templates.TemplateResponse("public/automate-or-die.html", {"request": request}))
 
 @router.get("/start-build-process")
 async def star_build_process(request: Request):
-    return templates.TemplateResponse("public/start-build-process.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/start-build-process.html", {"request": request}))
 
 @router.get("/start-your-project")
 async def start_your_project(request: Request):
-    return templates.TemplateResponse("public/start-your-project.html", {"request": request})    
+    return cached_page(request, templates.TemplateResponse("public/start-your-project.html", {"request": request}))
     
 @router.get("/pricing")
-async def pricing(request: Request, db: AsyncSession = Depends(get_session)):
-    # Fetch approved testimonials for carousel
-    testimonials_query = (
-        select(Testimonial)
-        .where(Testimonial.is_approved.is_(True))
-        .order_by(Testimonial.created_at.desc())
-    )
-    testimonials_result = await db.execute(testimonials_query)
-    testimonials = testimonials_result.scalars().all()
-    
-    # Convert to dict for JSON serialization
-    testimonials_data = [
-        {
-            "client_name": t.client_name,
-            "client_location": t.client_location,
-            "event_type": t.event_type,
-            "testimonial_text": t.testimonial_text,
-            "rating": t.rating or 5,
-            "website_url": t.website_url,
-        }
-        for t in testimonials
-    ]
-    
+async def pricing(request: Request, db: AsyncSession = Depends(get_read_session)):
+    # Approved testimonials for carousel, already in JSON-serializable form
+    testimonials_data = await testimonials_cache.carousel(db)
+
     ctx = {"request": request, "testimonials": testimonials_data}
     ctx.update(_stripe_context())
-    return templates.TemplateResponse("public/pricing.html", ctx)
+    return cached_page(request, templates.TemplateResponse("public/pricing.html", ctx), DATA_PAGE)
 
 
 @router.get("/success")
@@ -296,53 +221,122 @@ async def checkout_success(request: Request):
 
 @router.get("/portfolio")
 async def portfolio(request: Request):
-    return templates.TemplateResponse("public/portfolio.html", {"request": request})  
+    return cached_page(request, templates.TemplateResponse("public/portfolio.html", {"request": request}))
 
 @router.get("/blog")
 async def blog_index(request: Request):
-    return templates.TemplateResponse("blog/our_blog.html", {"request": request, "blog_posts": BLOG_POSTS})
+    return _blog_listing(request, 1)
+
+@router.get("/blog/page/{page}")
+async def blog_index_page(page: int, request: Request):
+    if page == 1:
+        return RedirectResponse("/blog", status_code=301)
+    return _blog_listing(request, page)
+
+def _blog_listing(request: Request, page: int):
+    registry = blog.registry()
+    posts = registry.page(page)
+    if posts is None:
+        raise HTTPException(status_code=404, detail="Page not found")
+    return cached_page(
+        request,
+        templates.TemplateResponse(
+            "blog/our_blog.html",
+            {
+                "request": request,
+                "blog_posts": posts,
+                "page": page,
+                "total_pages": len(registry.pages),
+            },
+        ),
+        last_modified=registry.updated_at,
+    )
+
+@router.get("/blog/rss.xml")
+async def blog_rss(request: Request):
+    registry = blog.registry()
+    return cached_page(
+        request,
+        Response(registry.rss, media_type="application/rss+xml"),
+        last_modified=registry.updated_at,
+    )
+
+@router.get("/blog/atom.xml")
+async def blog_atom(request: Request):
+    registry = blog.registry()
+    return cached_page(
+        request,
+        Response(registry.atom, media_type="application/atom+xml"),
+        last_modified=registry.updated_at,
+    )
+
+@router.get("/sitemap.xml")
+async def sitemap(request: Request):
+    return cached_page(request, Response(_sitemap_xml(), media_type="application/xml"))
+
+def _sitemap_xml() -> str:
+    urls = [
+        (blog.SITE_URL + route.path, None)
+        for route in router.routes
+        if isinstance(route, APIRoute)
+        and "GET" in route.methods
+        and "{" not in route.path
+        and route.path not in SITEMAP_EXCLUDED
+    ]
+    urls += blog.registry().sitemap_entries()
+    body = "".join(
+        f"<url><loc>{escape(loc)}</loc>"
+        + (f"<lastmod>{lastmod.date().isoformat()}</lastmod>" if lastmod else "")
+        + "</url>"
+        for loc, lastmod in urls
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{body}</urlset>'
+    )
 
 @router.get("/about")
 async def about(request: Request):
-    return templates.TemplateResponse("public/about.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/about.html", {"request": request}))
 
 @router.get("/blog/{slug}")
 async def blog_detail(slug: str, request: Request):
-    # Map slug to template file
-    post = next((p for p in BLOG_POSTS if p["slug"] == slug), None)
+    post = blog.registry().get(slug)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    template_name = post.get("template")
-    template_path = Path("app/templates/blog") / template_name
-    if not template_path.exists():
-        raise HTTPException(status_code=404, detail="Post not found")
-
-    return templates.TemplateResponse(
-        f"blog/{template_name}",
-        {
-            "request": request,
-            "post": post,
-        },
+    return cached_page(
+        request,
+        templates.TemplateResponse(
+            f"blog/{post['template']}",
+            {
+                "request": request,
+                "post": post,
+            },
+        ),
+        last_modified=post["last_modified"],
     )
 
 @router.get("/client-quiz")
 async def client_quiz(request: Request):
-    return templates.TemplateResponse("public/client-quiz.html", {"request": request})
+    return cached_page(request, templates.TemplateResponse("public/client-quiz.html", {"request": request}))
 
 @router.get("/client-results")
 async def client_results(request: Request):
-    return templates.TemplateResponse("public/client-results.html", {"request": request})    
+    return cached_page(request, templates.TemplateResponse("public/client-results.html", {"request": request}))
 
 @router.get("/meet-the-team")
 async def meet_the_team(request: Request):
-    return templates.TemplateResponse("public/meet-the-team.html", {"request": request}) 
+    return cached_page(request, templates.TemplateResponse("public/meet-the-team.html", {"request": request}))
 
 @router.get("/quiz-results")
 async def quiz_results(request: Request, package: str | None = None):
-    return templates.TemplateResponse(
-        "public/quiz-results.html",
-        {"request": request, "package": package or "growth"},
+    return cached_page(
+        request,
+        templates.TemplateResponse(
+            "public/quiz-results.html",
+            {"request": request, "package": package or "growth"},
+        ),
     )
 
 @router.get("/login")
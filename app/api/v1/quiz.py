@@ -1,10 +1,10 @@
-import smtplib
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
+from app.core import smtp_pool
 from app.db.session import get_session
 from app.core.config import settings
 from email.mime.text import MIMEText
@@ -80,19 +80,7 @@ async def submit_quiz(payload: QuizSubmission, session: AsyncSession = Depends(g
         msg.attach(MIMEText(body, "plain"))
 
         if settings.SMTP_USER and settings.SMTP_PASSWORD:
-            if settings.SMTP_PORT == 465:
-                server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
-            else:
-                server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
-                server.starttls()
-            try:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                server.send_message(msg)
-            finally:
-                try:
-                    server.quit()
-                except Exception:
-                    server.close()
+            await smtp_pool.send(msg)
     except Exception:
         # swallow email errors; do not block user flow
         pass
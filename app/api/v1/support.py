@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
+from app.db import queries
 from app.db.session import get_session
 from app.middleware.auth import _get_client_id
 
@@ -72,18 +73,6 @@ async def list_support_tickets(
     db: AsyncSession = Depends(get_session),
     client_id: int = Depends(_get_client_id),
 ):
-    res = await db.execute(
-        text(
-            """
-            SELECT id, subject, status, priority, created_at, updated_at
-            FROM support_tickets
-            WHERE client_id = :cid
-            ORDER BY updated_at DESC
-            LIMIT 20
-            """
-        ),
-        {"cid": client_id},
-    )
-    tickets = [dict(r) for r in res.mappings().all()]
+    tickets = await queries.fetch_all(db, queries.SUPPORT_TICKETS_FOR_CLIENT, cid=client_id)
     return {"tickets": tickets}
 
@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import RedirectResponse
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.db.session import get_session
 from app.core.security import require_admin_auth
 from app.models.testimonial import Testimonial
+from app.services import testimonials_cache
 from datetime import datetime
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 # Client submits testimonial (public or authenticated client) - no admin auth required
 @router.post("/submit", status_code=201)
@@ -30,6 +30,7 @@ async def submit_testimonial(payload: dict, db: AsyncSession = Depends(get_sessi
     db.add(t)
     await db.commit()
     await db.refresh(t)
+    testimonials_cache.invalidate()
     return {"id": t.id, "status": "submitted"}
 
 # Admin testimonials management page
@@ -81,6 +82,7 @@ async def approve_testimonial(
         raise HTTPException(404, "Not found")
     t.is_approved = True
     await db.commit()
+    testimonials_cache.invalidate()
     return RedirectResponse(url="/admin/testimonials", status_code=303)
 
 # Admin deletes testimonial (POST for form submission)
@@ -95,6 +97,7 @@ async def delete_testimonial(
         raise HTTPException(404, "Not found")
     await db.delete(t)
     await db.commit()
+    testimonials_cache.invalidate()
     return RedirectResponse(url="/admin/testimonials", status_code=303)
 
 # Note: is_featured field doesn't exist in database, so feature endpoint removed
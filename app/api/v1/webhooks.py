@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.webhook_event import WebhookEvent
+from app.services.search import like_pattern, match_clause
 
 router = APIRouter(prefix="/api/admin/stripe/webhooks", tags=["Stripe Webhooks"])
 
@@ -29,9 +31,11 @@ async def list_webhooks(
     if status:
         q = q.filter(WebhookEvent.status == status)
     if search:
-        q = q.filter(WebhookEvent.event_type.ilike(f"%{search}%"))
+        clause, params = match_clause("webhook_events", search, fields=["event_type"], param_prefix="search")
+        q = q.filter(text(clause)).params(**params)
     if account:
-        q = q.filter(WebhookEvent.stripe_account.ilike(f"%{account}%"))
+        # Connect events carry the connected account id in the payload (backslash is LIKE's default escape)
+        q = q.filter(WebhookEvent.raw_payload["account"].as_string().ilike(like_pattern(account)))
 
     total = q.count()
     total_pages = max(1, (total + limit - 1) // limit)
@@ -0,0 +1,109 @@
+# app/core/http_cache.py
+"""
+HTTP caching for rendered public pages.
+
+cached_page() takes an already-rendered TemplateResponse and:
+- sets a strong ETag (hash of the rendered body) and, when given, Last-Modified
+- answers a matching If-None-Match / If-Modified-Since with an empty 304
+- sets Cache-Control from the route's CachePolicy, including s-maxage for the
+  Nginx/Cloudflare edge and stale-while-revalidate, so repeat views can be
+  served without reaching uvicorn
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+class CachePolicy:
+    def __init__(self, max_age: int, s_maxage: Optional[int] = None, stale_while_revalidate: int = 0):
+        self.max_age = max_age
+        self.s_maxage = s_maxage
+        self.stale_while_revalidate = stale_while_revalidate
+
+    @property
+    def header(self) -> str:
+        parts = ["public", f"max-age={self.max_age}"]
+        if self.s_maxage is not None:
+            parts.append(f"s-maxage={self.s_maxage}")
+        if self.stale_while_revalidate:
+            parts.append(f"stale-while-revalidate={self.stale_while_revalidate}")
+        return ", ".join(parts)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+# Pages that only change on deploy
+STATIC_PAGE = CachePolicy(
+    max_age=_env_int("PUBLIC_PAGE_MAX_AGE", 300),
+    s_maxage=_env_int("PUBLIC_PAGE_S_MAXAGE", 3600),
+    stale_while_revalidate=_env_int("PUBLIC_PAGE_SWR", 86400),
+)
+
+# Pages that embed database content (testimonials)
+DATA_PAGE = CachePolicy(
+    max_age=_env_int("DATA_PAGE_MAX_AGE", 60),
+    s_maxage=_env_int("DATA_PAGE_S_MAXAGE", 300),
+    stale_while_revalidate=_env_int("DATA_PAGE_SWR", 3600),
+)
+
+
+def etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # weak comparison, as RFC 9110 requires for If-None-Match
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def cached_page(
+    request: Request,
+    response: Response,
+    policy: CachePolicy = STATIC_PAGE,
+    last_modified: Optional[datetime] = None,
+) -> Response:
+    """Add validators + Cache-Control to a rendered response, or turn it into a 304."""
+    if response.status_code != 200:
+        return response
+
+    etag = etag_for(response.body)
+    headers = {"ETag": etag, "Cache-Control": policy.header}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    elif if_modified_since and last_modified is not None:
+        not_modified = _not_modified_since(if_modified_since, last_modified)
+    else:
+        not_modified = False
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,369 @@
+# app/core/kv.py
+"""
+Small key/value store shared by every worker.
+
+get/set with an optional TTL, atomic incr, and a named lock for
+single-flight work ("only one worker creates the assistant"). Values are
+JSON-encoded, so anything json.dumps accepts can be stored, and both
+backends behave the same way:
+
+- MemoryKV: a dict in this process. It is the default and the right choice
+  for tests and for a single uvicorn worker.
+- RedisKV:  speaks the Redis protocol (RESP) over a small pool of asyncio
+  connections (KV_POOL_SIZE per worker), so it works with Redis, Valkey, KeyDB
+  or any local stand-in that speaks it. Set KV_URL=redis://[:password@]host:6379/0
+  to use it.
+
+Do not put secrets here (client credentials, tokens); they belong in
+per-process caches such as app/services/credentials_repo.py.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import unquote, urlparse
+
+KV_URL = os.getenv("KV_URL") or os.getenv("REDIS_URL") or ""
+# Namespace for every key on a shared Redis
+KV_PREFIX = os.getenv("KV_PREFIX", "wws:")
+KV_TIMEOUT = float(os.getenv("KV_TIMEOUT", "2"))
+KV_POOL_SIZE = int(os.getenv("KV_POOL_SIZE", "8"))
+
+
+class LockTimeout(TimeoutError):
+    """The lock stayed held by someone else for longer than we were willing to wait."""
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def _decode(raw: Optional[str]) -> Any:
+    return None if raw is None else json.loads(raw)
+
+
+class KVStore:
+    """Interface shared by the backends; see the module docstring."""
+
+    async def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Add to an integer counter; ttl is applied when the counter is created."""
+        raise NotImplementedError
+
+    def lock(self, name: str, ttl: float = 30.0, wait: float = 10.0):
+        """
+        Async context manager holding `name` exclusively across workers.
+
+        ttl bounds how long a crashed holder can keep it; wait bounds how long we
+        queue for it before raising LockTimeout.
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        return None
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        lock_ttl: float = 30.0,
+    ) -> Any:
+        """Return the cached value, running loader() in exactly one worker on a miss."""
+        value = await self.get(key)
+        if value is not None:
+            return value
+        async with self.lock(f"lock:{key}", ttl=lock_ttl, wait=lock_ttl):
+            value = await self.get(key)
+            if value is None:
+                value = await loader()
+                if value is not None:
+                    await self.set(key, value, ttl)
+        return value
+
+
+class MemoryKV(KVStore):
+    # purge expired keys once the dict grows past this many entries
+    SWEEP_AT = 10_000
+
+    def __init__(self):
+        self._data: dict[str, tuple[str, Optional[float]]] = {}
+        # name -> [lock, holders + waiters]; dropped when nobody uses it
+        self._locks: dict[str, list] = {}
+
+    def _live(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        raw, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return raw
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (_, exp) in self._data.items() if exp is not None and exp <= now]:
+            del self._data[key]
+
+    def _put(self, key: str, raw: str, ttl: Optional[float]) -> None:
+        if len(self._data) >= self.SWEEP_AT:
+            self._sweep()
+        self._data[key] = (raw, time.monotonic() + ttl if ttl else None)
+
+    async def get(self, key: str) -> Any:
+        return _decode(self._live(key))
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._put(key, _encode(value), ttl)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        raw = self._live(key)
+        if raw is None:
+            value = amount
+            self._put(key, str(value), ttl)
+        else:
+            value = int(raw) + amount
+            self._data[key] = (str(value), self._data[key][1])
+        return value
+
+    @asynccontextmanager
+    async def lock(self, name: str, ttl: float = 30.0, wait: float = 10.0):
+        entry = self._locks.setdefault(name, [asyncio.Lock(), 0])
+        lock = entry[0]
+        entry[1] += 1
+        try:
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout=wait)
+            except asyncio.TimeoutError as exc:
+                raise LockTimeout(name) from exc
+            try:
+                yield
+            finally:
+                lock.release()
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[name]
+
+
+# Deletes the lock only if we still own it (it may have expired and been retaken)
+_RELEASE_SCRIPT = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+# INCRBY and the window's expiry in one step, so a counter can't be left without a TTL
+_INCR_SCRIPT = (
+    "local v = redis.call('incrby', KEYS[1], ARGV[1]) "
+    "if tonumber(ARGV[2]) > 0 and redis.call('pttl', KEYS[1]) == -1 then "
+    "redis.call('pexpire', KEYS[1], ARGV[2]) end "
+    "return v"
+)
+
+
+class RedisError(RuntimeError):
+    pass
+
+
+class _Connection:
+    """One RESP connection; a single command is in flight on it at a time."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    def _pack(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    async def _read_reply(self):
+        line = await self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by KV server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            data = await self.reader.readexactly(size + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            size = int(rest)
+            return None if size < 0 else [await self._read_reply() for _ in range(size)]
+        raise RedisError(f"unexpected reply {line!r}")
+
+    async def send(self, *args):
+        self.writer.write(self._pack(args))
+        await self.writer.drain()
+        return await self._read_reply()
+
+    @property
+    def is_open(self) -> bool:
+        return not self.writer.is_closing()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RedisKV(KVStore):
+    # lock() retries SET NX starting at the first delay, doubling up to the max
+    LOCK_POLL_INITIAL = 0.01
+    LOCK_POLL_MAX = 0.2
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = KV_PREFIX,
+        timeout: float = KV_TIMEOUT,
+        pool_size: int = KV_POOL_SIZE,
+    ):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.strip("/") or 0)
+        self.prefix = prefix
+        self.timeout = timeout
+        self._idle: deque = deque()  # connections ready for a command, most recent on the right
+        # at most pool_size commands (and connections) in flight per worker
+        self._slots = asyncio.Semaphore(pool_size)
+
+    # -- connections ------------------------------------------------------
+
+    async def _connect(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        conn = _Connection(reader, writer)
+        try:
+            if self.password:
+                await conn.send("AUTH", self.password)
+            if self.db:
+                await conn.send("SELECT", self.db)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def _checkout(self) -> Optional[_Connection]:
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.is_open:
+                return conn
+        return None
+
+    async def command(self, *args):
+        async with self._slots:
+            # a dropped connection gets one retry on a fresh one before the error surfaces
+            for attempt in (1, 2):
+                conn = self._checkout() if attempt == 1 else None
+                try:
+                    if conn is None:
+                        conn = await asyncio.wait_for(self._connect(), self.timeout)
+                    reply = await asyncio.wait_for(conn.send(*args), self.timeout)
+                except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    if conn is not None:
+                        conn.close()
+                    if attempt == 2:
+                        raise
+                    continue
+                except BaseException:
+                    # interrupted mid-command (e.g. cancelled): its reply may still be
+                    # unread, and the next caller must never receive it
+                    if conn is not None:
+                        conn.close()
+                    raise
+                self._idle.append(conn)
+                return reply
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.popleft().close()
+
+    # -- KVStore ----------------------------------------------------------
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    async def get(self, key: str) -> Any:
+        return _decode(await self.command("GET", self._key(key)))
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        args = ["SET", self._key(key), _encode(value)]
+        if ttl:
+            args += ["PX", int(ttl * 1000)]
+        await self.command(*args)
+
+    async def delete(self, key: str) -> None:
+        await self.command("DEL", self._key(key))
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        ttl_ms = int(ttl * 1000) if ttl else 0
+        return await self.command("EVAL", _INCR_SCRIPT, 1, self._key(key), amount, ttl_ms)
+
+    @asynccontextmanager
+    async def lock(self, name: str, ttl: float = 30.0, wait: float = 10.0):
+        key = self._key(name)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + wait
+        step = self.LOCK_POLL_INITIAL
+        while await self.command("SET", key, token, "NX", "PX", int(ttl * 1000)) is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LockTimeout(name)
+            await asyncio.sleep(min(step, remaining))
+            step = min(step * 2, self.LOCK_POLL_MAX)
+        try:
+            yield
+        finally:
+            await self.command("EVAL", _RELEASE_SCRIPT, 1, key, token)
+
+
+def create_kv(url: str = KV_URL) -> KVStore:
+    if url.startswith("rediss://"):
+        raise ValueError("KV_URL: TLS (rediss://) is not supported; terminate TLS in a local sidecar")
+    if url.startswith("redis://"):
+        return RedisKV(url)
+    return MemoryKV()
+
+
+_kv: Optional[KVStore] = None
+
+
+def get_kv() -> KVStore:
+    """The process-wide store configured by KV_URL (in-memory when unset)."""
+    global _kv
+    if _kv is None:
+        _kv = create_kv()
+    return _kv
+
+
+async def close_kv() -> None:
+    global _kv
+    if _kv is not None:
+        await _kv.close()
+        _kv = None
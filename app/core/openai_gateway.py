@@ -0,0 +1,99 @@
+# app/core/openai_gateway.py
+"""
+One place to get an AsyncOpenAI client.
+
+Every OpenAI call used to go through the synchronous SDK inside async
+handlers, so a slow completion stalled every other request on the worker.
+get_client() hands out AsyncOpenAI clients that:
+
+- are cached per API key (clients bring their own keys; the server key is
+  the default), in a small LRU so a key's client and its auth headers are
+  built once
+- share one pooled httpx.AsyncClient, so keep-alive connections to
+  api.openai.com are reused across keys and requests
+- use the timeouts/retries below instead of the SDK's 10 minute default
+
+Keys are only held in worker memory; the registry is indexed by a hash.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import httpx
+    from openai import AsyncOpenAI  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    httpx = None
+    AsyncOpenAI = None
+
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+# Distinct API keys with a live client in this worker
+OPENAI_CLIENTS_MAX = 256
+
+ASSISTANTS_V2 = {"OpenAI-Beta": "assistants=v2"}
+
+
+class OpenAIUnavailable(RuntimeError):
+    """No usable key, or the openai package is not installed."""
+
+
+_http_client = None
+_clients: "OrderedDict[str, AsyncOpenAI]" = OrderedDict()
+
+
+def _timeout():
+    return httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+
+
+def _shared_http_client():
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=_timeout(),
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+            ),
+        )
+    return _http_client
+
+
+def get_client(api_key: Optional[str] = None) -> "AsyncOpenAI":
+    """AsyncOpenAI client for api_key (or OPENAI_API_KEY), reused across requests."""
+    if AsyncOpenAI is None:
+        raise OpenAIUnavailable("OpenAI library not installed.")
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise OpenAIUnavailable("Missing OpenAI API key.")
+
+    fingerprint = hashlib.sha256(api_key.encode()).hexdigest()
+    client = _clients.get(fingerprint)
+    if client is not None:
+        _clients.move_to_end(fingerprint)
+        return client
+
+    client = AsyncOpenAI(
+        api_key=api_key,
+        timeout=_timeout(),
+        max_retries=OPENAI_MAX_RETRIES,
+        default_headers=ASSISTANTS_V2,
+        http_client=_shared_http_client(),
+    )
+    _clients[fingerprint] = client
+    # evicted clients need no close(): the connection pool belongs to _http_client
+    while len(_clients) > OPENAI_CLIENTS_MAX:
+        _clients.popitem(last=False)
+    return client
+
+
+async def close() -> None:
+    """Drop every client and close the shared connection pool (app shutdown)."""
+    global _http_client
+    _clients.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,150 @@
+# app/core/run_waiter.py
+"""
+Wait for an Assistants run to finish without hammering the API.
+
+wait_for_run() polls runs.retrieve with exponential backoff and jitter
+(RUN_POLL_INITIAL doubling up to RUN_POLL_MAX, each sleep drawn from the
+upper half of the current step so concurrent chats spread out), and gives up:
+
+- at the deadline (RUN_WAIT_DEADLINE by default)
+- when is_disconnected() reports the client has gone
+- when the run needs tool outputs (requires_action): none of our assistants
+  define tools, so nothing would ever submit them
+
+A run we give up on is cancelled so it stops consuming tokens. Poll counts,
+wait time and outcomes are kept per label for GET /api/admin/openai/runs.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+RUN_POLL_INITIAL = float(os.getenv("RUN_POLL_INITIAL", "0.5"))
+RUN_POLL_MAX = float(os.getenv("RUN_POLL_MAX", "4"))
+RUN_WAIT_DEADLINE = float(os.getenv("RUN_WAIT_DEADLINE", "60"))
+
+PENDING_STATUSES = {"queued", "in_progress", "cancelling"}
+
+
+class RunNotCompleted(RuntimeError):
+    """The run ended (or was abandoned) without completing; reason is the status or why we stopped."""
+
+    def __init__(self, run, reason: str):
+        super().__init__(f"Assistant run {getattr(run, 'id', '?')} did not complete: {reason}")
+        self.run = run
+        self.reason = reason
+
+
+class _RunStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: dict[str, dict] = {}
+
+    def record(self, label: str, polls: int, elapsed: float, outcome: str) -> None:
+        with self._lock:
+            entry = self._data.setdefault(
+                label, {"runs": 0, "polls": 0, "max_polls": 0, "wait": 0.0, "outcomes": {}}
+            )
+            entry["runs"] += 1
+            entry["polls"] += polls
+            entry["max_polls"] = max(entry["max_polls"], polls)
+            entry["wait"] += elapsed
+            entry["outcomes"][outcome] = entry["outcomes"].get(outcome, 0) + 1
+
+    def report(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "label": label,
+                    "runs": e["runs"],
+                    "polls": e["polls"],
+                    "avg_polls": round(e["polls"] / e["runs"], 2) if e["runs"] else 0.0,
+                    "max_polls": e["max_polls"],
+                    "avg_wait_ms": round(e["wait"] / e["runs"] * 1000, 1) if e["runs"] else 0.0,
+                    "outcomes": dict(e["outcomes"]),
+                }
+                for label, e in sorted(self._data.items())
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_stats = _RunStats()
+
+
+def run_report() -> list[dict]:
+    """Runs waited on per label: poll counts, average wait and how they ended."""
+    return _stats.report()
+
+
+def reset_run_stats() -> None:
+    _stats.reset()
+
+
+def _next_sleep(step: float) -> float:
+    return random.uniform(step / 2, step)
+
+
+async def _cancel(client, thread_id: str, run_id: str) -> None:
+    try:
+        await client.beta.threads.runs.cancel(
+            thread_id=thread_id,
+            run_id=run_id,
+            extra_headers={"OpenAI-Beta": "assistants=v2"},
+        )
+    except Exception as e:
+        # it may have finished in the meantime; nothing left to stop
+        print(f"[run waiter] cancel {run_id} skipped: {e}")
+
+
+async def wait_for_run(
+    client,
+    thread_id: str,
+    run,
+    *,
+    label: str = "run",
+    deadline: Optional[float] = None,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+):
+    """
+    Return the run once it has completed; raise RunNotCompleted otherwise.
+
+    deadline is in seconds from now; is_disconnected is typically
+    request.is_disconnected and is checked before every sleep.
+    """
+    deadline = RUN_WAIT_DEADLINE if deadline is None else deadline
+    start = time.monotonic()
+    step = RUN_POLL_INITIAL
+    polls = 0
+    outcome = "error"
+    try:
+        while run.status in PENDING_STATUSES:
+            remaining = deadline - (time.monotonic() - start)
+            if remaining <= 0:
+                outcome = "timeout"
+                break
+            if is_disconnected is not None and await is_disconnected():
+                outcome = "disconnected"
+                break
+            await asyncio.sleep(min(_next_sleep(step), remaining))
+            step = min(step * 2, RUN_POLL_MAX)
+            polls += 1
+            run = await client.beta.threads.runs.retrieve(
+                thread_id=thread_id,
+                run_id=run.id,
+                extra_headers={"OpenAI-Beta": "assistants=v2"},
+            )
+        else:
+            outcome = run.status
+    finally:
+        _stats.record(label, polls, time.monotonic() - start, outcome)
+
+    if outcome == "completed":
+        return run
+    if outcome in ("timeout", "disconnected", "requires_action"):
+        await _cancel(client, thread_id, run.id)
+    raise RunNotCompleted(run, outcome)
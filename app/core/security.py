@@ -1,14 +1,118 @@
 # /srv/projects/wws/app/core/security.py
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import itsdangerous
 from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 
+from app.db import queries
 from app.db.session import get_session
-from app.middleware.auth import signer
+from app.middleware.auth import admin_signer, signer
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# admin_session cookie lifetime; the signed claim expires with it
+ADMIN_SESSION_MAX_AGE = 60 * 60 * 24 * 30
+# How long a claim (or a DB check) is trusted before users.role is looked up again
+ADMIN_REVALIDATE_SECONDS = int(os.getenv("ADMIN_REVALIDATE_SECONDS", "300"))
+
+# admin id -> (is_admin, monotonic expiry); per worker. There is no revocation
+# hook: a demoted admin loses access once their claim and this entry are older
+# than ADMIN_REVALIDATE_SECONDS.
+_admin_status: dict[int, tuple[bool, float]] = {}
+_ADMIN_STATUS_MAX = 1024
+
+
+def issue_admin_token(admin_id: int) -> str:
+    """Value for the admin_session cookie: a timestamped, signed admin role claim."""
+    return admin_signer.sign(f"{admin_id}:admin").decode()
+
+
+def set_admin_cookie(response, admin_id: int) -> None:
+    response.set_cookie(
+        "admin_session",
+        issue_admin_token(admin_id),
+        httponly=True,
+        secure=True,
+        samesite="lax",
+        max_age=ADMIN_SESSION_MAX_AGE,
+    )
+
+
+def _cache_admin_status(admin_id: int, is_admin: bool) -> None:
+    if len(_admin_status) >= _ADMIN_STATUS_MAX:
+        now = time.monotonic()
+        for key in [k for k, (_, exp) in _admin_status.items() if exp <= now]:
+            del _admin_status[key]
+        if len(_admin_status) >= _ADMIN_STATUS_MAX:
+            _admin_status.clear()
+    _admin_status[admin_id] = (is_admin, time.monotonic() + ADMIN_REVALIDATE_SECONDS)
+
+
+def _cached_admin_status(admin_id: int) -> Optional[bool]:
+    entry = _admin_status.get(admin_id)
+    if entry is None:
+        return None
+    is_admin, expires = entry
+    if expires <= time.monotonic():
+        del _admin_status[admin_id]
+        return None
+    return is_admin
+
+
+def _parse_admin_cookie(cookie: str) -> tuple[Optional[int], bool]:
+    """Return (admin_id, claim_is_fresh); (None, False) if the cookie is invalid."""
+    try:
+        value, issued = admin_signer.unsign(
+            cookie, max_age=ADMIN_SESSION_MAX_AGE, return_timestamp=True
+        )
+        admin_id, role = value.decode().split(":", 1)
+        if role != "admin":
+            return None, False
+        age = (datetime.now(timezone.utc) - issued).total_seconds()
+        return int(admin_id), age < ADMIN_REVALIDATE_SECONDS
+    except itsdangerous.SignatureExpired:
+        return None, False
+    except itsdangerous.BadSignature:
+        pass
+    except ValueError:
+        return None, False
+
+    # Cookies issued before the role claim existed: plain signed id, always re-checked
+    try:
+        return int(signer.unsign(cookie).decode()), False
+    except (itsdangerous.BadSignature, ValueError):
+        return None, False
+
+
+async def verify_admin_cookie(cookie: Optional[str], db: AsyncSession) -> Optional[int]:
+    """
+    Admin id for a valid admin_session cookie, else None.
+
+    A claim issued within ADMIN_REVALIDATE_SECONDS, or an id verified (or
+    rejected) within that window, is answered from memory; only otherwise is
+    users.role checked, so most admin requests run no query at all.
+    """
+    if not cookie:
+        return None
+    admin_id, fresh = _parse_admin_cookie(cookie)
+    if admin_id is None:
+        return None
+
+    cached = _cached_admin_status(admin_id)
+    if cached is not None:
+        return admin_id if cached else None
+    if fresh:
+        return admin_id
+
+    is_admin = bool(await queries.fetch_val(db, queries.ADMIN_ID_CHECK, id=admin_id))
+    _cache_admin_status(admin_id, is_admin)
+    return admin_id if is_admin else None
+
 
 async def require_admin_auth(
     request: Request,
@@ -17,22 +121,15 @@ async def require_admin_auth(
 ):
     """
     Admin auth:
-    - Preferred: admin_session cookie (signed user_id with role='admin')
+    - Preferred: admin_session cookie (timestamped, signed admin role claim)
     - Fallback: Bearer token admin-dev-token (legacy)
     """
     # Cookie-based admin session
-    cookie = request.cookies.get("admin_session")
-    if cookie:
-        try:
-            admin_id = int(signer.unsign(cookie).decode())
-            res = await db.execute(
-                text("SELECT id FROM users WHERE id = :id AND role = 'admin' LIMIT 1"),
-                {"id": admin_id},
-            )
-            if res.scalar_one_or_none():
-                return True
-        except Exception:
-            pass
+    try:
+        if await verify_admin_cookie(request.cookies.get("admin_session"), db):
+            return True
+    except Exception:
+        pass
 
     # Bearer token fallback
     if credentials and credentials.credentials == "admin-dev-token":
@@ -0,0 +1,175 @@
+# app/core/smtp_pool.py
+"""
+Async SMTP transport shared by every email sender.
+
+Each email used to open a blocking smtplib connection inside an async
+handler, do TLS and login, send one message and quit, stalling the event
+loop for the whole handshake. send() instead goes through a small pool of
+aiosmtplib connections that are already authenticated and kept alive:
+
+- at most SMTP_POOL_SIZE connections per worker; extra senders wait their turn
+- a connection idle for more than SMTP_POOL_MAX_IDLE seconds is closed
+  rather than reused (providers drop idle sessions after a few minutes)
+- one idle for more than SMTP_HEALTHCHECK_AFTER seconds is checked with NOOP
+  before use
+- if the server dropped the connection anyway, send() reconnects and retries once
+
+Port 465 uses implicit TLS, anything else STARTTLS, as before.
+"""
+import asyncio
+import os
+import socket
+import time
+from collections import deque
+from email.message import Message
+from typing import Optional
+
+try:
+    import aiosmtplib
+    from aiosmtplib import SMTPAuthenticationError, SMTPException, SMTPServerDisconnected
+except Exception:  # pragma: no cover - optional dependency
+    aiosmtplib = None
+
+    class SMTPException(Exception):
+        pass
+
+    class SMTPAuthenticationError(SMTPException):
+        pass
+
+    class SMTPServerDisconnected(SMTPException):
+        pass
+
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "3"))
+SMTP_POOL_MAX_IDLE = float(os.getenv("SMTP_POOL_MAX_IDLE", "240"))
+SMTP_HEALTHCHECK_AFTER = float(os.getenv("SMTP_HEALTHCHECK_AFTER", "30"))
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+
+
+class MailUnavailable(RuntimeError):
+    """SMTP is not configured, or aiosmtplib is not installed."""
+
+
+class SmtpPool:
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        *,
+        size: int = SMTP_POOL_SIZE,
+        max_idle: float = SMTP_POOL_MAX_IDLE,
+        check_after: float = SMTP_HEALTHCHECK_AFTER,
+        timeout: float = SMTP_TIMEOUT,
+        use_tls: Optional[bool] = None,
+        start_tls: Optional[bool] = None,
+    ):
+        if aiosmtplib is None:
+            raise MailUnavailable("aiosmtplib not installed.")
+        self.hostname = hostname
+        self.port = int(port)
+        self.username = username
+        self.password = password
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self.timeout = timeout
+        self.use_tls = self.port == 465 if use_tls is None else use_tls
+        self.start_tls = (not self.use_tls) if start_tls is None else start_tls
+        self.connects = 0
+        self._idle: deque = deque()  # (connection, last used), most recent on the right
+        self._slots = asyncio.Semaphore(size)
+        self._local_hostname: Optional[str] = None
+
+    async def _connect(self) -> "aiosmtplib.SMTP":
+        if self._local_hostname is None:
+            # aiosmtplib would call socket.getfqdn() on the event loop for every EHLO
+            self._local_hostname = await asyncio.to_thread(socket.getfqdn)
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username or None,
+            password=self.password or None,
+            local_hostname=self._local_hostname,
+            timeout=self.timeout,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls,
+        )
+        await smtp.connect()  # EHLO, TLS and login
+        self.connects += 1
+        return smtp
+
+    async def _discard(self, smtp) -> None:
+        try:
+            if smtp.is_connected:
+                await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    async def _checkout(self) -> "aiosmtplib.SMTP":
+        while self._idle:
+            smtp, last_used = self._idle.pop()
+            idle_for = time.monotonic() - last_used
+            if not smtp.is_connected or idle_for > self.max_idle:
+                await self._discard(smtp)
+                continue
+            if idle_for > self.check_after:
+                try:
+                    await smtp.noop()
+                except Exception:
+                    smtp.close()
+                    continue
+            return smtp
+        return await self._connect()
+
+    async def send(self, message: Message) -> None:
+        """Send one message on a pooled connection, reconnecting once if it went stale."""
+        async with self._slots:
+            smtp = await self._checkout()
+            try:
+                try:
+                    await smtp.send_message(message)
+                except (SMTPServerDisconnected, ConnectionError):
+                    smtp.close()
+                    smtp = await self._connect()
+                    await smtp.send_message(message)
+            except BaseException:
+                smtp.close()
+                raise
+            self._idle.append((smtp, time.monotonic()))
+
+    async def close(self) -> None:
+        while self._idle:
+            smtp, _ = self._idle.popleft()
+            await self._discard(smtp)
+
+
+_pool: Optional[SmtpPool] = None
+
+
+def get_pool() -> SmtpPool:
+    """The worker's pool for the SMTP_* settings."""
+    global _pool
+    if _pool is None:
+        from app.core.config import settings
+
+        if not settings.SMTP_HOST:
+            raise MailUnavailable("SMTP_HOST is not configured.")
+        _pool = SmtpPool(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            settings.SMTP_USER,
+            settings.SMTP_PASSWORD,
+        )
+    return _pool
+
+
+async def send(message: Message) -> None:
+    await get_pool().send(message)
+
+
+async def close() -> None:
+    """Quit every pooled connection (app shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
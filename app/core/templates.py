@@ -0,0 +1,96 @@
+# app/core/templates.py
+"""
+The one Jinja2Templates instance shared by every router and the email service.
+
+A single environment means one template cache and one set of globals/filters
+per worker, instead of a separate copy per module. Compiled templates are also
+written to a FileSystemBytecodeCache, so a fresh worker loads bytecode rather
+than re-parsing big pages like pricing.html or onboarding.html, and
+precompile() can warm everything at startup (JINJA_PRECOMPILE=true).
+"""
+import os
+import stat
+import time
+from datetime import datetime
+from pathlib import Path
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from app.core.jinja_filters import pretty_status
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Keep every template resident (~80 today); Jinja's default is 400 across all modules
+JINJA_CACHE_SIZE = int(os.getenv("JINJA_CACHE_SIZE", "1000"))
+# Unset: Jinja's own per-user 0700 directory under the temp dir (owner-checked)
+JINJA_BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR") or None
+# Re-check template mtimes on every render; turn off in production for fewer stat() calls
+JINJA_AUTO_RELOAD = _env_bool("JINJA_AUTO_RELOAD", True)
+JINJA_PRECOMPILE = _env_bool("JINJA_PRECOMPILE", False)
+
+
+def _private_dir(path: str) -> bool:
+    """True if path is a directory owned by this process's user and not writable by anyone else."""
+    info = os.lstat(path)
+    return (
+        stat.S_ISDIR(info.st_mode)
+        and info.st_uid == os.getuid()
+        and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+
+def _bytecode_cache():
+    # Bytecode is executed on load, so the directory must be ours alone
+    try:
+        if JINJA_BYTECODE_CACHE_DIR is None:
+            return jinja2.FileSystemBytecodeCache()
+        os.makedirs(JINJA_BYTECODE_CACHE_DIR, mode=0o700, exist_ok=True)
+        if not _private_dir(JINJA_BYTECODE_CACHE_DIR):
+            print(
+                f"Jinja bytecode cache disabled ({JINJA_BYTECODE_CACHE_DIR}): "
+                "must be owned by this user and not group/other writable"
+            )
+            return None
+        return jinja2.FileSystemBytecodeCache(JINJA_BYTECODE_CACHE_DIR)
+    except (OSError, RuntimeError) as exc:
+        print(f"Jinja bytecode cache disabled ({JINJA_BYTECODE_CACHE_DIR}): {exc}")
+        return None
+
+
+def _build() -> Jinja2Templates:
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(TEMPLATES_DIR)),
+        autoescape=True,
+        cache_size=JINJA_CACHE_SIZE,
+        auto_reload=JINJA_AUTO_RELOAD,
+        bytecode_cache=_bytecode_cache(),
+    )
+    env.globals["now"] = datetime.utcnow
+    env.filters["pretty_status"] = pretty_status
+    return Jinja2Templates(env=env)
+
+
+templates = _build()
+
+
+def precompile() -> int:
+    """Load (compile or read bytecode for) every template; returns how many loaded."""
+    start = time.perf_counter()
+    loaded = 0
+    for name in templates.env.list_templates(extensions=("html", "txt")):
+        try:
+            templates.env.get_template(name)
+            loaded += 1
+        except jinja2.TemplateError as exc:
+            print(f"Template precompile failed for {name}: {exc}")
+    print(f"Precompiled {loaded} templates in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return loaded
@@ -0,0 +1,138 @@
+"""
+Keyset (cursor) pagination for admin listings.
+
+Listings are ordered newest-first on a (timestamp, id) pair. Instead of
+LIMIT/OFFSET, each page carries an opaque cursor holding the boundary row's
+key, so fetching page 50 costs the same index range scan as page 1.
+
+The timestamp may be NULL. Postgres sorts NULLs first in DESC order, and a
+row comparison against NULL is never true, so the WHERE clause spells the
+NULL cases out instead of wrapping the column in COALESCE, which would keep
+the (timestamp) index from being used.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(sort_value: Any, row_id: Any, direction: str = "next") -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = {"ts": sort_value.isoformat()}
+    payload = json.dumps({"k": sort_value, "id": row_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, Any, str]:
+    """Return (sort_value, id, direction); raise 400 on a tampered or stale cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value = data["k"]
+        if isinstance(sort_value, dict) and "ts" in sort_value:
+            sort_value = datetime.fromisoformat(sort_value["ts"])
+        direction = data.get("d", "next")
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return sort_value, data["id"], direction
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class Keyset:
+    """
+    Describes how one listing is ordered, e.g. Keyset("p.updated_at", "p.id").
+    id_type is the Python type of the id column (str for Stripe event ids).
+
+    Usage:
+        where, order, params = keyset.clause(cursor)
+        rows = ... f"WHERE <filters> AND {where} ORDER BY {order} LIMIT :limit" with
+                   limit = keyset.limit + 1
+        items, next_cursor, prev_cursor = keyset.page(rows, cursor)
+    """
+
+    def __init__(
+        self,
+        sort_col: str,
+        id_col: str,
+        sort_key: Optional[str] = None,
+        id_key: str = "id",
+        limit: int = 12,
+        id_type: type = int,
+    ):
+        self.sort_col = sort_col
+        self.id_col = id_col
+        self.sort_key = sort_key or sort_col.split(".")[-1]
+        self.id_key = id_key
+        self.limit = limit
+        self.id_type = id_type
+
+    @property
+    def fetch_limit(self) -> int:
+        # one extra row tells us whether another page exists
+        return self.limit + 1
+
+    def clause(self, cursor: Optional[str]) -> tuple[str, str, dict]:
+        desc = f"{self.sort_col} DESC, {self.id_col} DESC"
+        if not cursor:
+            return "TRUE", desc, {}
+        sort_value, row_id, direction = decode_cursor(cursor)
+        # the values go straight to SQL; a wrong type would be a 500, not a 400
+        if sort_value is not None and not isinstance(sort_value, datetime):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if isinstance(row_id, bool) or not isinstance(row_id, self.id_type):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        sort, id_ = self.sort_col, self.id_col
+        params = {"cursor_id": row_id}
+        if sort_value is not None:
+            params["cursor_sort"] = sort_value
+        if direction == "prev":
+            # ascending: non-NULL timestamps, then the NULLs
+            if sort_value is None:
+                where = f"({sort} IS NULL AND {id_} > :cursor_id)"
+            else:
+                where = f"(({sort}, {id_}) > (:cursor_sort, :cursor_id) OR {sort} IS NULL)"
+            return where, f"{sort} ASC, {id_} ASC", params
+        # descending: the NULLs first, then non-NULL timestamps
+        if sort_value is None:
+            where = f"(({sort} IS NULL AND {id_} < :cursor_id) OR {sort} IS NOT NULL)"
+        else:
+            where = f"({sort}, {id_}) < (:cursor_sort, :cursor_id)"
+        return where, desc, params
+
+    def page(self, rows: list, cursor: Optional[str]) -> tuple[list, Optional[str], Optional[str]]:
+        """Trim the extra row, restore newest-first order and build both cursors."""
+        backwards = bool(cursor) and decode_cursor(cursor)[2] == "prev"
+        has_more = len(rows) > self.limit
+        items = list(rows[: self.limit])
+        if backwards:
+            items.reverse()
+        if not items:
+            return items, None, None
+
+        first, last = items[0], items[-1]
+        if backwards:
+            next_cursor = self._cursor(last, "next")
+            prev_cursor = self._cursor(first, "prev") if has_more else None
+        else:
+            next_cursor = self._cursor(last, "next") if has_more else None
+            prev_cursor = self._cursor(first, "prev") if cursor else None
+        return items, next_cursor, prev_cursor
+
+    def _cursor(self, row, direction: str) -> str:
+        return encode_cursor(row[self.sort_key], row[self.id_key], direction)
+
+
+async def estimated_count(db: AsyncSession, table: str) -> int:
+    """Planner row estimate from pg_class; no table scan (refreshed by autovacuum/ANALYZE)."""
+    res = await db.execute(
+        text("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": table},
+    )
+    return res.scalar() or 0
@@ -0,0 +1,151 @@
+"""
+Per-request SQL profiling.
+
+Engine event hooks (and the raw asyncpg path in app/db/queries.py) record
+every statement into a RequestProfile bound to the current request through a
+ContextVar: statement count, total DB time, the slowest statement, and
+statements repeated within the request (the N+1 pattern).
+
+sql_profile_middleware logs requests over the thresholds below, keeps the
+most recent offenders for GET /admin/db/requests, and in debug mode adds
+Server-Timing / X-DB-Statements headers to every response.
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SQL_PROFILE_MAX_STATEMENTS = int(os.getenv("SQL_PROFILE_MAX_STATEMENTS", "10"))
+SQL_PROFILE_MAX_DB_MS = float(os.getenv("SQL_PROFILE_MAX_DB_MS", "200"))
+# Same statement this many times in one request is reported as repeated
+SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv("SQL_PROFILE_REPEAT_THRESHOLD", "3"))
+# Explicit SQL_PROFILE_HEADERS wins; otherwise follow settings.DEBUG
+SQL_PROFILE_HEADERS = (
+    str(os.getenv("SQL_PROFILE_HEADERS") or getattr(settings, "DEBUG", None) or "")
+).strip().lower() in {"1", "true", "yes", "on"}
+
+
+class RequestProfile:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_sql: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def record(self, sql: str, elapsed: float) -> None:
+        sql = " ".join(sql.split())
+        self.count += 1
+        self.total += elapsed
+        self.statements[sql] += 1
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_sql = sql
+
+    def repeated(self) -> list[dict]:
+        return [
+            {"sql": sql, "count": n}
+            for sql, n in self.statements.most_common()
+            if n >= SQL_PROFILE_REPEAT_THRESHOLD
+        ]
+
+    def summary(self) -> dict:
+        return {
+            "statements": self.count,
+            "db_ms": round(self.total * 1000, 3),
+            "slowest_ms": round(self.slowest * 1000, 3),
+            "slowest_sql": self.slowest_sql,
+            "repeated": self.repeated(),
+        }
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+_recent_lock = threading.Lock()
+_recent_offenders: deque = deque(maxlen=50)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+def record(sql: str, elapsed: float) -> None:
+    """Add one statement to the current request's profile (no-op outside a request)."""
+    profile = _current.get()
+    if profile is not None:
+        profile.record(sql, elapsed)
+
+
+def recent_offenders() -> list[dict]:
+    """Most recent requests that crossed a threshold, newest first."""
+    with _recent_lock:
+        return list(reversed(_recent_offenders))
+
+
+def install(engine) -> None:
+    """Hook statement timing into an (async) engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._sql_profile_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_sql_profile_start", None)
+        if start is not None:
+            record(statement, time.perf_counter() - start)
+
+
+async def sql_profile_middleware(request: Request, call_next):
+    profile = RequestProfile()
+    token = _current.set(profile)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    summary = profile.summary()
+    over = (
+        profile.count > SQL_PROFILE_MAX_STATEMENTS
+        or summary["db_ms"] > SQL_PROFILE_MAX_DB_MS
+        or bool(summary["repeated"])
+    )
+    if over:
+        entry = {
+            "at": datetime.utcnow().isoformat(),
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            **summary,
+        }
+        with _recent_lock:
+            _recent_offenders.append(entry)
+        logger.warning(
+            "SQL profile %s %s: %d statements, %.1f ms DB, slowest %.1f ms, repeated=%s",
+            request.method,
+            request.url.path,
+            profile.count,
+            summary["db_ms"],
+            summary["slowest_ms"],
+            [r["count"] for r in summary["repeated"]],
+        )
+
+    if SQL_PROFILE_HEADERS:
+        response.headers["Server-Timing"] = (
+            f'db;dur={summary["db_ms"]};desc="{profile.count} statements"'
+        )
+        response.headers["X-DB-Statements"] = str(profile.count)
+    return response
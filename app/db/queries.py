@@ -0,0 +1,332 @@
+"""
+Shared SQL statements used by more than one router.
+
+Each statement is declared once here instead of being pasted inline as a
+fresh text() per call. Reads go straight to the asyncpg connection under the
+session (prepared once per connection and kept in asyncpg's statement cache),
+skipping SQLAlchemy's result processing, and come back as plain dicts.
+Every call is timed so /admin/db/queries can show which statements dominate.
+
+Statements marked hot=True are on request hot paths; tests/test_query_plans.py
+EXPLAINs each of them and fails if one falls back to a sequential scan.
+"""
+import re
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import profiling
+
+# :name binds, but not ::casts
+_PARAM_RE = re.compile(r"(?<!:):(?!:)([A-Za-z_]\w*)")
+
+
+class Query:
+    """A named statement, compiled once to both SQLAlchemy and asyncpg form."""
+
+    def __init__(self, name: str, sql: str, hot: bool = False):
+        self.name = name
+        self.hot = hot
+        self.sql = " ".join(sql.split())
+        self.stmt = text(self.sql)
+
+        names: list[str] = []
+
+        def _positional(match: re.Match) -> str:
+            key = match.group(1)
+            if key not in names:
+                names.append(key)
+            return f"${names.index(key) + 1}"
+
+        self.raw_sql = _PARAM_RE.sub(_positional, self.sql)
+        self.param_names = tuple(names)
+        _registry[name] = self
+
+    def args(self, params: dict) -> list:
+        return [params[n] for n in self.param_names]
+
+    def __repr__(self) -> str:  # pragma: no cover - simple debug helper
+        return f"<Query {self.name}>"
+
+
+_registry: dict[str, "Query"] = {}
+
+
+def registered_queries(hot_only: bool = False) -> list["Query"]:
+    """Every Query constructed so far (import the defining modules first)."""
+    return [q for q in _registry.values() if q.hot or not hot_only]
+
+
+class _QueryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: dict[str, list] = {}
+
+    def record(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            entry = self._data.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+    def report(self) -> list[dict]:
+        with self._lock:
+            rows = [
+                {
+                    "name": name,
+                    "calls": calls,
+                    "total_ms": round(total * 1000, 3),
+                    "avg_ms": round(total / calls * 1000, 3) if calls else 0.0,
+                    "max_ms": round(worst * 1000, 3),
+                }
+                for name, (calls, total, worst) in self._data.items()
+            ]
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_stats = _QueryStats()
+
+
+def query_report() -> list[dict]:
+    """Per-statement call count and latency, slowest total first."""
+    return _stats.report()
+
+
+def reset_query_stats() -> None:
+    _stats.reset()
+
+
+async def _asyncpg_connection(db: AsyncSession):
+    """Return the asyncpg connection behind the session, or None for other drivers."""
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    driver = getattr(raw, "driver_connection", None)
+    return driver if hasattr(driver, "fetchrow") else None
+
+
+async def _driver_call(query: Query, method, params: dict):
+    # Bypasses SQLAlchemy, so the engine events in app/db/profiling.py don't see it
+    start = time.perf_counter()
+    try:
+        return await method(query.raw_sql, *query.args(params))
+    finally:
+        profiling.record(query.sql, time.perf_counter() - start)
+
+
+async def fetch_one(db: AsyncSession, query: Query, **params) -> Optional[dict]:
+    start = time.perf_counter()
+    try:
+        driver = await _asyncpg_connection(db)
+        if driver is not None:
+            record = await _driver_call(query, driver.fetchrow, params)
+            return dict(record) if record is not None else None
+        row = (await db.execute(query.stmt, params)).mappings().first()
+        return dict(row) if row else None
+    finally:
+        _stats.record(query.name, time.perf_counter() - start)
+
+
+async def fetch_all(db: AsyncSession, query: Query, **params) -> list[dict]:
+    start = time.perf_counter()
+    try:
+        driver = await _asyncpg_connection(db)
+        if driver is not None:
+            records = await _driver_call(query, driver.fetch, params)
+            return [dict(r) for r in records]
+        return [dict(r) for r in (await db.execute(query.stmt, params)).mappings().all()]
+    finally:
+        _stats.record(query.name, time.perf_counter() - start)
+
+
+async def fetch_val(db: AsyncSession, query: Query, **params) -> Any:
+    start = time.perf_counter()
+    try:
+        driver = await _asyncpg_connection(db)
+        if driver is not None:
+            return await _driver_call(query, driver.fetchval, params)
+        return (await db.execute(query.stmt, params)).scalar_one_or_none()
+    finally:
+        _stats.record(query.name, time.perf_counter() - start)
+
+
+async def execute(db: AsyncSession, query: Query, **params):
+    """Run a write through the session so it joins the session transaction."""
+    start = time.perf_counter()
+    try:
+        return await db.execute(query.stmt, params)
+    finally:
+        _stats.record(query.name, time.perf_counter() - start)
+
+
+# ---------------------------------------------------------------------------
+# Registered statements
+# ---------------------------------------------------------------------------
+
+CREDENTIALS_BY_CLIENT = Query(
+    "credentials_by_client",
+    """
+    SELECT stripe_publishable_key, stripe_secret_key,
+           openai_api_key, twilio_sid, twilio_token, twilio_from_number, dns_api_key
+    FROM credentials
+    WHERE client_id = :cid
+    LIMIT 1
+    """,
+    hot=True,
+)
+
+CREDENTIALS_ID_BY_CLIENT = Query(
+    "credentials_id_by_client",
+    "SELECT id FROM credentials WHERE client_id = :cid LIMIT 1",
+    hot=True,
+)
+
+ONBOARDING_EXISTS = Query(
+    "onboarding_exists",
+    "SELECT 1 FROM client_onboarding WHERE client_id = :cid LIMIT 1",
+    hot=True,
+)
+
+ONBOARDING_FOR_ASSISTANT = Query(
+    "onboarding_for_assistant",
+    """
+    SELECT business_name, industry, site_description
+    FROM client_onboarding
+    WHERE client_id = :cid
+    LIMIT 1
+    """,
+    hot=True,
+)
+
+CLIENT_PROVISIONING = Query(
+    "client_provisioning",
+    """
+    SELECT id, openai_assistant_id, assistant_status,
+           twilio_voice_agent_sid, twilio_status
+    FROM clients
+    WHERE id = :cid
+    LIMIT 1
+    """,
+    hot=True,
+)
+
+USER_EMAIL_BY_ID = Query(
+    "user_email_by_id",
+    "SELECT email FROM users WHERE id = :uid LIMIT 1",
+    hot=True,
+)
+
+USER_LOGIN_BY_EMAIL = Query(
+    "user_login_by_email",
+    "SELECT id, hashed_password FROM users WHERE email = :email LIMIT 1",
+    hot=True,
+)
+
+ADMIN_LOGIN_BY_EMAIL = Query(
+    "admin_login_by_email",
+    "SELECT id, hashed_password FROM users WHERE email = :email AND role = 'admin' LIMIT 1",
+    hot=True,
+)
+
+ADMIN_ID_CHECK = Query(
+    "admin_id_check",
+    "SELECT id FROM users WHERE id = :id AND role = 'admin' LIMIT 1",
+    hot=True,
+)
+
+ORDER_ID_BY_SESSION = Query(
+    "order_id_by_stripe_session",
+    "SELECT id FROM orders WHERE stripe_session_id = :sid LIMIT 1",
+    hot=True,
+)
+
+# Serializes concurrent deliveries of one checkout session until the transaction ends
+ORDER_SESSION_LOCK = Query(
+    "order_session_lock",
+    "SELECT pg_advisory_xact_lock(hashtext(:sid))",
+)
+
+ORDER_PLAN_BY_BUYER_EMAIL = Query(
+    "order_plan_by_buyer_email",
+    """
+    SELECT plan
+    FROM orders
+    WHERE buyer_email = :email
+      AND welcome_sent = TRUE
+    ORDER BY created_at DESC
+    LIMIT 1
+    """,
+    hot=True,
+)
+
+ORDER_MARK_WELCOME_SENT = Query(
+    "order_mark_welcome_sent",
+    """
+    UPDATE orders
+    SET welcome_sent = TRUE, updated_at = NOW()
+    WHERE stripe_session_id = :sid
+      AND (welcome_sent IS NULL OR welcome_sent = FALSE)
+    RETURNING id
+    """,
+    hot=True,
+)
+
+CHAT_HISTORY = Query(
+    "chat_history",
+    "SELECT role, content, created_at FROM chat_messages WHERE session_id = :id ORDER BY created_at ASC",
+    hot=True,
+)
+
+SUPPORT_TICKETS_FOR_CLIENT = Query(
+    "support_tickets_for_client",
+    """
+    SELECT id, subject, status, priority, created_at, updated_at
+    FROM support_tickets
+    WHERE client_id = :cid
+    ORDER BY updated_at DESC
+    LIMIT 20
+    """,
+    hot=True,
+)
+
+SUPPORT_MESSAGES_FOR_TICKET = Query(
+    "support_messages_for_ticket",
+    """
+    SELECT id, ticket_id, sender, message, created_at
+    FROM support_messages
+    WHERE ticket_id = :tid
+    ORDER BY created_at DESC
+    """,
+    hot=True,
+)
+
+RECENT_WEBHOOK_EVENTS = Query(
+    "recent_webhook_events",
+    """
+    SELECT event_type, status
+    FROM webhook_events
+    ORDER BY received_at DESC
+    LIMIT :limit
+    """,
+    hot=True,
+)
+
+APPROVED_TESTIMONIALS = Query(
+    "approved_testimonials",
+    """
+    SELECT id, client_name, client_location, website_url, event_type,
+           testimonial_text, rating, created_at
+    FROM testimonials
+    WHERE approved = TRUE
+    ORDER BY created_at DESC
+    LIMIT :limit
+    """,
+    hot=True,
+)
@@ -0,0 +1,133 @@
+# app/export_static.py
+"""
+Render the public marketing site to static HTML files for Nginx to serve.
+
+Every HTML GET route in public_pages.py without path parameters is exported,
+plus every post and listing page in the blog registry. Pages are rendered
+through the real app, so the output is byte-for-byte what uvicorn would send.
+
+    python -m app.export_static --out /srv/wws/static-export --gzip
+    python -m app.export_static --out /srv/wws/static-export --only-data   # after testimonial changes
+    python -m app.export_static --out /srv/wws/static-export --skip-data   # no database needed
+
+Layout: "/" -> index.html, "/faq" -> faq.html, "/blog/<slug>" -> blog/<slug>.html,
+"/blog/page/2" -> blog/page/2.html,
+so Nginx can use `try_files /static-export$uri.html /static-export$uri/index.html @app;`.
+With --gzip/--brotli a .gz/.br sibling is written for gzip_static/brotli_static.
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import sys
+from pathlib import Path
+
+from fastapi.routing import APIRoute
+
+try:
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    brotli = None
+
+from app.api.v1.public_pages import router as public_pages_router
+from app.services import blog
+
+# Pages that embed database content (testimonials); re-export when it changes
+DATA_ROUTES = {"/", "/pricing", "/choose-your-build", "/testimonials"}
+# Per-visitor or one-off pages that must keep hitting the app, and the XML feeds
+EXCLUDED_ROUTES = {"/login", "/success", "/quiz-results", "/sitemap.xml", "/blog/rss.xml", "/blog/atom.xml"}
+
+
+def export_paths(include_data: bool = True, include_static: bool = True) -> list[str]:
+    paths = []
+    for route in public_pages_router.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        if "{" in route.path or route.path in EXCLUDED_ROUTES or route.path in paths:
+            continue
+        is_data = route.path in DATA_ROUTES
+        if (is_data and include_data) or (not is_data and include_static):
+            paths.append(route.path)
+    if include_static:
+        registry = blog.registry()
+        paths.extend(f"/blog/page/{n}" for n in range(2, len(registry.pages) + 1))
+        paths.extend(f"/blog/{post['slug']}" for post in registry.posts)
+    return paths
+
+
+def output_file(out_dir: Path, path: str) -> Path:
+    if path == "/":
+        return out_dir / "index.html"
+    return out_dir / (path.strip("/") + ".html")
+
+
+def _write(target: Path, body: bytes, use_gzip: bool, use_brotli: bool) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # write-then-rename so Nginx never serves a half-written file
+    for suffix, data in (
+        ("", body),
+        (".gz", gzip.compress(body, compresslevel=9, mtime=0) if use_gzip else None),
+        (".br", brotli.compress(body) if use_brotli else None),
+    ):
+        if data is None:
+            continue
+        final = target.with_name(target.name + suffix)
+        tmp = final.with_name(final.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, final)
+
+
+async def export(
+    out_dir: Path,
+    include_data: bool = True,
+    include_static: bool = True,
+    use_gzip: bool = False,
+    use_brotli: bool = False,
+) -> list[str]:
+    """Render and write every exported page; returns the paths that failed."""
+    import httpx
+
+    from app.main import app
+
+    failed = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://export.local") as client:
+        for path in export_paths(include_data, include_static):
+            resp = await client.get(path)
+            if resp.status_code != 200 or "text/html" not in resp.headers.get("content-type", ""):
+                print(f"skip {path}: HTTP {resp.status_code}")
+                failed.append(path)
+                continue
+            target = output_file(out_dir, path)
+            _write(target, resp.content, use_gzip, use_brotli)
+            print(f"{path} -> {target}")
+    return failed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export public pages to static HTML.")
+    parser.add_argument("--out", required=True, type=Path, help="output directory")
+    parser.add_argument("--gzip", action="store_true", help="also write .gz files")
+    parser.add_argument("--brotli", action="store_true", help="also write .br files (needs brotli)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--skip-data", action="store_true", help="skip pages that query the database")
+    group.add_argument("--only-data", action="store_true", help="only re-export database-driven pages")
+    args = parser.parse_args(argv)
+
+    if args.brotli and brotli is None:
+        parser.error("--brotli requires the brotli package")
+
+    failed = asyncio.run(
+        export(
+            args.out,
+            include_data=not args.skip_data,
+            include_static=not args.only_data,
+            use_gzip=args.gzip,
+            use_brotli=args.brotli,
+        )
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-from datetime import datetime
+import asyncio
 import secrets
 import hashlib
 from pathlib import Path
@@ -11,12 +11,14 @@ import logging
 from fastapi import FastAPI, Request, HTTPException, Depends, Form
 from fastapi.responses import RedirectResponse      # add this import
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from app.core.templates import JINJA_PRECOMPILE, precompile as precompile_templates, templates
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
-from app.models.testimonial import Testimonial
+from sqlalchemy import text
 from app.core.config import settings
+from app.core.http_cache import DATA_PAGE, cached_page
+from app.core import openai_gateway, smtp_pool
+from app.core.kv import close_kv
 from app.api.v1.admin_clients import router as admin_clients_router
 from app.api.v1.admin_projects import router as admin_projects_router
 from app.api.v1.admin_webhooks import router as admin_webhooks_router
@@ -42,19 +44,22 @@ from app.api.v1.admin_login import router as admin_login_router
 from app.api.v1.admin_calls import router as admin_calls_router
 from app.api.v1.testimonials_router import router as testimonials_router
 from app.api.v1.admin_marketer import router as admin_marketer_router
+from app.api.v1.admin_db import router as admin_db_router
+from app.api.v1.admin_search import router as admin_search_router
+from app.services.client_dashboard import load_dashboard
+from app.services.dashboard_counters import reconcile_loop
+from app.services import blog, testimonials_cache
 from app.services.email import send_welcome_email
-from app.db.session import SessionLocal
+from app.db import queries
+from app.db.profiling import sql_profile_middleware
 from app.models.order import Order
-from app.db.session import get_session
+from app.db.session import SessionLocal, get_session, get_read_session, unit_of_work
 from app.middleware.auth import load_user_middleware, signer
 
 
 
 app = FastAPI(title="WebWise Solutions")
 
-templates = Jinja2Templates(directory="app/templates")
-templates.env.globals["now"] = datetime.utcnow  # keep this; remove the stray line
-
 # Serve static assets (CSS/JS/images)
 static_dir = Path(__file__).resolve().parent.parent / "static"
 app.mount("/static", StaticFiles(directory=static_dir), name="static")
@@ -105,142 +110,72 @@ def _get_checkout_domain(request: Request) -> str:
 
 
 @app.get("/")
-async def home_page(request: Request, db: AsyncSession = Depends(get_session)):
+async def home_page(request: Request, db: AsyncSession = Depends(get_read_session)):
     # Fetch approved testimonials for the homepage hero/footer section
-    testimonials_query = (
-        select(Testimonial)
-        .where(Testimonial.is_approved.is_(True))
-        .order_by(Testimonial.created_at.desc())
-        .limit(6)
-    )
-    testimonials_result = await db.execute(testimonials_query)
-    testimonials = testimonials_result.scalars().all()
-
-    return templates.TemplateResponse(
-        "public/home.html", {"request": request, "testimonials": testimonials}
+    testimonials = await testimonials_cache.approved(db, limit=6)
+
+    return cached_page(
+        request,
+        templates.TemplateResponse(
+            "public/home.html", {"request": request, "testimonials": testimonials}
+        ),
+        DATA_PAGE,
     )
 
 @app.get("/dashboard")
 async def dashboard_home(request: Request, db: AsyncSession = Depends(get_session)):
-    # Latest order (optional)
-    latest_order = (
-        await db.execute(select(Order).order_by(Order.created_at.desc()).limit(1))
-    ).scalar_one_or_none()
-
     user = getattr(request.state, "user", None)
-    
-    # Check if user is authenticated and has completed onboarding
-    if user and getattr(user, "id", None):
-        # Require onboarding before showing dashboard - redirect to welcome page first
-        try:
-            exists = await db.execute(
-                text("SELECT 1 FROM client_onboarding WHERE client_id = :cid LIMIT 1"),
-                {"cid": user.id},
-            )
-            has_onboarding = exists.scalar_one_or_none() is not None
-            if not has_onboarding:
-                return RedirectResponse(url="/dashboard/welcome-instructions", status_code=303)
-        except Exception:
+    client_id = getattr(user, "id", None) if user else None
+
+    # One round trip: email, onboarding, provisioning status and latest order
+    try:
+        snapshot = await load_dashboard(db, client_id)
+    except Exception:
+        if client_id:
             # If there's any error checking, redirect to welcome page to be safe
             return RedirectResponse(url="/dashboard/welcome-instructions", status_code=303)
-    
-    user_email = None
-    onboarding_row = None
-    client_status = None
+        snapshot = {}
 
-    if user and getattr(user, "id", None):
-        try:
-
-            # Basic user email
-            res = await db.execute(
-                text("SELECT email FROM users WHERE id = :uid LIMIT 1"),
-                {"uid": user.id},
-            )
-            user_email = res.scalar_one_or_none()
-
-            # Onboarding summary
-            res = await db.execute(
-                text(
-                    """
-                    SELECT business_name, domain_name, lead_forward_email,
-                           industry, created_at
-                    FROM client_onboarding
-                    WHERE client_id = :cid
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                    """
-                ),
-                {"cid": user.id},
-            )
-            onboarding_row = res.mappings().first()
-
-            # Provisioning/status summary
-            res = await db.execute(
-                text(
-                    """
-                    SELECT assistant_status, assistant_status_detail, openai_assistant_id,
-                           twilio_status, twilio_status_detail, twilio_voice_agent_sid
-                    FROM clients
-                    WHERE id = :cid
-                    LIMIT 1
-                    """
-                ),
-                {"cid": user.id},
-            )
-            client_status = res.mappings().first()
-        except Exception:
-            user_email = None
-            onboarding_row = None
-            client_status = None
+    # Require onboarding before showing dashboard - redirect to welcome page first
+    if client_id and not snapshot.get("has_onboarding"):
+        return RedirectResponse(url="/dashboard/welcome-instructions", status_code=303)
 
     return templates.TemplateResponse(
         "dashboard/dashboard.html",
         {
             "request": request,
-            "latest_order": latest_order,
-            "user_email": user_email,
-            "onboarding": onboarding_row,
-            "client_status": client_status,
+            "latest_order": snapshot.get("latest_order"),
+            "user_email": snapshot.get("user_email"),
+            "onboarding": snapshot.get("onboarding"),
+            "client_status": snapshot.get("client_status"),
         },
     )
 
 
-async def _create_user_if_needed(email: str, name: str | None) -> tuple[bool, str | None]:
+async def _create_user_if_needed(
+    db: AsyncSession, email: str, name: str | None
+) -> tuple[bool, str | None]:
     """
-    Upsert a minimal user record with a fresh temp password.
-    Returns (True, temp_password) on success; (False, None) on failure.
+    Upsert a minimal user record with a fresh temp password inside the caller's
+    transaction. Returns (True, temp_password) on success; (False, None) on failure.
     """
     temp_password = secrets.token_urlsafe(10)
     password_hash = hashlib.sha256(temp_password.encode()).hexdigest()
 
-    try:
-        async with SessionLocal() as db:
-            await db.execute(
-                text(
-                    """
-                    INSERT INTO users (email, hashed_password, role, created_at)
-                    VALUES (:email, :password_hash, 'client', NOW())
-                    ON CONFLICT (email) DO UPDATE SET
-                        hashed_password = EXCLUDED.hashed_password
-                    """
-                ),
-                {"email": email, "password_hash": password_hash},
-            )
-            await db.commit()
-
-            # Check if user now exists
-            res = await db.execute(
-                text("SELECT id FROM users WHERE email = :email"),
-                {"email": email},
-            )
-            user_id = res.scalar_one_or_none()
-            if user_id:
-                return True, temp_password
-    except Exception as exc:  # noqa: BLE001
-        # Log the root cause so self-heal can be debugged quickly
-        print(f"Create user failed for {email}: {exc}")
-        return False, None
-
+    res = await db.execute(
+        text(
+            """
+            INSERT INTO users (email, hashed_password, role, created_at)
+            VALUES (:email, :password_hash, 'client', NOW())
+            ON CONFLICT (email) DO UPDATE SET
+                hashed_password = EXCLUDED.hashed_password
+            RETURNING id
+            """
+        ),
+        {"email": email, "password_hash": password_hash},
+    )
+    if res.scalar_one_or_none():
+        return True, temp_password
     return False, None
 
 async def _self_heal_user(email: str) -> bool:
@@ -248,34 +183,25 @@ async def _self_heal_user(email: str) -> bool:
     Recreate a user from an existing paid order if the user row is missing.
     Generates a fresh temp password and re-sends the welcome email.
     """
+    created, temp_password = False, None
     try:
-        async with SessionLocal() as db:
-            res = await db.execute(
-                text(
-                    """
-                    SELECT plan
-                    FROM orders
-                    WHERE buyer_email = :email
-                      AND welcome_sent = TRUE
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                    """
-                ),
-                {"email": email},
+        async with unit_of_work() as uow:
+            order_row = await queries.fetch_one(
+                uow.session, queries.ORDER_PLAN_BY_BUYER_EMAIL, email=email
             )
-            order_row = res.mappings().first()
+            if not order_row:
+                return False
+            async with uow.best_effort(f"Create user for {email}"):
+                created, temp_password = await _create_user_if_needed(uow.session, email, email)
     except Exception as exc:  # noqa: BLE001
         print(f"Self-heal lookup failed for {email}: {exc}")
         return False
 
-    if not order_row:
-        return False
-
-    created, temp_password = await _create_user_if_needed(email, email)
     if not created or not temp_password:
         print(f"Self-heal could not recreate user for {email}")
         return False
 
+    # Committed; send the email without holding a pooled connection
     try:
         dashboard_link = (settings.DOMAIN_URL or "").rstrip("/") + "/login"
         await send_welcome_email(
@@ -309,21 +235,19 @@ async def login_post(
     email: str = Form(...),
     password: str = Form(...),
 ):
-    # Validate against stored hashed_password
+    incoming_hash = hashlib.sha256(password.encode()).hexdigest()
+
+    # Validate against stored hashed_password and check onboarding on one connection
+    row = None
+    redirect_url = "/dashboard/welcome-instructions"
     try:
-        async with SessionLocal() as db:
-            res = await db.execute(
-                text(
-                    """
-                    SELECT id, hashed_password
-                    FROM users
-                    WHERE email = :email
-                    LIMIT 1
-                    """
-                ),
-                {"email": email},
-            )
-            row = res.mappings().first()
+        async with unit_of_work() as uow:
+            row = await queries.fetch_one(uow.session, queries.USER_LOGIN_BY_EMAIL, email=email)
+            if row and row["hashed_password"] == incoming_hash:
+                # On error, default to welcome-instructions to be safe
+                async with uow.best_effort(f"Onboarding check for {email}"):
+                    if await queries.fetch_val(uow.session, queries.ONBOARDING_EXISTS, cid=row["id"]):
+                        redirect_url = "/dashboard"
     except Exception:
         row = None
 
@@ -333,27 +257,13 @@ async def login_post(
             return RedirectResponse("/login?error=reset", status_code=303)
         return RedirectResponse("/login?error=invalid", status_code=303)
 
-    incoming_hash = hashlib.sha256(password.encode()).hexdigest()
     if row["hashed_password"] != incoming_hash:
         # Password is incorrect - don't reset it, just return invalid
         return RedirectResponse("/login?error=invalid", status_code=303)
 
     # Set signed session cookie and redirect to welcome-instructions for new users
     token = signer.sign(str(row["id"])).decode()
-    
-    # Check if user has completed onboarding
-    try:
-        async with SessionLocal() as db:
-            exists = await db.execute(
-                text("SELECT 1 FROM client_onboarding WHERE client_id = :cid LIMIT 1"),
-                {"cid": row["id"]},
-            )
-            has_onboarding = exists.scalar_one_or_none() is not None
-            redirect_url = "/dashboard" if has_onboarding else "/dashboard/welcome-instructions"
-    except Exception:
-        # On error, default to welcome-instructions to be safe
-        redirect_url = "/dashboard/welcome-instructions"
-    
+
     resp = RedirectResponse(redirect_url, status_code=303)
     resp.set_cookie(
         "session",
@@ -396,10 +306,33 @@ app.include_router(admin_calls_router, tags=["Admin Calls"])
 app.include_router(admin_forwarding_router, tags=["Admin Forwarding"])
 app.include_router(testimonials_router, prefix="/admin/testimonials", tags=["Admin Testimonials"])
 app.include_router(admin_marketer_router, tags=["Admin Marketer"])
+app.include_router(admin_db_router)
+app.include_router(admin_search_router)
 if admin_pers_file_upload_router:
     app.include_router(admin_pers_file_upload_router, tags=["Admin Personal"])
 app.include_router(provision_router)
 app.middleware("http")(load_user_middleware)
+app.middleware("http")(sql_profile_middleware)
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    if JINJA_PRECOMPILE:
+        await asyncio.to_thread(precompile_templates)
+    # Scan blog front matter and compile post templates once, before the first visitor
+    await asyncio.to_thread(blog.reload)
+    # Periodically repair drift in the trigger-maintained dashboard counters
+    app.state.counters_reconcile_task = asyncio.create_task(reconcile_loop())
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    task = getattr(app.state, "counters_reconcile_task", None)
+    if task:
+        task.cancel()
+    await close_kv()
+    await openai_gateway.close()
+    await smtp_pool.close()
 
 
 @app.post("/api/login/resend")
@@ -511,24 +444,20 @@ async def stripe_webhook(request: Request):
         session_id = session.get("id")
         payment_intent_id = session.get("payment_intent")
 
-        # Idempotency: skip if we've already processed this session_id
+        # Redeliveries of a processed session end here, before the Stripe call and
+        # the write transaction; the locked check below still settles concurrent ones
         if session_id:
-            try:
-                async with SessionLocal() as db:
-                    res = await db.execute(
-                        text("SELECT id FROM orders WHERE stripe_session_id = :sid LIMIT 1"),
-                        {"sid": session_id},
-                    )
-                    if res.scalar_one_or_none():
-                        return {"received": True}
-            except Exception:
-                pass
+            async with SessionLocal() as db:
+                if await queries.fetch_val(db, queries.ORDER_ID_BY_SESSION, sid=session_id):
+                    return {"received": True}
 
         # Fetch line item to capture price/product for the order record
+        # (before taking a DB connection, so the Stripe round trip doesn't hold one;
+        # the stripe client is synchronous, so it runs in a thread)
         price_id = None
         product_id = None
         try:
-            items = stripe.checkout.Session.list_line_items(session["id"], limit=1)
+            items = await asyncio.to_thread(stripe.checkout.Session.list_line_items, session["id"], limit=1)
             if items.data:
                 price_id = items.data[0].price.id if items.data[0].price else None
                 product_id = items.data[0].price.product if items.data[0].price else None
@@ -536,38 +465,48 @@ async def stripe_webhook(request: Request):
             price_id = None
             product_id = None
 
-        # Store order record
-        try:
-            async with SessionLocal() as db:
-                order = Order(
-                    plan=plan or "unknown",
-                    stripe_price_id=price_id or "",
-                    stripe_product_id=product_id or "",
-                    stripe_session_id=session_id or "",
-                    stripe_payment_intent_id=payment_intent_id or "",
-                    buyer_email=email or "",
-                    status="onboarding",
-                )
-                db.add(order)
-                await db.commit()
-        except Exception:
-            pass  # do not block webhook
+        temp_password = None
+        can_send = bool(email)
+        # One connection and one transaction for the whole flow; best-effort
+        # steps run in savepoints so one failure doesn't undo the others.
+        async with unit_of_work() as uow:
+            db = uow.session
+
+            # Idempotency: skip if we've already processed this session_id.
+            # Stripe retries can arrive concurrently; the lock (held until commit)
+            # makes a retry wait for the first delivery's order row. Not best-effort:
+            # if it fails, the webhook errors and Stripe redelivers.
+            if session_id:
+                await queries.execute(db, queries.ORDER_SESSION_LOCK, sid=session_id)
+                async with uow.best_effort("Webhook idempotency check"):
+                    if await queries.fetch_val(db, queries.ORDER_ID_BY_SESSION, sid=session_id):
+                        return {"received": True}
 
-        # Create/update user and send welcome email (guarded by welcome_sent)
-        if email:
-            temp_password = None
-            try:
-                _, temp_password = await _create_user_if_needed(email, customer_name)
-            except Exception as exc:
-                print(f"Error creating/updating user for {email}: {exc}")
-                temp_password = None
-
-            # Fallback: if we still don't have a temp password, generate one and update the user record.
-            if not temp_password:
-                try:
-                    temp_password = secrets.token_urlsafe(10)
-                    password_hash = hashlib.sha256(temp_password.encode()).hexdigest()
-                    async with SessionLocal() as db:
+            # Store order record (do not block webhook)
+            async with uow.best_effort(f"Order insert for {session_id}"):
+                db.add(
+                    Order(
+                        plan=plan or "unknown",
+                        stripe_price_id=price_id or "",
+                        stripe_product_id=product_id or "",
+                        stripe_session_id=session_id or "",
+                        stripe_payment_intent_id=payment_intent_id or "",
+                        buyer_email=email or "",
+                        status="onboarding",
+                    )
+                )
+                await db.flush()
+
+            # Create/update user; the welcome email is guarded by welcome_sent
+            if email:
+                async with uow.best_effort(f"Create/update user for {email}"):
+                    _, temp_password = await _create_user_if_needed(db, email, customer_name)
+
+                # Fallback: if we still don't have a temp password, generate one and update the user record.
+                if not temp_password:
+                    async with uow.best_effort(f"Fallback temp password for {email}"):
+                        fallback_password = secrets.token_urlsafe(10)
+                        password_hash = hashlib.sha256(fallback_password.encode()).hexdigest()
                         await db.execute(
                             text(
                                 """
@@ -578,45 +517,27 @@ async def stripe_webhook(request: Request):
                             ),
                             {"password_hash": password_hash, "email": email},
                         )
-                        await db.commit()
-                    print(f"Fallback temp password generated for {email}")
-                except Exception as exc:
-                    print(f"Error setting fallback temp password for {email}: {exc}")
-                    temp_password = None
+                        temp_password = fallback_password
+                        print(f"Fallback temp password generated for {email}")
 
-            can_send = True
-            try:
-                async with SessionLocal() as db:
-                    res = await db.execute(
-                        text(
-                            """
-                            UPDATE orders
-                            SET welcome_sent = TRUE, updated_at = NOW()
-                            WHERE stripe_session_id = :sid
-                              AND (welcome_sent IS NULL OR welcome_sent = FALSE)
-                            RETURNING id
-                            """
-                        ),
-                        {"sid": session_id},
-                    )
-                    row = res.scalar_one_or_none()
-                    await db.commit()
-                    if row is None:
+                # fail open to avoid missing email
+                async with uow.best_effort(f"welcome_sent update for {session_id}"):
+                    res = await queries.execute(db, queries.ORDER_MARK_WELCOME_SENT, sid=session_id)
+                    if res.scalar_one_or_none() is None:
                         can_send = False
+
+        # Committed; send the email without holding a pooled connection
+        if can_send:
+            try:
+                await send_welcome_email(
+                    customer_email=email,
+                    customer_name=customer_name,
+                    plan_name=plan or "Your plan",
+                    dashboard_link=dashboard_link,
+                    temp_password=temp_password,
+                )
             except Exception:
-                can_send = True  # fail open to avoid missing email
-
-            if can_send:
-                try:
-                    await send_welcome_email(
-                        customer_email=email,
-                        customer_name=customer_name,
-                        plan_name=plan or "Your plan",
-                        dashboard_link=dashboard_link,
-                        temp_password=temp_password,
-                    )
-                except Exception:
-                    # Do not fail webhook delivery because of email issues
-                    pass
+                # Do not fail webhook delivery because of email issues
+                pass
 
     return {"received": True}
\ No newline at end of file
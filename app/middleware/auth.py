@@ -7,6 +7,8 @@ if not SESSION_SECRET:
     raise RuntimeError("SESSION_SECRET or SECRET_KEY must be set")
 
 signer = itsdangerous.Signer(SESSION_SECRET, salt="session")
+# admin_session cookies: "<id>:admin" plus the time it was issued (see app/core/security.py)
+admin_signer = itsdangerous.TimestampSigner(SESSION_SECRET, salt="admin-session")
 
 
 class SimpleUser:
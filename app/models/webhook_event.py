@@ -9,6 +9,7 @@ class WebhookEvent(Base):
     event_type = Column(String, index=True)
     status = Column(String, index=True)
     raw_payload = Column(JSON)
+    received_at = Column(DateTime, server_default=func.now())
     created_at = Column(DateTime, server_default=func.now())
 
 
@@ -0,0 +1,102 @@
+"""
+Answer cache for the public chat widget.
+
+Most /chat/message traffic is the same few questions (package prices, the
+process, where the quiz is). Each of those costs a thread message, a run and
+a polling loop. An answer is kept in the KV store (app/core/kv.py) under:
+
+- the assistant's instructions version: a hash of its model and instructions,
+  re-read from OpenAI every CHAT_ANSWER_VERSION_TTL seconds, so editing the
+  assistant retires every cached answer
+- the normalized question: lower-cased, punctuation dropped, whitespace collapsed
+
+Only the first question of a thread is looked up or stored, since its answer
+does not depend on earlier conversation. Questions carrying personal details
+(emails, phone or order numbers) are never cached. With CHAT_ANSWER_FUZZY
+set (e.g. 0.9), a near-identical question reuses the closest stored answer.
+"""
+import difflib
+import hashlib
+import json
+import os
+import re
+from typing import Optional
+
+from app.core.kv import get_kv
+
+CHAT_ANSWER_CACHE_TTL = int(os.getenv("CHAT_ANSWER_CACHE_TTL", str(24 * 3600)))
+CHAT_ANSWER_VERSION_TTL = int(os.getenv("CHAT_ANSWER_VERSION_TTL", "300"))
+# Similarity ratio (0-1) for fuzzy matches; 0 means exact normalized matches only
+CHAT_ANSWER_FUZZY = float(os.getenv("CHAT_ANSWER_FUZZY", "0"))
+CHAT_ANSWER_MAX_QUESTION = 200
+# Questions remembered per version for fuzzy matching
+CHAT_ANSWER_INDEX_SIZE = 200
+
+_EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+\.\w+")
+_LONG_NUMBER_RE = re.compile(r"\d{4,}")
+_PUNCT_RE = re.compile(r"[^\w\s$]")
+
+
+def normalize(question: str) -> str:
+    return " ".join(_PUNCT_RE.sub(" ", question.lower()).split())
+
+
+def cacheable(question: str) -> bool:
+    if not normalize(question) or len(question) > CHAT_ANSWER_MAX_QUESTION:
+        return False
+    digits_only = re.sub(r"[\s\-\(\)\.]", "", question)
+    return not _EMAIL_RE.search(question) and not _LONG_NUMBER_RE.search(digits_only)
+
+
+def _answer_key(version: str, normalized: str) -> str:
+    return f"chat:answer:{version}:" + hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _index_key(version: str) -> str:
+    return f"chat:answer:{version}:index"
+
+
+async def instructions_version(client, assistant_id: str) -> Optional[str]:
+    """Hash of the assistant's current model + instructions, or None if OpenAI can't be asked."""
+
+    async def load() -> str:
+        assistant = await client.beta.assistants.retrieve(
+            assistant_id,
+            extra_headers={"OpenAI-Beta": "assistants=v2"},
+        )
+        material = json.dumps([assistant_id, assistant.model, assistant.instructions])
+        return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+    try:
+        return await get_kv().get_or_set(
+            f"chat:assistant-version:{assistant_id}", load, ttl=CHAT_ANSWER_VERSION_TTL
+        )
+    except Exception as exc:
+        print(f"[chat answer cache] version lookup failed: {exc}")
+        return None
+
+
+async def lookup(version: Optional[str], question: str) -> Optional[str]:
+    if not version or not cacheable(question):
+        return None
+    kv = get_kv()
+    normalized = normalize(question)
+    answer = await kv.get(_answer_key(version, normalized))
+    if answer is not None or CHAT_ANSWER_FUZZY <= 0:
+        return answer
+    known = await kv.get(_index_key(version)) or []
+    close = difflib.get_close_matches(normalized, known, n=1, cutoff=CHAT_ANSWER_FUZZY)
+    return await kv.get(_answer_key(version, close[0])) if close else None
+
+
+async def store(version: Optional[str], question: str, answer: str) -> None:
+    if not version or not answer or not cacheable(question):
+        return
+    kv = get_kv()
+    normalized = normalize(question)
+    await kv.set(_answer_key(version, normalized), answer, ttl=CHAT_ANSWER_CACHE_TTL)
+    if CHAT_ANSWER_FUZZY > 0:
+        async with kv.lock(f"lock:{_index_key(version)}", ttl=5, wait=5):
+            known = [q for q in (await kv.get(_index_key(version)) or []) if q != normalized]
+            known = (known + [normalized])[-CHAT_ANSWER_INDEX_SIZE:]
+            await kv.set(_index_key(version), known, ttl=CHAT_ANSWER_CACHE_TTL)
@@ -0,0 +1,201 @@
+"""
+Blog registry, built once per worker from the templates in app/templates/blog.
+
+A post is any template in that directory that starts with a front-matter
+comment, so a new post is a new file, not a code change:
+
+    {#---
+    title: Automated Business Systems
+    excerpt: Design the backbone that keeps sales, service, and fulfillment synchronized.
+    category: Systems
+    published_at: 2025-11-05
+    ---#}
+    {% extends "layout/base.html" %}
+
+slug defaults to the file name with "_" -> "-"; meta_title, meta_description
+and featured_image_url are optional, and `draft: true` hides a post.
+
+Building the registry compiles every post template (a broken one is logged
+and left out instead of 500ing later), then keeps:
+
+- by_slug: O(1) lookup for /blog/{slug}
+- pages:   newest-first listing, pre-split into BLOG_PAGE_SIZE pages
+- rss / atom feed documents and sitemap entries
+"""
+import os
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+from xml.sax.saxutils import escape
+
+import jinja2
+
+from app.core.config import settings
+from app.core.templates import TEMPLATES_DIR, templates
+
+BLOG_DIR = TEMPLATES_DIR / "blog"
+BLOG_PAGE_SIZE = int(os.getenv("BLOG_PAGE_SIZE", "12"))
+BLOG_FEED_SIZE = 20
+SITE_URL = (settings.DOMAIN_URL or "https://webwisesolutions.dev").rstrip("/")
+SITE_TITLE = "WebWise Solutions Blog"
+
+_FRONT_MATTER_RE = re.compile(r"\A\s*\{#---\s*\n(.*?)\n---#\}", re.DOTALL)
+_REQUIRED = ("title", "published_at")
+
+
+def parse_front_matter(source: str) -> Optional[dict]:
+    """`key: value` lines from a leading {#--- ... ---#} comment, or None if there is none."""
+    match = _FRONT_MATTER_RE.match(source)
+    if not match:
+        return None
+    meta = {}
+    for line in match.group(1).splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, sep, value = line.partition(":")
+        if sep:
+            meta[key.strip()] = value.strip()
+    return meta
+
+
+def _post_from(template_name: str, meta: dict, mtime: float) -> dict:
+    missing = [k for k in _REQUIRED if not meta.get(k)]
+    if missing:
+        raise ValueError(f"front matter missing {', '.join(missing)}")
+    slug = meta.get("slug") or template_name.rsplit(".", 1)[0].replace("_", "-")
+    published_at = datetime.fromisoformat(meta["published_at"])
+    return {
+        "slug": slug,
+        "title": meta["title"],
+        "excerpt": meta.get("excerpt"),
+        "category": meta.get("category"),
+        "template": template_name,
+        "published_at": published_at,
+        "meta_title": meta.get("meta_title"),
+        "meta_description": meta.get("meta_description"),
+        "featured_image_url": meta.get("featured_image_url"),
+        "url": f"{SITE_URL}/blog/{slug}",
+        # later of publish date and the template's last edit
+        "last_modified": max(published_at, datetime.utcfromtimestamp(mtime)),
+    }
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _rss(posts: list[dict]) -> str:
+    items = "".join(
+        "<item>"
+        f"<title>{escape(p['title'])}</title>"
+        f"<link>{escape(p['url'])}</link>"
+        f"<guid>{escape(p['url'])}</guid>"
+        f"<pubDate>{format_datetime(_utc(p['published_at']), usegmt=True)}</pubDate>"
+        + (f"<category>{escape(p['category'])}</category>" if p["category"] else "")
+        + (f"<description>{escape(p['excerpt'])}</description>" if p["excerpt"] else "")
+        + "</item>"
+        for p in posts
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0"><channel>'
+        f"<title>{escape(SITE_TITLE)}</title>"
+        f"<link>{SITE_URL}/blog</link>"
+        "<description>Automation guides from WebWise Solutions</description>"
+        f"{items}</channel></rss>"
+    )
+
+
+def _atom(posts: list[dict]) -> str:
+    updated = max((p["last_modified"] for p in posts), default=datetime(2025, 1, 1))
+    entries = "".join(
+        "<entry>"
+        f"<title>{escape(p['title'])}</title>"
+        f'<link href="{escape(p["url"])}"/>'
+        f"<id>{escape(p['url'])}</id>"
+        f"<published>{_utc(p['published_at']).isoformat()}</published>"
+        f"<updated>{_utc(p['last_modified']).isoformat()}</updated>"
+        + (f"<summary>{escape(p['excerpt'])}</summary>" if p["excerpt"] else "")
+        + "</entry>"
+        for p in posts
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>{escape(SITE_TITLE)}</title>"
+        f'<link href="{SITE_URL}/blog"/>'
+        f'<link rel="self" href="{SITE_URL}/blog/atom.xml"/>'
+        f"<id>{SITE_URL}/blog</id>"
+        f"<updated>{_utc(updated).isoformat()}</updated>"
+        f"{entries}</feed>"
+    )
+
+
+class BlogRegistry:
+    def __init__(self, posts: list[dict], page_size: int = BLOG_PAGE_SIZE):
+        self.posts = sorted(posts, key=lambda p: p["published_at"], reverse=True)
+        self.by_slug = {p["slug"]: p for p in self.posts}
+        self.page_size = page_size
+        self.pages = [
+            self.posts[i:i + page_size] for i in range(0, len(self.posts), page_size)
+        ] or [[]]
+        feed_posts = self.posts[:BLOG_FEED_SIZE]
+        self.rss = _rss(feed_posts)
+        self.atom = _atom(feed_posts)
+        self.updated_at = max((p["last_modified"] for p in self.posts), default=None)
+
+    def get(self, slug: str) -> Optional[dict]:
+        return self.by_slug.get(slug)
+
+    def page(self, number: int) -> Optional[list[dict]]:
+        if 1 <= number <= len(self.pages):
+            return self.pages[number - 1]
+        return None
+
+    def sitemap_entries(self) -> list[tuple[str, datetime]]:
+        entries = [(f"{SITE_URL}/blog", self.updated_at)]
+        entries += [(f"{SITE_URL}/blog/page/{n}", self.updated_at) for n in range(2, len(self.pages) + 1)]
+        entries += [(p["url"], p["last_modified"]) for p in self.posts]
+        return entries
+
+
+def scan(directory=BLOG_DIR) -> list[dict]:
+    """Every publishable post in the blog template directory; bad ones are logged and skipped."""
+    posts, seen = [], set()
+    for path in sorted(directory.glob("*.html")):
+        if path.name.startswith("_"):
+            continue
+        try:
+            meta = parse_front_matter(path.read_text(encoding="utf-8"))
+            if meta is None or meta.get("draft", "").lower() in {"1", "true", "yes"}:
+                continue
+            post = _post_from(path.name, meta, path.stat().st_mtime)
+            if post["slug"] in seen:
+                raise ValueError(f"duplicate slug {post['slug']!r}")
+            # compile now so a template error shows up at startup, not on a visitor's request
+            templates.env.get_template(f"blog/{path.name}")
+        except (OSError, ValueError, jinja2.TemplateError) as exc:
+            print(f"Blog post {path.name} skipped: {exc}")
+            continue
+        seen.add(post["slug"])
+        posts.append(post)
+    return posts
+
+
+_registry: Optional[BlogRegistry] = None
+
+
+def registry() -> BlogRegistry:
+    global _registry
+    if _registry is None:
+        _registry = BlogRegistry(scan())
+    return _registry
+
+
+def reload() -> BlogRegistry:
+    """Rebuild from disk (startup, or after dropping a new post in with auto-reload on)."""
+    global _registry
+    _registry = BlogRegistry(scan())
+    return _registry
@@ -0,0 +1,82 @@
+"""
+Read model for the client dashboard (/dashboard).
+
+Everything the page shows (user email, onboarding summary, provisioning
+status and the latest order) comes back from a single CTE query, so a
+dashboard view costs one database round trip.
+"""
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import queries
+
+DASHBOARD_HOME = queries.Query(
+    "dashboard_home",
+    """
+    WITH onboarding AS (
+        SELECT business_name, domain_name, lead_forward_email, industry, created_at
+        FROM client_onboarding
+        WHERE client_id = :cid
+        ORDER BY created_at DESC
+        LIMIT 1
+    ),
+    client AS (
+        SELECT assistant_status, assistant_status_detail, openai_assistant_id,
+               twilio_status, twilio_status_detail, twilio_voice_agent_sid
+        FROM clients
+        WHERE id = :cid
+        LIMIT 1
+    ),
+    latest_order AS (
+        SELECT id, plan, status, buyer_email, created_at
+        FROM orders
+        ORDER BY created_at DESC
+        LIMIT 1
+    )
+    SELECT
+        (SELECT email FROM users WHERE id = :cid LIMIT 1) AS user_email,
+        (SELECT COUNT(*) FROM onboarding) > 0 AS has_onboarding,
+        o.business_name AS onboarding_business_name,
+        o.domain_name AS onboarding_domain_name,
+        o.lead_forward_email AS onboarding_lead_forward_email,
+        o.industry AS onboarding_industry,
+        o.created_at AS onboarding_created_at,
+        (SELECT COUNT(*) FROM client) > 0 AS has_client,
+        c.assistant_status AS client_assistant_status,
+        c.assistant_status_detail AS client_assistant_status_detail,
+        c.openai_assistant_id AS client_openai_assistant_id,
+        c.twilio_status AS client_twilio_status,
+        c.twilio_status_detail AS client_twilio_status_detail,
+        c.twilio_voice_agent_sid AS client_twilio_voice_agent_sid,
+        lo.id AS order_id,
+        lo.plan AS order_plan,
+        lo.status AS order_status,
+        lo.buyer_email AS order_buyer_email,
+        lo.created_at AS order_created_at
+    FROM (SELECT 1) AS seed
+    LEFT JOIN onboarding o ON TRUE
+    LEFT JOIN client c ON TRUE
+    LEFT JOIN latest_order lo ON TRUE
+    """,
+    hot=True,
+)
+
+
+def _section(row: dict, prefix: str) -> dict:
+    return {k[len(prefix):]: v for k, v in row.items() if k.startswith(prefix)}
+
+
+async def load_dashboard(db: AsyncSession, client_id: Optional[int]) -> dict:
+    """
+    Return {"user_email", "has_onboarding", "onboarding", "client_status",
+    "latest_order"}; sections the client has no row for are None.
+    """
+    row = await queries.fetch_one(db, DASHBOARD_HOME, cid=client_id) or {}
+    return {
+        "user_email": row.get("user_email"),
+        "has_onboarding": bool(row.get("has_onboarding")),
+        "onboarding": _section(row, "onboarding_") if row.get("has_onboarding") else None,
+        "client_status": _section(row, "client_") if row.get("has_client") else None,
+        "latest_order": _section(row, "order_") if row.get("order_id") is not None else None,
+    }
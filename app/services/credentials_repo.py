@@ -0,0 +1,138 @@
+"""
+Per-client credentials, read through a small in-process LRU cache.
+
+The `credentials` row for a client is read by provisioning (twice per flow),
+the Integrations page, the admin client detail/reveal views and prompt
+generation. get() loads it once per TTL and keeps two forms:
+
+- row:    the raw values, for code that calls Stripe/OpenAI/Twilio
+- masked: the response GET /api/v1/credentials returns, built once per load
+
+Secrets only ever live in this worker's memory: nothing here is logged,
+pickled or written to a shared cache. upsert_credentials and
+submit_onboarding call invalidate(client_id) after they commit; other
+workers pick up the change when the TTL runs out.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import queries
+
+CREDENTIALS_CACHE_TTL = int(os.getenv("CREDENTIALS_CACHE_TTL", "60"))
+CREDENTIALS_CACHE_SIZE = int(os.getenv("CREDENTIALS_CACHE_SIZE", "1024"))
+
+
+def mask(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    if len(value) <= 4:
+        return "****"
+    return f"{'*' * (len(value) - 4)}{value[-4:]}"
+
+
+def masked_view(row: Optional[dict]) -> dict:
+    """The GET /credentials payload: connection flags plus masked values."""
+    row = row or {}
+    return {
+        "stripe": {
+            "connected": bool(row.get("stripe_secret_key") or row.get("stripe_publishable_key")),
+            "publishable_key": mask(row.get("stripe_publishable_key")),
+            "secret_key": mask(row.get("stripe_secret_key")),
+        },
+        "openai": {
+            "connected": bool(row.get("openai_api_key")),
+            "api_key": mask(row.get("openai_api_key")),
+        },
+        "twilio": {
+            "connected": bool(row.get("twilio_sid") or row.get("twilio_token")),
+            "sid": mask(row.get("twilio_sid")),
+            "token": mask(row.get("twilio_token")),
+            "from_number": row.get("twilio_from_number"),
+        },
+        "dns": {
+            "connected": bool(row.get("dns_api_key")),
+            "api_key": mask(row.get("dns_api_key")),
+        },
+    }
+
+
+class _Entry:
+    __slots__ = ("row", "masked", "loaded_at")
+
+    def __init__(self, row: Optional[dict]):
+        self.row = row
+        self.masked = masked_view(row)
+        self.loaded_at = time.monotonic()
+
+    def __repr__(self) -> str:  # never let secrets reach a log line or traceback
+        return f"<credentials entry present={self.row is not None}>"
+
+
+_entries: "OrderedDict[int, _Entry]" = OrderedDict()
+_generation = 0
+# client_id -> [lock, loaders holding or waiting]; removed when the last one leaves
+_loading: dict[int, list] = {}
+
+
+def invalidate(client_id: Optional[int] = None) -> None:
+    """Forget one client's credentials (or everyone's when client_id is None)."""
+    global _generation
+    _generation += 1
+    if client_id is None:
+        _entries.clear()
+    else:
+        _entries.pop(client_id, None)
+
+
+def _cached(client_id: int) -> Optional[_Entry]:
+    entry = _entries.get(client_id)
+    if entry is None:
+        return None
+    if time.monotonic() - entry.loaded_at >= CREDENTIALS_CACHE_TTL:
+        _entries.pop(client_id, None)
+        return None
+    _entries.move_to_end(client_id)
+    return entry
+
+
+async def _load(db: AsyncSession, client_id: int) -> _Entry:
+    entry = _cached(client_id)
+    if entry is not None:
+        return entry
+    # a burst for the same client waits for the first load; other clients never wait on it
+    slot = _loading.setdefault(client_id, [asyncio.Lock(), 0])
+    slot[1] += 1
+    try:
+        async with slot[0]:
+            entry = _cached(client_id)
+            if entry is not None:
+                return entry
+            generation = _generation
+            row = await queries.fetch_one(db, queries.CREDENTIALS_BY_CLIENT, cid=client_id)
+            entry = _Entry(row)
+            # an invalidate() during the load means the row may already be stale
+            if generation == _generation:
+                _entries[client_id] = entry
+                while len(_entries) > CREDENTIALS_CACHE_SIZE:
+                    _entries.popitem(last=False)
+            return entry
+    finally:
+        slot[1] -= 1
+        if slot[1] == 0:
+            del _loading[client_id]
+
+
+async def get(db: AsyncSession, client_id: int) -> Optional[dict]:
+    """The client's raw credentials row, or None when they have not saved any."""
+    row = (await _load(db, client_id)).row
+    return dict(row) if row is not None else None
+
+
+async def masked(db: AsyncSession, client_id: int) -> dict:
+    """The precomputed masked view served by GET /api/v1/credentials."""
+    return (await _load(db, client_id)).masked
@@ -0,0 +1,160 @@
+"""
+Admin dashboard stats from the dashboard_counters table.
+
+The counters are maintained by row triggers on clients, projects, orders and
+testimonials (alembic/versions/202610161100_add_dashboard_counters.py), so the
+dashboards read every stat with one indexed lookup instead of a COUNT(*) scan
+per table. reconcile_counters() recomputes the exact values to repair any
+drift (TRUNCATE, bulk loads with triggers disabled, manual fixes) and runs
+periodically from the app startup hook, in one worker at a time.
+"""
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+COUNTER_NAMES = ("clients", "projects", "orders", "pending_testimonials")
+
+# Exact counts, as the triggers should see them.
+_EXACT_COUNTS_SQL = """
+    SELECT
+      (SELECT COUNT(*) FROM clients) AS clients,
+      (SELECT COUNT(*) FROM projects) AS projects,
+      (SELECT COUNT(*) FROM orders) AS orders,
+      (SELECT COUNT(*) FROM testimonials WHERE approved = false) AS pending_testimonials
+"""
+
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("DASHBOARD_COUNTERS_RECONCILE_SECONDS", "900"))
+# Session-level advisory lock held by the worker that reconciles
+_LEADER_LOCK_SQL = "SELECT pg_try_advisory_lock(hashtext('dashboard_counters_reconcile'))"
+
+
+def _empty() -> dict:
+    return {name: 0 for name in COUNTER_NAMES}
+
+
+async def read_counters(db: AsyncSession) -> dict:
+    """All dashboard counters in one query, e.g. {"clients": 12, ...}."""
+    try:
+        res = await db.execute(
+            text("SELECT name, value FROM dashboard_counters WHERE name = ANY(:names)"),
+            {"names": list(COUNTER_NAMES)},
+        )
+        counters = _empty()
+        counters.update({r["name"]: max(int(r["value"]), 0) for r in res.mappings().all()})
+        return counters
+    except DBAPIError as exc:
+        # Migration not applied yet: fall back to live counts.
+        logger.warning("dashboard_counters unavailable, counting live: %s", exc)
+        await db.rollback()
+        return await exact_counts(db)
+
+
+async def exact_counts(db: AsyncSession) -> dict:
+    row = (await db.execute(text(_EXACT_COUNTS_SQL))).mappings().first()
+    counters = _empty()
+    if row:
+        counters.update({name: int(row[name] or 0) for name in COUNTER_NAMES})
+    return counters
+
+
+async def reconcile_counters(db: AsyncSession) -> dict:
+    """Overwrite every counter with its exact value; returns the counters that drifted."""
+    # Hold off trigger increments until commit, so none lands between the counts
+    # and the overwrite and gets lost; the counts still see everything committed.
+    await db.execute(text("LOCK TABLE dashboard_counters IN SHARE ROW EXCLUSIVE MODE"))
+    exact = await exact_counts(db)
+    res = await db.execute(
+        text("SELECT name, value FROM dashboard_counters WHERE name = ANY(:names)"),
+        {"names": list(COUNTER_NAMES)},
+    )
+    stored = {r["name"]: int(r["value"]) for r in res.mappings().all()}
+
+    drift = {
+        name: {"stored": stored.get(name), "exact": value}
+        for name, value in exact.items()
+        if stored.get(name) != value
+    }
+    for name, value in exact.items():
+        await db.execute(
+            text(
+                """
+                INSERT INTO dashboard_counters (name, value, updated_at)
+                VALUES (:name, :value, NOW())
+                ON CONFLICT (name) DO UPDATE
+                SET value = EXCLUDED.value, updated_at = NOW()
+                """
+            ),
+            {"name": name, "value": value},
+        )
+    await db.commit()
+    return drift
+
+
+async def _resign(conn) -> None:
+    # close the DBAPI connection itself: returned to the pool, it would keep the lock
+    try:
+        await conn.invalidate()
+    finally:
+        await conn.close()
+
+
+async def _try_lead(engine):
+    """A connection holding the reconcile lock, or None if another worker has it."""
+    conn = await engine.connect()
+    try:
+        acquired = await conn.scalar(text(_LEADER_LOCK_SQL))
+        # the lock outlives this transaction; end it so sessions on conn commit normally
+        await conn.commit()
+    except BaseException:
+        await _resign(conn)
+        raise
+    if acquired:
+        return conn
+    await conn.close()
+    return None
+
+
+async def reconcile_loop(interval: Optional[int] = None) -> None:
+    """
+    Background task: reconcile on a fixed interval until cancelled.
+
+    Every worker runs this, but only the one holding the advisory lock does the
+    counting; it keeps the lock (and its connection) while it lives, and another
+    worker takes over on its next tick once that connection goes away.
+    """
+    from app.db.session import engine
+
+    interval = interval or RECONCILE_INTERVAL_SECONDS
+    leader = None
+    try:
+        while True:
+            try:
+                if leader is None:
+                    leader = await _try_lead(engine)
+                if leader is not None:
+                    async with AsyncSession(bind=leader, expire_on_commit=False) as db:
+                        drift = await reconcile_counters(db)
+                    if drift:
+                        logger.warning("dashboard_counters drift corrected: %s", drift)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("dashboard_counters reconcile failed: %s", exc)
+                if leader is not None:
+                    # re-elect next tick, on a fresh connection
+                    conn, leader = leader, None
+                    try:
+                        await _resign(conn)
+                    except Exception:
+                        pass
+            await asyncio.sleep(interval)
+    finally:
+        if leader is not None:
+            await _resign(leader)
@@ -1,11 +1,11 @@
 """Email service for sending contact form notifications."""
-import smtplib
+import asyncio
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional, Any
-from contextlib import contextmanager
 
-from fastapi.templating import Jinja2Templates
+from app.core import smtp_pool
+from app.core.templates import templates
 
 from app.core.config import settings
 # These models may not exist in all deployments; fall back to Any to avoid import errors
@@ -18,30 +18,6 @@ try:
 except Exception:  # pragma: no cover
     CallBooking = Any  # type: ignore
 
-# Initialize Jinja2 templates for emails
-templates = Jinja2Templates(directory="app/templates")
-
-
-@contextmanager
-def get_smtp_server():
-    """Context manager for SMTP server connection that handles both SSL (465) and STARTTLS (587)."""
-    if settings.SMTP_PORT == 465:
-        # Port 465 requires SSL from the start
-        server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
-    else:
-        # Port 587 uses STARTTLS
-        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
-        server.starttls()
-    
-    try:
-        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-        yield server
-    finally:
-        try:
-            server.quit()
-        except:
-            server.close()
-
 
 async def send_contact_email(contact: Contact) -> bool:
     """Send email notification for contact form submission."""
@@ -77,8 +53,7 @@ IP Address: {contact.ip_address or 'Not available'}
         msg.attach(MIMEText(body, "plain"))
         
         # Send email
-        with get_smtp_server() as server:
-            server.send_message(msg)
+        await smtp_pool.send(msg)
         
         return True
         
@@ -110,10 +85,7 @@ WebWise Solutions Team
         
         msg.attach(MIMEText(body, "plain"))
         
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
+        await smtp_pool.send(msg)
         
         return True
         
@@ -155,8 +127,7 @@ Timezone: {call_booking.timezone or 'Not specified'}
         msg.attach(MIMEText(body, "plain"))
         
         # Send email
-        with get_smtp_server() as server:
-            server.send_message(msg)
+        await smtp_pool.send(msg)
         
         return True
         
@@ -218,8 +189,7 @@ https://webwisesolutions.dev
         msg.attach(MIMEText(body, "plain"))
         
         # Send email
-        with get_smtp_server() as server:
-            server.send_message(msg)
+        await smtp_pool.send(msg)
         
         print(f"✅ Confirmation email sent to {call_booking.email}")
         return True
@@ -294,59 +264,24 @@ async def send_welcome_email(
                 msg.attach(MIMEText(text_body, "plain"))
                 msg.attach(MIMEText(html_body, "html"))
                 
-                # Send email with improved connection handling
-                print(f"[Attempt {attempt}] Connecting to SMTP server: {settings.SMTP_HOST}:{settings.SMTP_PORT}")
-                
-                # Port 465 requires SSL from the start, port 587 uses STARTTLS
-                if settings.SMTP_PORT == 465:
-                    # Use SMTP_SSL for port 465
-                    print(f"[Attempt {attempt}] Using SSL connection (port 465)...")
-                    server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=60)
-                else:
-                    # Use regular SMTP with STARTTLS for port 587
-                    print(f"[Attempt {attempt}] Using STARTTLS connection (port {settings.SMTP_PORT})...")
-                    server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=60)
-                
-                try:
-                    # Enable debug output only on first attempt
-                    if attempt == 1:
-                        server.set_debuglevel(1)
-                    
-                    # Only use starttls for non-SSL ports (587)
-                    if settings.SMTP_PORT != 465:
-                        print(f"[Attempt {attempt}] Starting TLS...")
-                        server.starttls()
-                    
-                    print(f"[Attempt {attempt}] Logging in as {settings.SMTP_USER}...")
-                    server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                    
-                    print(f"[Attempt {attempt}] Sending email message...")
-                    server.send_message(msg)
-                    
-                    print(f"✓ Welcome email sent successfully to {customer_email} (attempt {attempt})")
-                    return True
-                    
-                finally:
-                    # Always close the connection properly
-                    try:
-                        server.quit()
-                    except:
-                        server.close()
+                print(f"[Attempt {attempt}] Sending via SMTP pool: {settings.SMTP_HOST}:{settings.SMTP_PORT}")
+                await smtp_pool.send(msg)
+
+                print(f"✓ Welcome email sent successfully to {customer_email} (attempt {attempt})")
+                return True
             
-            except smtplib.SMTPAuthenticationError as e:
+            except smtp_pool.SMTPAuthenticationError as e:
                 print(f"ERROR: SMTP Authentication failed (attempt {attempt}): {e}")
                 print(f"Check SMTP_USER and SMTP_PASSWORD in .env file")
                 if attempt == max_retries:
                     return False
-                import time
-                time.sleep(retry_delay)
+                await asyncio.sleep(retry_delay)
                 
-            except (smtplib.SMTPException, ConnectionError, OSError) as e:
+            except (smtp_pool.SMTPException, ConnectionError, OSError) as e:
                 print(f"ERROR: SMTP connection error (attempt {attempt}/{max_retries}): {e}")
                 if attempt < max_retries:
                     print(f"Retrying in {retry_delay} seconds...")
-                    import time
-                    time.sleep(retry_delay)
+                    await asyncio.sleep(retry_delay)
                 else:
                     print(f"Failed to send email after {max_retries} attempts")
                     return False
@@ -357,8 +292,7 @@ async def send_welcome_email(
                 traceback.print_exc()
                 if attempt == max_retries:
                     return False
-                import time
-                time.sleep(retry_delay)
+                await asyncio.sleep(retry_delay)
         
         return False
         
@@ -416,8 +350,7 @@ Source: /start-your-project page
         msg.attach(MIMEText(body, "plain"))
         
         # Send email
-        with get_smtp_server() as server:
-            server.send_message(msg)
+        await smtp_pool.send(msg)
         
         print(f"✅ Idea submission email sent successfully to {settings.VISION_EMAIL}")
         return True
@@ -0,0 +1,88 @@
+"""
+Cache of presigned GET URLs for private DigitalOcean Spaces objects.
+
+A portfolio page embedding N private images used to sign N URLs per view.
+A signed URL stays valid for PRESIGNED_URL_EXPIRES seconds, so one is reused
+from an in-process LRU (keyed by bucket and key) for PRESIGNED_URL_CACHE_TTL,
+which is kept well below the expiry. A reused URL therefore always has at
+least PRESIGNED_URL_EXPIRES - PRESIGNED_URL_CACHE_TTL seconds left when it
+is handed out.
+
+Signing runs in a worker thread, once per batch of misses.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+PRESIGNED_URL_EXPIRES = 600
+# Never hand out a URL with less than this many seconds of validity left
+PRESIGNED_URL_MIN_REMAINING = 120
+PRESIGNED_URL_CACHE_TTL = min(
+    int(os.getenv("PRESIGNED_URL_CACHE_TTL", "420")),
+    PRESIGNED_URL_EXPIRES - PRESIGNED_URL_MIN_REMAINING,
+)
+PRESIGNED_URL_CACHE_SIZE = int(os.getenv("PRESIGNED_URL_CACHE_SIZE", "4096"))
+
+_entries: "OrderedDict[tuple[str, str], tuple[str, float]]" = OrderedDict()
+
+
+def _cached(bucket: str, key: str) -> tuple[str, float] | None:
+    entry = _entries.get((bucket, key))
+    if entry is None:
+        return None
+    if time.monotonic() - entry[1] >= PRESIGNED_URL_CACHE_TTL:
+        _entries.pop((bucket, key), None)
+        return None
+    _entries.move_to_end((bucket, key))
+    return entry
+
+
+def _sign_all(s3, bucket: str, keys: list[str]) -> dict[str, str]:
+    return {
+        key: s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": bucket, "Key": key},
+            ExpiresIn=PRESIGNED_URL_EXPIRES,
+        )
+        for key in keys
+    }
+
+
+def seconds_left(bucket: str, key: str) -> int:
+    """How long a URL just returned for (bucket, key) can be cached downstream."""
+    entry = _cached(bucket, key)
+    if entry is None:
+        return 0
+    return max(0, int(PRESIGNED_URL_CACHE_TTL - (time.monotonic() - entry[1])))
+
+
+async def signed_urls(s3, bucket: str, keys: Iterable[str]) -> dict[str, str]:
+    """Signed GET URL per key, reusing cached ones; misses are signed in one thread hop."""
+    urls: dict[str, str] = {}
+    misses: list[str] = []
+    for key in dict.fromkeys(keys):
+        entry = _cached(bucket, key)
+        if entry is None:
+            misses.append(key)
+        else:
+            urls[key] = entry[0]
+
+    if misses:
+        signed = await asyncio.to_thread(_sign_all, s3, bucket, misses)
+        now = time.monotonic()
+        for key, url in signed.items():
+            _entries[(bucket, key)] = (url, now)
+            urls[key] = url
+        while len(_entries) > PRESIGNED_URL_CACHE_SIZE:
+            _entries.popitem(last=False)
+    return urls
+
+
+async def signed_url(s3, bucket: str, key: str) -> str:
+    return (await signed_urls(s3, bucket, [key]))[key]
+
+
+def invalidate() -> None:
+    _entries.clear()
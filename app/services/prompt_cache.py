@@ -0,0 +1,70 @@
+"""
+Content-addressed cache for onboarding prompt generation.
+
+Clients press "Generate" again and again with the same notes while they edit
+the rest of the onboarding form. A result is stored in the KV store
+(app/core/kv.py) under a hash of:
+
+- client_id
+- the notes with whitespace normalized
+- the model
+- a version derived from the system prompt text, so editing the prompt
+  retires every older result without a manual bump
+
+Identical requests that arrive while one is generating wait on the same
+KV lock and reuse its result instead of calling OpenAI again.
+"""
+import hashlib
+import json
+import os
+from typing import Awaitable, Callable
+
+from app.core.kv import LockTimeout, get_kv
+
+PROMPT_CACHE_TTL = int(os.getenv("PROMPT_CACHE_TTL", str(24 * 3600)))
+# How long an identical request waits for the one already generating
+PROMPT_CACHE_WAIT = 60.0
+
+
+def normalize(raw_text: str) -> str:
+    return " ".join(raw_text.split())
+
+
+def prompt_version(system_prompt: str) -> str:
+    return hashlib.sha256(system_prompt.encode()).hexdigest()[:12]
+
+
+def cache_key(client_id: int, raw_text: str, model: str, system_prompt: str) -> str:
+    material = json.dumps(
+        [client_id, normalize(raw_text), model, prompt_version(system_prompt)],
+        separators=(",", ":"),
+    )
+    return "prompt:" + hashlib.sha256(material.encode()).hexdigest()
+
+
+async def get_or_generate(
+    client_id: int,
+    raw_text: str,
+    model: str,
+    system_prompt: str,
+    generate: Callable[[], Awaitable[str]],
+) -> tuple[str, bool]:
+    """Return (prompt, served_from_cache); generate() runs at most once per key at a time."""
+    kv = get_kv()
+    key = cache_key(client_id, raw_text, model, system_prompt)
+    cached = await kv.get(key)
+    if cached is not None:
+        return cached, True
+
+    try:
+        async with kv.lock(f"lock:{key}", ttl=PROMPT_CACHE_WAIT, wait=PROMPT_CACHE_WAIT):
+            cached = await kv.get(key)
+            if cached is not None:
+                return cached, True
+            content = await generate()
+            if content:
+                await kv.set(key, content, ttl=PROMPT_CACHE_TTL)
+            return content, False
+    except LockTimeout:
+        # the first request is taking unusually long; don't keep this one waiting on it
+        return await generate(), False
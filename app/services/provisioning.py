@@ -7,37 +7,19 @@ import json
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import openai_gateway
+from app.db import queries
+from app.services import credentials_repo
+
 
 async def provision_openai_assistant(client_id: int, db: AsyncSession) -> None:
     """
     Create an OpenAI Assistant for the client and persist the assistant ID / status.
     """
-    cred_res = await db.execute(
-        text(
-            """
-            SELECT openai_api_key
-            FROM credentials
-            WHERE client_id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    cred = cred_res.mappings().first() or {}
+    cred = await credentials_repo.get(db, client_id) or {}
     api_key = cred.get("openai_api_key")
 
-    onboarding_res = await db.execute(
-        text(
-            """
-            SELECT business_name, industry, site_description
-            FROM client_onboarding
-            WHERE client_id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    onboarding = onboarding_res.mappings().first() or {}
+    onboarding = await queries.fetch_one(db, queries.ONBOARDING_FOR_ASSISTANT, cid=client_id) or {}
 
     assistant_id = None
     status = "pending"
@@ -48,23 +30,18 @@ async def provision_openai_assistant(client_id: int, db: AsyncSession) -> None:
         status_detail = "missing_openai_key"
     else:
         try:
-            try:
-                import openai  # type: ignore
-            except ImportError:
-                openai = None
-
-            if not openai:
+            if openai_gateway.AsyncOpenAI is None:
                 status = "failed"
                 status_detail = "openai_sdk_not_installed"
             else:
-                openai.api_key = api_key
+                client = openai_gateway.get_client(api_key)
                 name = onboarding.get("business_name") or f"Client {client_id} Assistant"
                 instructions = (
                     f"You are the assistant for {onboarding.get('business_name') or 'our client'} "
                     f"in the {onboarding.get('industry') or 'business'} space. "
                     f"Project brief: {onboarding.get('site_description') or 'N/A'}"
                 )
-                resp = openai.beta.assistants.create(
+                resp = await client.beta.assistants.create(
                     model="gpt-4o-mini",
                     name=name,
                     instructions=instructions,
@@ -103,18 +80,7 @@ async def provision_twilio_voice(client_id: int, db: AsyncSession) -> None:
     """
     Create/assign a Twilio voice workflow and persist the SID / status.
     """
-    cred_res = await db.execute(
-        text(
-            """
-            SELECT twilio_sid, twilio_token, twilio_from_number
-            FROM credentials
-            WHERE client_id = :cid
-            LIMIT 1
-            """
-        ),
-        {"cid": client_id},
-    )
-    cred = cred_res.mappings().first() or {}
+    cred = await credentials_repo.get(db, client_id) or {}
     account_sid = cred.get("twilio_sid")
     auth_token = cred.get("twilio_token")
     from_number = cred.get("twilio_from_number")
@@ -0,0 +1,155 @@
+"""
+Admin search across clients, projects, support tickets, call bookings and
+webhook events.
+
+Matching is backed by the pg_trgm GIN and tsvector indexes added in
+alembic/versions/202610161000_add_admin_search_indexes.py:
+- `col ILIKE '%term%'` and `col % term` (typo-tolerant) use the trigram index
+- `to_tsvector('simple', coalesce(col, '')) @@ plainto_tsquery(...)` uses the
+  full-text index, so whole-word matches work for any term length
+
+Listing endpoints call match_clause() to filter their own keyset pages;
+search() returns one ranked list across every entity for the admin search box.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class SearchTarget:
+    """A searchable table and the columns its indexes cover."""
+
+    def __init__(
+        self,
+        kind: str,
+        table: str,
+        fields: tuple[str, ...],
+        title: str,
+        subtitle: str,
+        ts_col: str,
+        url: str,
+    ):
+        self.kind = kind
+        self.table = table
+        self.fields = fields
+        self.title = title
+        self.subtitle = subtitle
+        self.ts_col = ts_col
+        self.url = url
+
+
+TARGETS = {
+    t.kind: t
+    for t in (
+        SearchTarget("clients", "clients", ("name", "email"),
+                     "COALESCE(name, email)", "email", "created_at", "/admin/clients/{id}"),
+        SearchTarget("projects", "projects", ("name",),
+                     "name", "status", "updated_at", "/admin/projects/{id}"),
+        SearchTarget("tickets", "support_tickets", ("subject",),
+                     "subject", "status", "updated_at", "/admin/support/tickets/{id}"),
+        SearchTarget("calls", "call_bookings", ("client_name",),
+                     "client_name", "status", "received_at", "/admin/calls/{id}"),
+        # only columns every deployment has (WebhookEvent has no stripe_account)
+        SearchTarget("webhook_events", "webhook_events", ("event_type",),
+                     "event_type", "status", "received_at", "/admin/webhooks/{id}"),
+    )
+}
+
+# Shortest term worth a trigram lookup; shorter terms only use the word index.
+MIN_TRIGRAM_TERM = 3
+
+
+def normalize_term(term: Optional[str]) -> str:
+    return " ".join((term or "").split())[:100]
+
+
+def like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _tsvector(col: str) -> str:
+    # must stay identical to the indexed expression
+    return f"to_tsvector('simple', coalesce({col}, ''))"
+
+
+def match_clause(
+    kind: str,
+    term: str,
+    fields: Optional[Iterable[str]] = None,
+    alias: Optional[str] = None,
+    param_prefix: str = "search",
+) -> tuple[str, dict]:
+    """
+    SQL predicate + params matching `term` against the target's indexed columns.
+    An empty term matches everything.
+    """
+    term = normalize_term(term)
+    if not term:
+        return "TRUE", {}
+
+    target = TARGETS[kind]
+    cols = tuple(fields) if fields else target.fields
+    term_key, like_key = f"{param_prefix}_term", f"{param_prefix}_like"
+    parts = []
+    for field in cols:
+        if field not in target.fields:
+            raise ValueError(f"{field} is not indexed for {kind}")
+        col = f"{alias}.{field}" if alias else field
+        parts.append(f"{_tsvector(col)} @@ plainto_tsquery('simple', :{term_key})")
+        if len(term) >= MIN_TRIGRAM_TERM:
+            parts.append(f"{col} ILIKE :{like_key}")
+            parts.append(f"{col} % :{term_key}")
+    return "(" + " OR ".join(parts) + ")", {term_key: term, like_key: like_pattern(term)}
+
+
+def rank_expr(kind: str, param_prefix: str = "search") -> str:
+    """Relevance score: best trigram similarity or full-text rank over the fields."""
+    term_key = f"{param_prefix}_term"
+    scores = []
+    for field in TARGETS[kind].fields:
+        scores.append(f"similarity(coalesce({field}, ''), :{term_key})")
+        scores.append(f"ts_rank({_tsvector(field)}, plainto_tsquery('simple', :{term_key}))")
+    return f"GREATEST({', '.join(scores)})"
+
+
+async def search(
+    db: AsyncSession,
+    term: str,
+    kinds: Optional[Iterable[str]] = None,
+    limit: int = 20,
+) -> list[dict]:
+    """Ranked matches across the requested entity kinds (all by default)."""
+    term = normalize_term(term)
+    if not term:
+        return []
+
+    selects = []
+    params: dict = {"per_kind": limit, "limit": limit}
+    for kind in kinds or TARGETS.keys():
+        target = TARGETS[kind]
+        where, where_params = match_clause(kind, term)
+        params.update(where_params)
+        selects.append(
+            f"""
+            (SELECT '{kind}' AS kind, id::text AS id, {target.title} AS title,
+                    {target.subtitle}::text AS subtitle, {target.ts_col} AS ts,
+                    {rank_expr(kind)} AS rank
+             FROM {target.table}
+             WHERE {where}
+             ORDER BY rank DESC
+             LIMIT :per_kind)
+            """
+        )
+
+    res = await db.execute(
+        text(" UNION ALL ".join(selects) + " ORDER BY rank DESC, ts DESC NULLS LAST LIMIT :limit"),
+        params,
+    )
+    results = []
+    for row in res.mappings().all():
+        item = dict(row)
+        item["url"] = TARGETS[item["kind"]].url.format(id=item["id"])
+        results.append(item)
+    return results
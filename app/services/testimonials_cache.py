@@ -0,0 +1,90 @@
+"""
+In-process cache of approved testimonials for the public pages.
+
+/, /pricing, /choose-your-build and /testimonials all show approved
+testimonials newest-first; the list changes a few times a week. The first
+request after a refresh loads it once and keeps two ready-made forms:
+
+- rows:     plain dicts for templates that render testimonial.* fields
+- carousel: the JSON-safe dicts the pricing/choose-your-build carousels embed
+
+Admin approve/delete and both submit endpoints call invalidate(). Other
+workers, and edits made straight in the database, are picked up when the
+TTL runs out.
+"""
+import asyncio
+import os
+import time
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import queries
+
+TESTIMONIALS_CACHE_TTL = int(os.getenv("TESTIMONIALS_CACHE_TTL", "300"))
+# Upper bound on how many approved testimonials the public pages ever load
+TESTIMONIALS_CACHE_MAX_ROWS = 500
+
+
+class _Snapshot:
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+        self.carousel = [_carousel_item(r) for r in rows]
+        self.loaded_at = time.monotonic()
+
+
+def _carousel_item(row: dict) -> dict:
+    return {
+        "client_name": row.get("client_name"),
+        "client_location": row.get("client_location"),
+        "event_type": row.get("event_type"),
+        "testimonial_text": row.get("testimonial_text"),
+        "rating": row.get("rating") or 5,
+        "website_url": row.get("website_url"),
+    }
+
+
+_snapshot: Optional[_Snapshot] = None
+_generation = 0
+_lock = asyncio.Lock()
+
+
+def invalidate() -> None:
+    """Drop the cached lists; the next public page view reloads them."""
+    global _snapshot, _generation
+    _generation += 1
+    _snapshot = None
+
+
+def _fresh(snapshot: Optional[_Snapshot]) -> bool:
+    return snapshot is not None and time.monotonic() - snapshot.loaded_at < TESTIMONIALS_CACHE_TTL
+
+
+async def _load(db: AsyncSession) -> _Snapshot:
+    global _snapshot
+    if _fresh(_snapshot):
+        return _snapshot
+    # one reload at a time; concurrent requests wait for it instead of piling on
+    async with _lock:
+        if _fresh(_snapshot):
+            return _snapshot
+        generation = _generation
+        rows = await queries.fetch_all(
+            db, queries.APPROVED_TESTIMONIALS, limit=TESTIMONIALS_CACHE_MAX_ROWS
+        )
+        snapshot = _Snapshot(rows)
+        # an invalidate() during the load means these rows may already be stale
+        if generation == _generation:
+            _snapshot = snapshot
+        return snapshot
+
+
+async def approved(db: AsyncSession, limit: Optional[int] = None) -> list[dict]:
+    """Approved testimonials newest-first, as dicts."""
+    rows = (await _load(db)).rows
+    return rows[:limit] if limit is not None else rows
+
+
+async def carousel(db: AsyncSession) -> list[dict]:
+    """Approved testimonials in the shape the pricing carousels serialize with |tojson."""
+    return (await _load(db)).carousel
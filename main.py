@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request
-from fastapi.templating import Jinja2Templates
+from app.core.templates import templates
 from app.api.v1 import dashboard_projects
 from app.api.v1.public_pages import router as public_pages_router
 
@@ -19,9 +19,6 @@ from app.api.v1 import (
 
 app = FastAPI(title="WWS API")
 
-# Template engine
-templates = Jinja2Templates(directory="app/templates")
-
 # Admin section wiring
 app.include_router(admin_webhooks.router, prefix="/admin/webhooks", tags=["Admin Webhooks"])
 app.include_router(admin_clients.router, prefix="/admin/clients", tags=["Admin Clients"])
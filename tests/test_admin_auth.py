@@ -0,0 +1,48 @@
+import asyncio
+
+from app.core import security
+from app.middleware.auth import signer
+
+
+def _count_db_checks(monkeypatch, is_admin=True):
+    calls = []
+
+    async def fake_fetch_val(db, query, **params):
+        calls.append(params)
+        return params["id"] if is_admin else None
+
+    monkeypatch.setattr(security.queries, "fetch_val", fake_fetch_val)
+    return calls
+
+
+def test_fresh_admin_claim_needs_no_query(monkeypatch):
+    calls = _count_db_checks(monkeypatch)
+    security._admin_status.pop(7, None)
+    token = security.issue_admin_token(7)
+    assert asyncio.run(security.verify_admin_cookie(token, None)) == 7
+    assert calls == []
+
+
+def test_legacy_cookie_is_checked_once_then_cached(monkeypatch):
+    calls = _count_db_checks(monkeypatch)
+    security._admin_status.pop(8, None)
+    legacy = signer.sign("8").decode()
+    assert asyncio.run(security.verify_admin_cookie(legacy, None)) == 8
+    assert asyncio.run(security.verify_admin_cookie(legacy, None)) == 8
+    assert len(calls) == 1
+    security._admin_status.pop(8, None)
+
+
+def test_revoked_admin_is_rejected_from_cache(monkeypatch):
+    calls = _count_db_checks(monkeypatch, is_admin=False)
+    security._admin_status.pop(9, None)
+    legacy = signer.sign("9").decode()
+    assert asyncio.run(security.verify_admin_cookie(legacy, None)) is None
+    # a fresh claim for a revoked id is still refused without another query
+    assert asyncio.run(security.verify_admin_cookie(security.issue_admin_token(9), None)) is None
+    assert len(calls) == 1
+    security._admin_status.pop(9, None)
+
+
+def test_tampered_cookie_is_rejected():
+    assert asyncio.run(security.verify_admin_cookie("7:admin.bogus.sig", None)) is None
@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core import kv
+from app.services import answer_cache
+
+
+class _FakeAssistants:
+    def __init__(self):
+        self.instructions = "Be helpful."
+        self.calls = 0
+
+    async def retrieve(self, assistant_id, extra_headers=None):
+        self.calls += 1
+        return SimpleNamespace(model="gpt-4o-mini", instructions=self.instructions)
+
+
+def _client():
+    assistants = _FakeAssistants()
+    return SimpleNamespace(beta=SimpleNamespace(assistants=assistants)), assistants
+
+
+def test_normalize_and_cacheable():
+    assert answer_cache.normalize("  What are your PRICES?! ") == "what are your prices"
+    assert answer_cache.cacheable("How much is the Growth package?")
+    assert not answer_cache.cacheable("I'm jo@example.com, call me at 3pm")
+    assert not answer_cache.cacheable("my number is (555) 010-1234")
+    assert not answer_cache.cacheable("?!")
+
+
+def test_answers_follow_the_instructions_version(monkeypatch):
+    monkeypatch.setattr(kv, "_kv", kv.MemoryKV())
+    client, assistants = _client()
+
+    async def scenario():
+        version = await answer_cache.instructions_version(client, "asst_1")
+        await answer_cache.store(version, "What are your prices?", "Starter is $1,997.")
+        assert await answer_cache.lookup(version, "what are your prices") == "Starter is $1,997."
+        assert await answer_cache.lookup(version, "Where is the quiz?") is None
+
+        assistants.instructions = "Be helpful. New pricing."
+        assert await answer_cache.instructions_version(client, "asst_1") == version  # re-read per TTL
+        await kv.get_kv().delete("chat:assistant-version:asst_1")  # TTL elapsed
+        new_version = await answer_cache.instructions_version(client, "asst_1")
+        assert new_version != version
+        assert await answer_cache.lookup(new_version, "What are your prices?") is None
+
+    asyncio.run(scenario())
+
+
+def test_fuzzy_matching_is_opt_in(monkeypatch):
+    monkeypatch.setattr(kv, "_kv", kv.MemoryKV())
+
+    async def scenario():
+        await answer_cache.store("v1", "Where can I find the quiz?", "In the footer.")
+        assert await answer_cache.lookup("v1", "Where can I find the quizz?") is None
+
+        monkeypatch.setattr(answer_cache, "CHAT_ANSWER_FUZZY", 0.9)
+        await answer_cache.store("v1", "Where can I find the quiz?", "In the footer.")
+        assert await answer_cache.lookup("v1", "Where can I find the quizz?") == "In the footer."
+        assert await answer_cache.lookup("v1", "What does the Scale plan include?") is None
+
+    asyncio.run(scenario())
+
+
+def test_version_lookup_failure_disables_cache(monkeypatch):
+    monkeypatch.setattr(kv, "_kv", kv.MemoryKV())
+
+    async def boom(*args, **kwargs):
+        raise RuntimeError("openai down")
+
+    client = SimpleNamespace(beta=SimpleNamespace(assistants=SimpleNamespace(retrieve=boom)))
+
+    async def scenario():
+        version = await answer_cache.instructions_version(client, "asst_1")
+        assert version is None
+        assert await answer_cache.lookup(version, "What are your prices?") is None
+
+    asyncio.run(scenario())
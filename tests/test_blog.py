@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from app.services import blog
+
+
+def _post(slug, day):
+    meta = {"title": slug.title(), "published_at": f"2025-10-{day:02d}", "excerpt": "x & y"}
+    return blog._post_from(slug.replace("-", "_") + ".html", meta, 0)
+
+
+def test_front_matter_parsing():
+    source = "{#---\ntitle: Hello: World\npublished_at: 2025-10-02\n# comment\ndraft: true\n---#}\n{% extends 'x' %}"
+    assert blog.parse_front_matter(source) == {
+        "title": "Hello: World",
+        "published_at": "2025-10-02",
+        "draft": "true",
+    }
+    assert blog.parse_front_matter("{% extends 'x' %}") is None
+
+
+def test_scan_finds_the_shipped_posts():
+    posts = blog.scan()
+    slugs = {p["slug"] for p in posts}
+    assert "automate-lead-generation" in slugs and "website-automation-services" in slugs
+    assert not {"our-blog", "post-detail"} & slugs  # listing/legacy templates have no front matter
+
+
+def test_registry_sorts_paginates_and_builds_feeds():
+    registry = blog.BlogRegistry([_post(f"post-{d}", d) for d in range(1, 6)], page_size=2)
+    assert [p["slug"] for p in registry.page(1)] == ["post-5", "post-4"]
+    assert [p["slug"] for p in registry.page(3)] == ["post-1"]
+    assert registry.page(4) is None and registry.page(0) is None
+    assert registry.get("post-3")["published_at"] == datetime(2025, 10, 3)
+    assert registry.get("missing") is None
+
+    assert registry.rss.count("<item>") == 5 and "x &amp; y" in registry.rss
+    assert registry.atom.count("<entry>") == 5
+    locs = [loc for loc, _ in registry.sitemap_entries()]
+    assert locs[:3] == [f"{blog.SITE_URL}/blog", f"{blog.SITE_URL}/blog/page/2", f"{blog.SITE_URL}/blog/page/3"]
+    assert f"{blog.SITE_URL}/blog/post-1" in locs
+
+
+def test_empty_registry_still_has_a_first_page():
+    registry = blog.BlogRegistry([])
+    assert registry.page(1) == []
+    assert registry.updated_at is None
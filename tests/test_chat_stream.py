@@ -0,0 +1,112 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from app.api.v1 import chat
+
+
+def _event(name, **data):
+    return SimpleNamespace(event=name, data=SimpleNamespace(**data))
+
+
+def _delta(text):
+    block = SimpleNamespace(type="text", text=SimpleNamespace(value=text))
+    return _event("thread.message.delta", delta=SimpleNamespace(content=[block]))
+
+
+class _FakeStream:
+    def __init__(self, events):
+        self.events = events
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for event in self.events:
+            yield event
+
+    async def close(self):
+        self.closed = True
+
+
+def _turn(cancelled):
+    async def cancel(thread_id, run_id, extra_headers=None):
+        cancelled.append(run_id)
+
+    client = SimpleNamespace(beta=SimpleNamespace(threads=SimpleNamespace(runs=SimpleNamespace(cancel=cancel))))
+    return SimpleNamespace(
+        client=client, assistant_id="asst_1", session_id="chat_1", chat_session_pk=7,
+        thread_id="thread_1", is_opening=True, answers_version="v1", cached_answer=None,
+    )
+
+
+def _parse(frames):
+    out = []
+    for frame in frames:
+        head, data = frame.strip().split("\n")
+        out.append((head[len("event: "):], json.loads(data[len("data: "):])))
+    return out
+
+
+def _patch_persistence(monkeypatch):
+    saved, stored = [], []
+
+    @asynccontextmanager
+    async def fake_uow():
+        async def execute(statement, params):
+            saved.append(params)
+        yield SimpleNamespace(session=SimpleNamespace(execute=execute))
+
+    async def fake_store(version, question, answer):
+        stored.append((version, question, answer))
+
+    monkeypatch.setattr(chat, "unit_of_work", fake_uow)
+    monkeypatch.setattr(chat.answer_cache, "store", fake_store)
+    return saved, stored
+
+
+def test_deltas_are_relayed_and_the_reply_persisted(monkeypatch):
+    saved, stored = _patch_persistence(monkeypatch)
+    cancelled = []
+    completed = SimpleNamespace(type="text", text=SimpleNamespace(value="Hello there."))
+    stream = _FakeStream([
+        _event("thread.run.created", id="run_1"),
+        _delta("Hello"),
+        _delta(" there."),
+        _event("thread.message.completed", content=[completed]),
+        _event("thread.run.completed", id="run_1"),
+    ])
+
+    async def scenario():
+        return [f async for f in chat._relay_run(_turn(cancelled), "Hi?", stream)]
+
+    events = _parse(asyncio.run(scenario()))
+    assert [name for name, _ in events] == ["start", "delta", "delta", "done"]
+    assert "".join(d["text"] for name, d in events if name == "delta") == "Hello there."
+    assert events[-1][1]["response"] == "Hello there."
+    assert saved == [{"sid": 7, "c": "Hello there."}]
+    assert stored == [("v1", "Hi?", "Hello there.")]
+    assert cancelled == []
+
+
+def test_failed_run_reports_error_and_cancels(monkeypatch):
+    saved, stored = _patch_persistence(monkeypatch)
+    cancelled = []
+    stream = _FakeStream([
+        _event("thread.run.created", id="run_2"),
+        _delta("Partial"),
+        _event("thread.run.requires_action", id="run_2"),
+    ])
+
+    async def scenario():
+        frames = [f async for f in chat._relay_run(_turn(cancelled), "Hi?", stream)]
+        await asyncio.sleep(0)  # let the background cancel run
+        return frames
+
+    events = _parse(asyncio.run(scenario()))
+    assert events[-1][0] == "error"
+    assert saved == [] and stored == []
+    assert cancelled == ["run_2"]
+    assert stream.closed
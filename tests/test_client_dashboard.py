@@ -0,0 +1,11 @@
+from app.services.client_dashboard import DASHBOARD_HOME, _section
+
+
+def test_dashboard_home_uses_one_bind():
+    assert DASHBOARD_HOME.param_names == ("cid",)
+
+
+def test_section_strips_prefix():
+    row = {"onboarding_industry": "legal", "client_twilio_status": "ready", "user_email": "a@b.c"}
+    assert _section(row, "onboarding_") == {"industry": "legal"}
+    assert _section(row, "client_") == {"twilio_status": "ready"}
@@ -0,0 +1,91 @@
+import asyncio
+
+from app.services import credentials_repo
+
+
+def _fake_fetch(monkeypatch, rows):
+    calls = []
+
+    async def fake_fetch_one(db, query, **params):
+        calls.append(params["cid"])
+        return rows.get(params["cid"])
+
+    monkeypatch.setattr(credentials_repo.queries, "fetch_one", fake_fetch_one)
+    return calls
+
+
+def test_repeat_reads_hit_cache_until_invalidated(monkeypatch):
+    credentials_repo.invalidate()
+    rows = {7: {"openai_api_key": "sk-abcdef123456", "twilio_from_number": "+15550100"}}
+    calls = _fake_fetch(monkeypatch, rows)
+
+    async def scenario():
+        assert (await credentials_repo.get(None, 7))["openai_api_key"] == "sk-abcdef123456"
+        masked = await credentials_repo.masked(None, 7)
+        assert masked["openai"] == {"connected": True, "api_key": "***********3456"}
+        assert masked["stripe"]["connected"] is False
+        assert masked["twilio"]["from_number"] == "+15550100"
+        assert calls == [7]
+
+        # a missing row is cached too, so an unconfigured client is one query per TTL
+        assert await credentials_repo.get(None, 8) is None
+        assert await credentials_repo.get(None, 8) is None
+        assert calls == [7, 8]
+
+        rows[7] = {"openai_api_key": "sk-new-key-9999"}
+        credentials_repo.invalidate(7)
+        assert (await credentials_repo.masked(None, 7))["openai"]["api_key"].endswith("9999")
+        assert calls == [7, 8, 7]
+
+    asyncio.run(scenario())
+    credentials_repo.invalidate()
+
+
+def test_least_recently_used_client_is_evicted(monkeypatch):
+    credentials_repo.invalidate()
+    monkeypatch.setattr(credentials_repo, "CREDENTIALS_CACHE_SIZE", 2)
+    calls = _fake_fetch(monkeypatch, {})
+
+    async def scenario():
+        await credentials_repo.get(None, 1)
+        await credentials_repo.get(None, 2)
+        await credentials_repo.get(None, 1)  # 2 is now least recently used
+        await credentials_repo.get(None, 3)
+        await credentials_repo.get(None, 1)
+        await credentials_repo.get(None, 2)
+        assert calls == [1, 2, 3, 2]
+
+    asyncio.run(scenario())
+    credentials_repo.invalidate()
+
+
+def test_entry_repr_does_not_leak_secrets():
+    entry = credentials_repo._Entry({"stripe_secret_key": "sk_live_secret"})
+    assert "sk_live" not in repr(entry)
+
+
+def test_slow_load_only_blocks_the_same_client(monkeypatch):
+    credentials_repo.invalidate()
+    calls = []
+    release = asyncio.Event()
+
+    async def fake_fetch_one(db, query, **params):
+        calls.append(params["cid"])
+        if params["cid"] == 1:
+            await release.wait()
+        return {"openai_api_key": f"sk-client-{params['cid']}"}
+
+    monkeypatch.setattr(credentials_repo.queries, "fetch_one", fake_fetch_one)
+
+    async def scenario():
+        slow = [asyncio.create_task(credentials_repo.get(None, 1)) for _ in range(3)]
+        await asyncio.sleep(0)
+        other = await asyncio.wait_for(credentials_repo.get(None, 2), timeout=1)
+        assert other["openai_api_key"] == "sk-client-2"
+        release.set()
+        assert all(r["openai_api_key"] == "sk-client-1" for r in await asyncio.gather(*slow))
+        assert sorted(calls) == [1, 2]
+        assert credentials_repo._loading == {}
+
+    asyncio.run(scenario())
+    credentials_repo.invalidate()
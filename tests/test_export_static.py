@@ -0,0 +1,18 @@
+from pathlib import Path
+
+from app.export_static import DATA_ROUTES, EXCLUDED_ROUTES, export_paths, output_file
+
+
+def test_export_paths_split_static_and_data():
+    static = export_paths(include_data=False)
+    data = export_paths(include_static=False)
+    assert "/faq" in static and "/blog/website-automation-services" in static
+    assert set(data) <= DATA_ROUTES
+    assert not set(static) & (DATA_ROUTES | EXCLUDED_ROUTES)
+
+
+def test_output_file_layout():
+    out = Path("/tmp/export")
+    assert output_file(out, "/") == out / "index.html"
+    assert output_file(out, "/how-it-works") == out / "how-it-works.html"
+    assert output_file(out, "/blog/custom-business-automation") == out / "blog" / "custom-business-automation.html"
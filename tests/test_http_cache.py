@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse
+from fastapi.testclient import TestClient
+
+from app.core.http_cache import CachePolicy, cached_page
+
+app = FastAPI()
+POLICY = CachePolicy(max_age=60, s_maxage=600, stale_while_revalidate=3600)
+
+
+@app.get("/page")
+async def page(request: Request):
+    return cached_page(request, HTMLResponse("<h1>hello</h1>"), POLICY, last_modified=datetime(2025, 10, 2))
+
+
+client = TestClient(app)
+
+
+def test_page_sends_validators_and_cache_control():
+    resp = client.get("/page")
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "public, max-age=60, s-maxage=600, stale-while-revalidate=3600"
+    assert resp.headers["etag"].startswith('"')
+    assert resp.headers["last-modified"] == "Thu, 02 Oct 2025 00:00:00 GMT"
+
+
+def test_matching_etag_returns_304():
+    etag = client.get("/page").headers["etag"]
+    resp = client.get("/page", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+
+def test_if_modified_since_only_used_without_etag():
+    assert client.get("/page", headers={"If-Modified-Since": "Fri, 03 Oct 2025 00:00:00 GMT"}).status_code == 304
+    resp = client.get(
+        "/page",
+        headers={"If-None-Match": '"stale"', "If-Modified-Since": "Fri, 03 Oct 2025 00:00:00 GMT"},
+    )
+    assert resp.status_code == 200
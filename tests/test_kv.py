@@ -0,0 +1,263 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import kv
+
+
+class _RespStandIn:
+    """Just enough of a Redis server (GET/SET NX PX/DEL/INCRBY/PEXPIRE/EVAL scripts) to test RedisKV."""
+
+    def __init__(self):
+        self.data = {}
+        self.slow_keys = set()
+        self.server = None
+        self.connections = 0
+
+    def _live(self, key):
+        item = self.data.get(key)
+        if item and item[1] is not None and item[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return item
+
+    def handle(self, args):
+        cmd = args[0].upper()
+        if cmd == "GET":
+            item = self._live(args[1])
+            return item[0] if item else None
+        if cmd == "SET":
+            key, value, opts = args[1], args[2], [a.upper() for a in args[3:]]
+            if "NX" in opts and self._live(key):
+                return None
+            expires = None
+            if "PX" in opts:
+                expires = time.monotonic() + int(args[3 + opts.index("PX") + 1]) / 1000
+            self.data[key] = (value, expires)
+            return "OK"
+        if cmd == "DEL":
+            return 1 if self.data.pop(args[1], None) else 0
+        if cmd == "INCRBY":
+            item = self._live(args[1])
+            value = int(item[0] if item else 0) + int(args[2])
+            self.data[args[1]] = (str(value), item[1] if item else None)
+            return value
+        if cmd == "PEXPIRE":
+            item = self._live(args[1])
+            if not item:
+                return 0
+            self.data[args[1]] = (item[0], time.monotonic() + int(args[2]) / 1000)
+            return 1
+        if cmd == "EVAL" and args[1] == kv._INCR_SCRIPT:
+            key, amount, ttl_ms = args[3], int(args[4]), int(args[5])
+            item = self._live(key)
+            value = int(item[0] if item else 0) + amount
+            expires = item[1] if item else None
+            if ttl_ms > 0 and expires is None:
+                expires = time.monotonic() + ttl_ms / 1000
+            self.data[key] = (str(value), expires)
+            return value
+        if cmd == "EVAL":  # the compare-and-delete unlock script
+            key, token = args[3], args[4]
+            item = self._live(key)
+            if item and item[0] == token:
+                del self.data[key]
+                return 1
+            return 0
+        return RuntimeError(f"ERR unknown command {cmd}")
+
+    @staticmethod
+    def _reply(value) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, RuntimeError):
+            return b"-" + str(value).encode() + b"\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if value == "OK":
+            return b"+OK\r\n"
+        data = value.encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    async def _client(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:-2])):
+                    size = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(size + 2))[:-2].decode())
+                if args[0].upper() == "GET" and args[1] in self.slow_keys:
+                    await asyncio.sleep(0.05)
+                writer.write(self._reply(self.handle(args)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._client, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def _with_store(backend, scenario):
+    async def run():
+        stand_in = None
+        if backend == "redis":
+            stand_in = _RespStandIn()
+            store = kv.create_kv(await stand_in.start())
+        else:
+            store = kv.create_kv("")
+        try:
+            await scenario(store)
+        finally:
+            await store.close()
+            if stand_in:
+                await stand_in.stop()
+
+    asyncio.run(run())
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    return request.param
+
+
+def test_get_set_ttl_and_delete(backend):
+    async def scenario(store):
+        assert await store.get("missing") is None
+        await store.set("thread", {"id": "thread_1", "n": 2})
+        assert await store.get("thread") == {"id": "thread_1", "n": 2}
+        await store.set("short", "x", ttl=0.05)
+        assert await store.get("short") == "x"
+        await asyncio.sleep(0.08)
+        assert await store.get("short") is None
+        await store.delete("thread")
+        assert await store.get("thread") is None
+
+    _with_store(backend, scenario)
+
+
+def test_incr_is_atomic_and_ttl_applies_to_window(backend):
+    async def scenario(store):
+        results = await asyncio.gather(*(store.incr("hits", ttl=0.2) for _ in range(20)))
+        assert sorted(results) == list(range(1, 21))
+        assert await store.get("hits") == 20
+        await asyncio.sleep(0.25)
+        assert await store.incr("hits", amount=5) == 5
+
+    _with_store(backend, scenario)
+
+
+def test_get_or_set_runs_loader_once(backend):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "asst_123"
+
+    async def scenario(store):
+        values = await asyncio.gather(*(store.get_or_set("assistant:chat", loader) for _ in range(5)))
+        assert values == ["asst_123"] * 5
+        assert len(calls) == 1
+
+    _with_store(backend, scenario)
+
+
+def test_lock_times_out_while_held(backend):
+    async def scenario(store):
+        async with store.lock("job", ttl=5, wait=1):
+            with pytest.raises(kv.LockTimeout):
+                async with store.lock("job", ttl=5, wait=0.1):
+                    pass
+        async with store.lock("job", ttl=5, wait=0.1):
+            pass
+
+    _with_store(backend, scenario)
+
+
+def test_redis_backend_reconnects_after_dropped_connection():
+    async def run():
+        stand_in = _RespStandIn()
+        store = kv.create_kv(await stand_in.start())
+        await store.set("k", 1)
+        store._idle[-1].close()  # simulate the server/proxy dropping us
+        await asyncio.sleep(0)
+        assert await store.get("k") == 1
+        assert stand_in.connections == 2
+        await store.close()
+        await stand_in.stop()
+
+    asyncio.run(run())
+
+
+def test_cancelled_command_never_leaks_its_reply():
+    async def run():
+        stand_in = _RespStandIn()
+        store = kv.create_kv(await stand_in.start())
+        await store.set("secret", "SECRET-of-session-A")
+        stand_in.slow_keys.add(store._key("secret"))
+        task = asyncio.create_task(store.get("secret"))
+        await asyncio.sleep(0.01)  # command written, reply not read yet
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await store.get("other") is None
+        await store.close()
+        await stand_in.stop()
+
+    asyncio.run(run())
+
+
+def test_redis_commands_run_concurrently_on_a_bounded_pool():
+    async def run():
+        stand_in = _RespStandIn()
+        store = kv.RedisKV(await stand_in.start(), pool_size=3)
+        await store.set("slow", "s")
+        await store.set("fast", "f")
+        stand_in.slow_keys.add(store._key("slow"))
+        finished = []
+
+        async def get(key):
+            value = await store.get(key)
+            finished.append(value)
+
+        # a slow reply no longer holds up every other command in the worker
+        await asyncio.gather(get("slow"), get("fast"))
+        assert finished == ["f", "s"]
+        await asyncio.gather(*(get("slow") for _ in range(6)))
+        assert stand_in.connections <= 3
+        await store.close()
+        await stand_in.stop()
+
+    asyncio.run(run())
+
+
+def test_memory_locks_are_forgotten_after_release():
+    async def scenario(store):
+        for n in range(50):
+            async with store.lock(f"job:{n}", wait=0.1):
+                pass
+        with pytest.raises(kv.LockTimeout):
+            async with store.lock("held", wait=1):
+                async with store.lock("held", wait=0.01):
+                    pass
+        assert store._locks == {}
+
+    _with_store("memory", scenario)
+
+
+def test_create_kv_rejects_tls_urls():
+    with pytest.raises(ValueError):
+        kv.create_kv("rediss://example.com:6380/0")
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("openai")
+
+from app.core import openai_gateway  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    monkeypatch.setattr(openai_gateway, "_clients", openai_gateway.OrderedDict())
+    monkeypatch.setattr(openai_gateway, "_http_client", None)
+
+
+def test_clients_are_reused_per_key_and_share_one_pool():
+    a = openai_gateway.get_client("sk-a")
+    assert openai_gateway.get_client("sk-a") is a
+    b = openai_gateway.get_client("sk-b")
+    assert b is not a
+    assert a._client is b._client is openai_gateway._http_client
+    assert a.default_headers["OpenAI-Beta"] == "assistants=v2"
+    assert "sk-a" not in openai_gateway._clients  # indexed by hash, not the raw key
+
+
+def test_server_key_is_the_default(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-server")
+    assert openai_gateway.get_client().api_key == "sk-server"
+    monkeypatch.delenv("OPENAI_API_KEY")
+    with pytest.raises(openai_gateway.OpenAIUnavailable):
+        openai_gateway.get_client(None)
+
+
+def test_least_recently_used_key_is_dropped(monkeypatch):
+    monkeypatch.setattr(openai_gateway, "OPENAI_CLIENTS_MAX", 2)
+    a = openai_gateway.get_client("sk-a")
+    openai_gateway.get_client("sk-b")
+    openai_gateway.get_client("sk-a")
+    openai_gateway.get_client("sk-c")
+    assert openai_gateway.get_client("sk-a") is a
+    assert len(openai_gateway._clients) == 2
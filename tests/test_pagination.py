@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.pagination import Keyset, decode_cursor, encode_cursor
+
+
+def _rows(ids):
+    # newest first, like the listings
+    return [{"id": i, "updated_at": datetime(2025, 1, i, tzinfo=timezone.utc)} for i in ids]
+
+
+def test_cursor_round_trip():
+    ts = datetime(2025, 12, 29, 14, 0, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(ts, 42, "prev")) == (ts, 42, "prev")
+
+
+def test_bad_cursor_is_400():
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_keyset_forward_and_back():
+    ks = Keyset("updated_at", "id", limit=2)
+
+    first, next_cursor, prev_cursor = ks.page(_rows([9, 8, 7]), None)
+    assert [r["id"] for r in first] == [9, 8]
+    assert prev_cursor is None and next_cursor
+
+    where, order, params = ks.clause(next_cursor)
+    assert "<" in where and order.endswith("DESC")
+    assert params["cursor_id"] == 8
+
+    second, next2, prev2 = ks.page(_rows([7, 6]), next_cursor)
+    assert [r["id"] for r in second] == [7, 6]
+    assert next2 is None and prev2
+
+    where, order, params = ks.clause(prev2)
+    assert ">" in where and order.endswith("ASC")
+    # backwards queries come back oldest-first and are flipped
+    back, _, prev3 = ks.page(list(reversed(_rows([9, 8]))), prev2)
+    assert [r["id"] for r in back] == [9, 8]
+    assert prev3 is None
+
+
+def test_tampered_cursor_values_are_400():
+    ks = Keyset("updated_at", "id")
+    ts = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for cursor in (
+        encode_cursor("2025-01-01", 1),  # a bare string instead of {"ts": ...}
+        encode_cursor({"x": 1}, 1),
+        encode_cursor(ts, "1"),
+        encode_cursor(ts, True),
+    ):
+        with pytest.raises(HTTPException) as exc:
+            ks.clause(cursor)
+        assert exc.value.status_code == 400
+
+    events = Keyset("received_at", "id", id_type=str)
+    assert events.clause(encode_cursor(ts, "evt_1"))[2]["cursor_id"] == "evt_1"
+    with pytest.raises(HTTPException):
+        events.clause(encode_cursor(ts, 1))
+
+
+def test_null_sort_values_stay_in_the_listing():
+    ks = Keyset("updated_at", "id", limit=2)
+    rows = [{"id": 5, "updated_at": None}, {"id": 4, "updated_at": None}, {"id": 3, "updated_at": None}]
+    _, next_cursor, _ = ks.page(rows, None)
+
+    # past the last NULL row: the remaining NULLs, then every dated row
+    where, _, params = ks.clause(next_cursor)
+    assert where == "((updated_at IS NULL AND id < :cursor_id) OR updated_at IS NOT NULL)"
+    assert params == {"cursor_id": 4}
+
+    # back from a dated row: everything newer, including the NULLs listed first
+    where, order, params = ks.clause(encode_cursor(datetime(2025, 1, 1), 2, "prev"))
+    assert where == "((updated_at, id) > (:cursor_sort, :cursor_id) OR updated_at IS NULL)"
+    assert order == "updated_at ASC, id ASC"
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+from app.services import presigned_urls
+
+
+class _FakeS3:
+    def __init__(self):
+        self.calls = []
+        self.threads = set()
+
+    def generate_presigned_url(self, op, Params, ExpiresIn):
+        self.calls.append(Params["Key"])
+        self.threads.add(threading.get_ident())
+        return f"https://spaces.example/{Params['Bucket']}/{Params['Key']}?n={len(self.calls)}&exp={ExpiresIn}"
+
+
+def test_urls_are_reused_per_bucket_and_key():
+    presigned_urls.invalidate()
+    s3 = _FakeS3()
+
+    async def scenario():
+        first = await presigned_urls.signed_url(s3, "bucket", "a.png")
+        assert await presigned_urls.signed_url(s3, "bucket", "a.png") == first
+        await presigned_urls.signed_url(s3, "other", "a.png")
+        assert s3.calls == ["a.png", "a.png"]
+        assert "exp=600" in first
+        assert 0 < presigned_urls.seconds_left("bucket", "a.png") <= presigned_urls.PRESIGNED_URL_CACHE_TTL
+
+    asyncio.run(scenario())
+    assert threading.get_ident() not in s3.threads  # signed off the event loop
+    presigned_urls.invalidate()
+
+
+def test_batch_signs_only_misses(monkeypatch):
+    presigned_urls.invalidate()
+    s3 = _FakeS3()
+
+    async def scenario():
+        await presigned_urls.signed_url(s3, "bucket", "a.png")
+        urls = await presigned_urls.signed_urls(s3, "bucket", ["a.png", "b.png", "c.png", "b.png"])
+        assert list(urls) == ["a.png", "b.png", "c.png"]
+        assert s3.calls == ["a.png", "b.png", "c.png"]
+
+    asyncio.run(scenario())
+    presigned_urls.invalidate()
+
+
+def test_expired_entries_are_resigned(monkeypatch):
+    presigned_urls.invalidate()
+    monkeypatch.setattr(presigned_urls, "PRESIGNED_URL_CACHE_TTL", 0)
+    s3 = _FakeS3()
+
+    async def scenario():
+        await presigned_urls.signed_url(s3, "bucket", "a.png")
+        await presigned_urls.signed_url(s3, "bucket", "a.png")
+        assert s3.calls == ["a.png", "a.png"]
+
+    asyncio.run(scenario())
+    presigned_urls.invalidate()
+
+
+def test_cache_ttl_stays_below_url_expiry():
+    assert (
+        presigned_urls.PRESIGNED_URL_EXPIRES - presigned_urls.PRESIGNED_URL_CACHE_TTL
+        >= presigned_urls.PRESIGNED_URL_MIN_REMAINING
+    )
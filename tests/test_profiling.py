@@ -0,0 +1,31 @@
+from sqlalchemy import create_engine, text
+
+from app.db import profiling
+
+
+def test_profile_tracks_count_slowest_and_repeats():
+    profile = profiling.RequestProfile()
+    for _ in range(profiling.SQL_PROFILE_REPEAT_THRESHOLD):
+        profile.record("SELECT 1  FROM t WHERE id = $1", 0.001)
+    profile.record("SELECT * FROM big", 0.05)
+
+    summary = profile.summary()
+    assert summary["statements"] == profiling.SQL_PROFILE_REPEAT_THRESHOLD + 1
+    assert summary["slowest_sql"] == "SELECT * FROM big"
+    assert summary["repeated"] == [
+        {"sql": "SELECT 1 FROM t WHERE id = $1", "count": profiling.SQL_PROFILE_REPEAT_THRESHOLD}
+    ]
+
+
+def test_engine_events_record_into_current_profile():
+    engine = create_engine("sqlite://")
+    profiling.install(engine)
+    profile = profiling.RequestProfile()
+    token = profiling._current.set(profile)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    finally:
+        profiling._current.reset(token)
+    assert profile.count == 2
@@ -0,0 +1,51 @@
+import asyncio
+
+from app.core import kv
+from app.services import prompt_cache
+
+SYSTEM = "You are a prompt builder."
+
+
+def test_key_ignores_whitespace_but_not_client_model_or_prompt():
+    key = prompt_cache.cache_key(1, "Plumbing  in\nAustin ", "gpt-4o-mini", SYSTEM)
+    assert key == prompt_cache.cache_key(1, "Plumbing in Austin", "gpt-4o-mini", SYSTEM)
+    assert key != prompt_cache.cache_key(2, "Plumbing in Austin", "gpt-4o-mini", SYSTEM)
+    assert key != prompt_cache.cache_key(1, "Plumbing in Austin", "gpt-4o", SYSTEM)
+    assert key != prompt_cache.cache_key(1, "Plumbing in Austin", "gpt-4o-mini", SYSTEM + " v2")
+
+
+def test_identical_concurrent_requests_share_one_generation(monkeypatch):
+    monkeypatch.setattr(kv, "_kv", kv.MemoryKV())
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "PROMPT"
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(prompt_cache.get_or_generate(7, "notes", "m", SYSTEM, generate) for _ in range(4))
+        )
+        assert [r[0] for r in results] == ["PROMPT"] * 4
+        assert sorted(r[1] for r in results) == [False, True, True, True]
+        assert await prompt_cache.get_or_generate(7, " notes ", "m", SYSTEM, generate) == ("PROMPT", True)
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_empty_results_are_not_cached(monkeypatch):
+    monkeypatch.setattr(kv, "_kv", kv.MemoryKV())
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        return ""
+
+    async def scenario():
+        assert await prompt_cache.get_or_generate(7, "notes", "m", SYSTEM, generate) == ("", False)
+        assert await prompt_cache.get_or_generate(7, "notes", "m", SYSTEM, generate) == ("", False)
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,13 @@
+from app.db.queries import Query
+
+
+def test_query_converts_named_binds_to_positional():
+    q = Query("t", "SELECT id FROM t WHERE a = :a AND (b = :b OR c = :a) AND meta = CAST(:m AS jsonb)")
+    assert q.raw_sql == "SELECT id FROM t WHERE a = $1 AND (b = $2 OR c = $1) AND meta = CAST($3 AS jsonb)"
+    assert q.args({"a": 1, "b": 2, "m": "{}"}) == [1, 2, "{}"]
+
+
+def test_query_leaves_casts_alone():
+    q = Query("t", "INSERT INTO t (payload) VALUES (:payload::jsonb)")
+    assert q.raw_sql == "INSERT INTO t (payload) VALUES ($1::jsonb)"
+    assert q.param_names == ("payload",)
@@ -35,4 +35,12 @@ async def test_chat_message():
     async with AsyncClient(app=app, base_url="http://test") as ac:
         r = await ac.post("/chat/message", json={"message": "hello"})
         assert r.status_code in (200, 401, 403, 500)
-#r = await ac.get("/admin/projects/api?page=1")
\ No newline at end of file
+#r = await ac.get("/admin/projects/api?page=1")
+
+@pytest.mark.asyncio
+async def test_admin_db_pool_stats():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        r = await ac.get("/admin/db/pool", headers={"Authorization": "Bearer admin-dev-token"})
+        assert r.status_code == 200
+        stats = r.json()["primary"]
+        assert {"checked_out", "idle", "overflow", "avg_wait_ms"} <= stats.keys()
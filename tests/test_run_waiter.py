@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import run_waiter
+
+
+class _FakeRuns:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.retrieves = 0
+        self.cancelled = []
+
+    async def retrieve(self, thread_id, run_id, extra_headers=None):
+        self.retrieves += 1
+        status = self.statuses.pop(0) if self.statuses else "in_progress"
+        return SimpleNamespace(id=run_id, status=status)
+
+    async def cancel(self, thread_id, run_id, extra_headers=None):
+        self.cancelled.append(run_id)
+
+
+def _client(statuses):
+    runs = _FakeRuns(statuses)
+    return SimpleNamespace(beta=SimpleNamespace(threads=SimpleNamespace(runs=runs))), runs
+
+
+@pytest.fixture(autouse=True)
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(run_waiter, "RUN_POLL_INITIAL", 0.001)
+    monkeypatch.setattr(run_waiter, "RUN_POLL_MAX", 0.004)
+    run_waiter.reset_run_stats()
+
+
+def _queued():
+    return SimpleNamespace(id="run_1", status="queued")
+
+
+def test_backoff_until_completed_and_metrics():
+    client, runs = _client(["in_progress", "in_progress", "completed"])
+    sleeps = []
+    real_next = run_waiter._next_sleep
+
+    def spy(step):
+        sleeps.append(step)
+        return real_next(step)
+
+    run_waiter._next_sleep = spy
+    try:
+        run = asyncio.run(run_waiter.wait_for_run(client, "thread_1", _queued(), label="chat"))
+    finally:
+        run_waiter._next_sleep = real_next
+
+    assert run.status == "completed"
+    assert runs.retrieves == 3
+    assert sleeps == [0.001, 0.002, 0.004]
+    [report] = run_waiter.run_report()
+    assert report["label"] == "chat"
+    assert report["polls"] == 3
+    assert report["outcomes"] == {"completed": 1}
+
+
+def test_requires_action_is_cancelled_instead_of_looping():
+    client, runs = _client(["requires_action"])
+    with pytest.raises(run_waiter.RunNotCompleted) as exc:
+        asyncio.run(run_waiter.wait_for_run(client, "thread_1", _queued()))
+    assert exc.value.reason == "requires_action"
+    assert runs.cancelled == ["run_1"]
+
+
+def test_deadline_and_disconnect_give_up():
+    client, runs = _client([])
+    with pytest.raises(run_waiter.RunNotCompleted) as exc:
+        asyncio.run(run_waiter.wait_for_run(client, "thread_1", _queued(), deadline=0.02))
+    assert exc.value.reason == "timeout"
+    assert runs.cancelled == ["run_1"]
+
+    async def gone():
+        return True
+
+    client, runs = _client([])
+    with pytest.raises(run_waiter.RunNotCompleted) as exc:
+        asyncio.run(run_waiter.wait_for_run(client, "thread_1", _queued(), is_disconnected=gone))
+    assert exc.value.reason == "disconnected"
+    assert runs.retrieves == 0
+    assert {r["label"]: r["outcomes"] for r in run_waiter.run_report()} == {
+        "run": {"timeout": 1, "disconnected": 1}
+    }
+
+
+def test_failed_run_is_reported_not_cancelled():
+    client, runs = _client(["failed"])
+    with pytest.raises(run_waiter.RunNotCompleted) as exc:
+        asyncio.run(run_waiter.wait_for_run(client, "thread_1", _queued()))
+    assert exc.value.reason == "failed"
+    assert runs.cancelled == []
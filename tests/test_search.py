@@ -0,0 +1,47 @@
+from app.services.search import match_clause
+
+
+def test_empty_term_matches_everything():
+    assert match_clause("projects", "   ") == ("TRUE", {})
+
+
+def test_match_clause_escapes_like_wildcards():
+    clause, params = match_clause("tickets", "50%_off", alias="st")
+    assert "st.subject ILIKE :search_like" in clause
+    assert "to_tsvector('simple', coalesce(st.subject, ''))" in clause
+    assert params == {"search_term": "50%_off", "search_like": "%50\\%\\_off%"}
+
+
+def test_short_terms_skip_trigram_operators():
+    clause, _ = match_clause("calls", "ab")
+    assert "ILIKE" not in clause and "%" not in clause
+
+
+def test_search_default_kinds_only_reference_existing_columns():
+    import asyncio
+    import re
+
+    from app.services import search as search_module
+
+    statements = []
+
+    class _Result:
+        def mappings(self):
+            return self
+
+        def all(self):
+            return [{"kind": "webhook_events", "id": "evt_1", "title": "charge.succeeded",
+                     "subtitle": "processed", "ts": None, "rank": 0.9}]
+
+    class _Session:
+        async def execute(self, statement, params):
+            statements.append((str(statement), params))
+            return _Result()
+
+    results = asyncio.run(search_module.search(_Session(), "charge"))
+    sql, params = statements[0]
+    assert "stripe_account" not in sql
+    for kind in search_module.TARGETS:
+        assert f"'{kind}' AS kind" in sql
+    assert set(re.findall(r"(?<!:):(\w+)", sql)) <= set(params)
+    assert results[0]["url"] == "/admin/webhooks/evt_1"
@@ -0,0 +1,125 @@
+import asyncio
+import socket
+from email.mime.text import MIMEText
+
+import pytest
+
+pytest.importorskip("aiosmtplib")
+controller_mod = pytest.importorskip("aiosmtpd.controller")
+smtp_mod = pytest.importorskip("aiosmtpd.smtp")
+
+from app.core import smtp_pool  # noqa: E402
+
+
+class _Inbox:
+    def __init__(self):
+        self.messages = []
+        self.peers = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.peers.add(session.peer)
+        return "250 OK"
+
+
+def _authenticator(server, session, envelope, mechanism, auth_data):
+    ok = auth_data.login == b"mailer" and auth_data.password == b"secret"
+    return smtp_mod.AuthResult(success=ok, handled=False)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def server():
+    inbox = _Inbox()
+    controller = controller_mod.Controller(
+        inbox,
+        hostname="127.0.0.1",
+        port=_free_port(),
+        authenticator=_authenticator,
+        auth_require_tls=False,
+    )
+    controller.start()
+    yield controller, inbox
+    controller.stop()
+
+
+def _pool(controller, **kwargs):
+    return smtp_pool.SmtpPool(
+        "127.0.0.1", controller.port, "mailer", "secret", start_tls=False, **kwargs
+    )
+
+
+def _message(n):
+    msg = MIMEText(f"body {n}")
+    msg["From"] = "noreply@example.com"
+    msg["To"] = f"user{n}@example.com"
+    msg["Subject"] = f"Message {n}"
+    return msg
+
+
+def test_messages_reuse_one_authenticated_connection(server):
+    controller, inbox = server
+
+    async def scenario():
+        pool = _pool(controller, size=1)
+        for n in range(3):
+            await pool.send(_message(n))
+        await pool.close()
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert [e.rcpt_tos for e in inbox.messages] == [[f"user{n}@example.com"] for n in range(3)]
+    assert pool.connects == 1
+    assert len(inbox.peers) == 1
+
+
+def test_concurrent_sends_are_capped_by_pool_size(server):
+    controller, inbox = server
+
+    async def scenario():
+        pool = _pool(controller, size=2)
+        await asyncio.gather(*(pool.send(_message(n)) for n in range(6)))
+        await pool.close()
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert len(inbox.messages) == 6
+    assert pool.connects <= 2
+
+
+def test_dropped_connection_is_replaced(server):
+    controller, inbox = server
+
+    async def scenario():
+        pool = _pool(controller, check_after=0)
+        await pool.send(_message(1))
+        # the server (or a NAT box) silently drops the idle session
+        pool._idle[-1][0].close()
+        await pool.send(_message(2))
+        # and one that still looks connected but fails the NOOP health check
+        smtp, _ = pool._idle[-1]
+        smtp.protocol.transport.abort()
+        await asyncio.sleep(0)
+        await pool.send(_message(3))
+        await pool.close()
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert len(inbox.messages) == 3
+    assert pool.connects == 3
+
+
+def test_bad_credentials_raise_auth_error(server):
+    controller, _ = server
+
+    async def scenario():
+        pool = smtp_pool.SmtpPool("127.0.0.1", controller.port, "mailer", "wrong", start_tls=False)
+        await pool.send(_message(1))
+
+    with pytest.raises(smtp_pool.SMTPAuthenticationError):
+        asyncio.run(scenario())
@@ -0,0 +1,26 @@
+from app.core.templates import precompile, templates
+
+
+def test_shared_environment_registers_globals_and_filters():
+    assert "now" in templates.env.globals
+    assert "pretty_status" in templates.env.filters
+    assert templates.env.bytecode_cache is not None
+
+
+def test_every_template_compiles():
+    assert precompile() == len(templates.env.list_templates(extensions=("html", "txt")))
+
+
+def test_bytecode_cache_refuses_shared_directories(tmp_path, monkeypatch):
+    from app.core import templates as templates_module
+
+    private = tmp_path / "private"
+    monkeypatch.setattr(templates_module, "JINJA_BYTECODE_CACHE_DIR", str(private))
+    assert templates_module._bytecode_cache() is not None
+    assert private.stat().st_mode & 0o777 == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    monkeypatch.setattr(templates_module, "JINJA_BYTECODE_CACHE_DIR", str(shared))
+    assert templates_module._bytecode_cache() is None
@@ -0,0 +1,34 @@
+import asyncio
+
+from app.services import testimonials_cache
+
+
+def _run(monkeypatch, rows_by_call):
+    calls = []
+
+    async def fake_fetch_all(db, query, **params):
+        calls.append(params)
+        return rows_by_call[len(calls) - 1]
+
+    monkeypatch.setattr(testimonials_cache.queries, "fetch_all", fake_fetch_all)
+    return calls
+
+
+def test_cache_serves_repeat_reads_and_reloads_after_invalidate(monkeypatch):
+    testimonials_cache.invalidate()
+    first = [{"client_name": "A", "rating": None, "testimonial_text": "great"}]
+    second = [{"client_name": "B", "rating": 4, "testimonial_text": "good"}] + first
+    calls = _run(monkeypatch, [first, second])
+
+    async def scenario():
+        assert await testimonials_cache.approved(None) == first
+        carousel = await testimonials_cache.carousel(None)
+        assert carousel[0]["rating"] == 5  # carousel default
+        assert len(calls) == 1
+
+        testimonials_cache.invalidate()
+        assert [r["client_name"] for r in await testimonials_cache.approved(None, limit=1)] == ["B"]
+        assert len(calls) == 2
+
+    asyncio.run(scenario())
+    testimonials_cache.invalidate()